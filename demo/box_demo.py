@@ -22,6 +22,9 @@ if __name__ == '__main__':
     # box2 like a falling domino ...
     b1 = Box([0, 0, 0], [1, 1, 1], verbose=True)
 
+    # the quaternion backend keeps the 90 single rotations orthonormal
+    b1.set_backend('quaternion')
+
     # first translation as a preperation of the rotation
     b1.translation = [-1, 0, 0]
 
@@ -34,10 +37,23 @@ if __name__ == '__main__':
     b2.translation = [1.5,0,0]
 
 
+    step = create_rotation_quaternion([0, 0, 1], -1)
     for i in range(90):
         print('%2i : %s' % (i, b1.has_collisions(b2, verbose=False, atol=1e-10)))
-        b1.rotation = create_rotation_Z(-1)
+        b1.rotate_quaternion(step)
 
     #print(b1.has_collisions(b2, verbose=False, atol=1e-10))
 
     # obviously after a rotation >30 degrees both boxes are colliding!
+
+    # the same contact angle with the continuous collision detection,
+    # the rotation of 90 degrees is done in a single time step
+    from pycollision.ccd import Motion, time_of_impact
+
+    b1 = Box([0, 0, 0], [1, 1, 1])
+    b1.translation = [-1, 0, 0]
+    b1.post_translation = [1, 0, 0]
+
+    motion = Motion(angular=[0, 0, -np.pi/2.], pivot=[1, 0, 0])
+    t = time_of_impact(b1, b2, motion, atol=1e-10)
+    print('time of impact: %g, contact angle: %g degrees' % (t, t * 90.))
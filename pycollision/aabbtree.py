@@ -0,0 +1,643 @@
+#
+# pycollision/aabbtree.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines a dynamic bounding volume hierarchy of axis
+aligned bounding boxes. The leaves store fattened bounding boxes,
+so small movements of an object don't change the tree. The tree
+is kept balanced with tree rotations. Objects with infinite bounding
+boxes (e.g. planes) are kept outside of the tree and tested against
+all other objects.
+
+"""
+
+import numpy as np
+
+from pycollision.broadphase import BroadPhase, cmp_atol
+
+
+def surface_area(lower, upper):
+    """
+    calculates the surface area of an axis aligned box, used as
+    cost function for the tree construction
+    """
+    d = upper - lower
+    return 2. * (d[0] * d[1] + d[1] * d[2] + d[2] * d[0])
+
+
+def aabb_overlap(l1, u1, l2, u2, margin=0.):
+    """
+    tests two axis aligned boxes for an overlap
+
+    Returns
+    -------
+    bool
+        True if both boxes overlap or touch each other
+    """
+    return (l1[0] <= u2[0] + margin and l2[0] <= u1[0] + margin and
+            l1[1] <= u2[1] + margin and l2[1] <= u1[1] + margin and
+            l1[2] <= u2[2] + margin and l2[2] <= u1[2] + margin)
+
+
+def ray_aabb(origin, inv_direction, lower, upper, max_distance):
+    """
+    slab test of a ray against an axis aligned box
+
+    Parameters
+    ----------
+    origin: np.array
+        the origin of the ray
+    inv_direction: np.array
+        the inverse of the direction of the ray
+    lower: np.array
+        the lower corner of the box
+    upper: np.array
+        the upper corner of the box
+    max_distance: float
+        the maximum ray parameter
+
+    Returns
+    -------
+    float or None
+        the ray parameter of the entry point (0 if the origin is
+        inside the box) or None if the ray misses the box
+    """
+    with np.errstate(invalid='ignore'):
+        t1 = (lower - origin) * inv_direction
+        t2 = (upper - origin) * inv_direction
+    # nan appears for rays parallel to a slab starting on the border
+    tmin = np.nanmax(np.minimum(t1, t2))
+    tmax = np.nanmin(np.maximum(t1, t2))
+
+    tmin = max(tmin, 0.)
+    if tmin > tmax or tmin > max_distance:
+        return None
+    return tmin
+
+
+class _Node(object):
+    __slots__ = ('lower', 'upper', 'parent', 'left', 'right', 'idx',
+                 'height')
+
+    def __init__(self, lower, upper, idx=None):
+        self.lower = lower
+        self.upper = upper
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.idx = idx
+        self.height = 0
+
+    @property
+    def is_leaf(self):
+        return self.left is None
+
+    def refit(self):
+        self.lower = np.minimum(self.left.lower, self.right.lower)
+        self.upper = np.maximum(self.left.upper, self.right.upper)
+        self.height = 1 + max(self.left.height, self.right.height)
+
+
+class AABBTree(BroadPhase):
+    """
+    Dynamic AABB tree, a bounding volume hierarchy which supports
+    inserting, removing and moving objects. It can be used as a broad
+    phase for a Scene and provides additional range and ray queries.
+
+    Parameters
+    ----------
+    fattening: float, optional
+        the bounding boxes in the leaves are enlarged by this value,
+        objects moving within the fattened box don't change the tree
+    margin: float, optional
+        tolerance which is used for the overlap test of two
+        bounding boxes
+
+    Attributes
+    ----------
+    _root: _Node
+        the root node of the tree
+    _leaves: dict
+        the leaf node for each object index
+    _unbounded: set
+        the indices of the objects with infinite bounding boxes,
+        which are not stored in the tree
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        tree = AABBTree()
+        tree.insert(0, [0., 0., 0.], [1., 1., 1.])
+        tree.insert(1, [0.5, 0., 0.], [2., 1., 1.])
+        tree.pairs()                               # -> [(0, 1)]
+        tree.query([1.5, 0., 0.], [3., 1., 1.])    # -> [1]
+    """
+    def __init__(self, fattening=0.1, margin=cmp_atol):
+        BroadPhase.__init__(self, margin=margin)
+
+        if fattening < 0.:
+            raise ValueError('fattening needs to be positive')
+        self._fattening = fattening
+        self._root = None
+        self._leaves = {}
+        self._unbounded = set()
+
+    @property
+    def height(self):
+        """
+        returns the height of the tree, -1 for an empty tree
+        """
+        if self._root is None:
+            return -1
+        return self._root.height
+
+    def insert(self, idx, lower, upper):
+        """
+        inserts a new object into the tree
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+        lower: Vector
+            lower corner of the bounding box
+        upper: Vector
+            upper corner of the bounding box
+
+        Raises
+        ------
+        KeyError
+            if the index is already used
+        """
+        BroadPhase.insert(self, idx, lower, upper)
+
+        lower, upper = self._bounds[idx]
+        if not self._is_bounded(idx):
+            self._unbounded.add(idx)
+            return
+        leaf = _Node(lower - self._fattening, upper + self._fattening,
+                     idx=idx)
+        self._leaves[idx] = leaf
+        self._insert_leaf(leaf)
+
+    def update(self, idx, lower, upper):
+        """
+        updates the bounding box of an object, the tree is only
+        changed if the new bounding box leaves the fattened box
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+        lower: Vector
+            lower corner of the bounding box
+        upper: Vector
+            upper corner of the bounding box
+
+        Returns
+        -------
+        bool
+            True if the tree was changed
+
+        Raises
+        ------
+        KeyError
+            if the index is unknown
+        """
+        BroadPhase.update(self, idx, lower, upper)
+
+        # objects changing between finite and infinite bounding boxes
+        # are moved between the tree and the unbounded objects
+        lower, upper = self._bounds[idx]
+        bounded = self._is_bounded(idx)
+        if idx in self._unbounded:
+            if not bounded:
+                return False
+            self._unbounded.discard(idx)
+            leaf = _Node(lower - self._fattening, upper + self._fattening,
+                         idx=idx)
+            self._leaves[idx] = leaf
+            self._insert_leaf(leaf)
+            return True
+
+        leaf = self._leaves[idx]
+        if not bounded:
+            self._remove_leaf(self._leaves.pop(idx))
+            self._unbounded.add(idx)
+            return True
+        if np.all(leaf.lower <= lower) and np.all(upper <= leaf.upper):
+            return False
+
+        self._remove_leaf(leaf)
+        leaf.lower = lower - self._fattening
+        leaf.upper = upper + self._fattening
+        self._insert_leaf(leaf)
+
+        return True
+
+    def remove(self, idx):
+        """
+        removes an object from the tree
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+
+        Raises
+        ------
+        KeyError
+            if the index is unknown
+        """
+        BroadPhase.remove(self, idx)
+        if idx in self._unbounded:
+            self._unbounded.discard(idx)
+        else:
+            self._remove_leaf(self._leaves.pop(idx))
+
+    def clear(self):
+        """
+        removes all objects
+        """
+        BroadPhase.clear(self)
+        self._leaves.clear()
+        self._unbounded.clear()
+        self._root = None
+
+    def _is_bounded(self, idx):
+        lower, upper = self._bounds[idx]
+        return bool(np.all(np.isfinite(lower)) and
+                    np.all(np.isfinite(upper)))
+
+    def _insert_leaf(self, leaf):
+        leaf.parent = None
+        if self._root is None:
+            self._root = leaf
+            return
+
+        # find the best sibling for the new leaf, using the surface
+        # area as cost function
+        node = self._root
+        while not node.is_leaf:
+            area = surface_area(node.lower, node.upper)
+            combined = surface_area(np.minimum(node.lower, leaf.lower),
+                                    np.maximum(node.upper, leaf.upper))
+
+            # cost of creating a new parent for this node and the leaf
+            cost = 2. * combined
+            # minimum cost of pushing the leaf further down the tree
+            inheritance = 2. * (combined - area)
+
+            costs = []
+            for child in (node.left, node.right):
+                c = surface_area(np.minimum(child.lower, leaf.lower),
+                                 np.maximum(child.upper, leaf.upper))
+                if not child.is_leaf:
+                    c -= surface_area(child.lower, child.upper)
+                costs.append(c + inheritance)
+
+            if cost < costs[0] and cost < costs[1]:
+                break
+
+            node = node.left if costs[0] < costs[1] else node.right
+
+        sibling = node
+        old_parent = sibling.parent
+        parent = _Node(np.minimum(sibling.lower, leaf.lower),
+                       np.maximum(sibling.upper, leaf.upper))
+        parent.parent = old_parent
+        parent.height = sibling.height + 1
+        parent.left = sibling
+        parent.right = leaf
+        sibling.parent = parent
+        leaf.parent = parent
+
+        if old_parent is None:
+            self._root = parent
+        elif old_parent.left is sibling:
+            old_parent.left = parent
+        else:
+            old_parent.right = parent
+
+        self._refit_upwards(leaf.parent)
+
+    def _remove_leaf(self, leaf):
+        if leaf is self._root:
+            self._root = None
+            return
+
+        parent = leaf.parent
+        grand_parent = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+
+        if grand_parent is None:
+            self._root = sibling
+            sibling.parent = None
+        else:
+            if grand_parent.left is parent:
+                grand_parent.left = sibling
+            else:
+                grand_parent.right = sibling
+            sibling.parent = grand_parent
+            self._refit_upwards(grand_parent)
+
+        leaf.parent = None
+
+    def _refit_upwards(self, node):
+        while node is not None:
+            node = self._balance(node)
+            node.refit()
+            node = node.parent
+
+    def _replace_child(self, old, new):
+        parent = new.parent
+        if parent is None:
+            self._root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _balance(self, a):
+        # performs a left or right rotation if the node a is
+        # imbalanced, returns the new root of the subtree
+        if a.is_leaf:
+            return a
+
+        b = a.left
+        c = a.right
+        balance = c.height - b.height
+
+        if balance > 1:
+            # rotate c up
+            f = c.left
+            g = c.right
+
+            c.left = a
+            c.parent = a.parent
+            a.parent = c
+            self._replace_child(a, c)
+
+            if f.height > g.height:
+                c.right = f
+                a.right = g
+                g.parent = a
+            else:
+                c.right = g
+                a.right = f
+                f.parent = a
+            a.refit()
+            c.refit()
+            return c
+
+        if balance < -1:
+            # rotate b up
+            d = b.left
+            e = b.right
+
+            b.left = a
+            b.parent = a.parent
+            a.parent = b
+            self._replace_child(a, b)
+
+            if d.height > e.height:
+                b.right = d
+                a.left = e
+                e.parent = a
+            else:
+                b.right = e
+                a.left = d
+                d.parent = a
+            a.refit()
+            b.refit()
+            return b
+
+        return a
+
+    def query(self, lower, upper):
+        """
+        finds all objects with a bounding box overlapping the given
+        range
+
+        Parameters
+        ----------
+        lower: Vector
+            lower corner of the range
+        upper: Vector
+            upper corner of the range
+
+        Returns
+        -------
+        list
+            sorted list of the object indices
+        """
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+
+        found = [idx for idx in self._unbounded
+                 if aabb_overlap(self._bounds[idx][0], self._bounds[idx][1],
+                                 lower, upper, self._margin)]
+        if self._root is None:
+            return sorted(found)
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not aabb_overlap(node.lower, node.upper, lower, upper,
+                                self._margin):
+                continue
+            if node.is_leaf:
+                l1, u1 = self._bounds[node.idx]
+                if aabb_overlap(l1, u1, lower, upper, self._margin):
+                    found.append(node.idx)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return sorted(found)
+
+    def raycast(self, origin, direction, max_distance=np.inf):
+        """
+        finds all objects with a bounding box hit by a ray
+
+        Parameters
+        ----------
+        origin: Vector
+            the origin of the ray
+        direction: Vector
+            the direction of the ray, the ray parameter is measured
+            in units of this vector
+        max_distance: float, optional
+            the maximum ray parameter
+
+        Returns
+        -------
+        list
+            list of tuples (t, idx) sorted by the ray parameter t of
+            the entry point into the bounding box
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+
+        with np.errstate(divide='ignore'):
+            inv_direction = 1. / direction
+
+        hits = []
+        for idx in self._unbounded:
+            lower, upper = self._bounds[idx]
+            t = ray_aabb(origin, inv_direction, lower, upper, max_distance)
+            if t is not None:
+                hits.append((t, idx))
+        if self._root is None:
+            return sorted(hits)
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if ray_aabb(origin, inv_direction, node.lower, node.upper,
+                        max_distance) is None:
+                continue
+            if node.is_leaf:
+                lower, upper = self._bounds[node.idx]
+                t = ray_aabb(origin, inv_direction, lower, upper,
+                             max_distance)
+                if t is not None:
+                    hits.append((t, node.idx))
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return sorted(hits)
+
+    def _pairs_nodes(self, node1, tree1, node2, tree2, found, self_test):
+        # simultaneous descent of two subtrees
+        stack = [(node1, node2)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                if not a.is_leaf:
+                    stack.append((a.left, a.left))
+                    stack.append((a.right, a.right))
+                    stack.append((a.left, a.right))
+                continue
+            if not aabb_overlap(a.lower, a.upper, b.lower, b.upper,
+                                self._margin):
+                continue
+            if a.is_leaf and b.is_leaf:
+                l1, u1 = tree1._bounds[a.idx]
+                l2, u2 = tree2._bounds[b.idx]
+                if aabb_overlap(l1, u1, l2, u2, self._margin):
+                    if self_test and a.idx > b.idx:
+                        found.append((b.idx, a.idx))
+                    else:
+                        found.append((a.idx, b.idx))
+            elif b.is_leaf or (not a.is_leaf and a.height >= b.height):
+                stack.append((a.left, b))
+                stack.append((a.right, b))
+            else:
+                stack.append((a, b.left))
+                stack.append((a, b.right))
+
+    def _pairs_unbounded(self, tree, found, self_test):
+        # the unbounded objects of this tree against all objects of
+        # the other tree
+        for i in self._unbounded:
+            l1, u1 = self._bounds[i]
+            for j, (l2, u2) in tree._bounds.items():
+                if self_test and (j == i or
+                                  (j in self._unbounded and j < i)):
+                    continue
+                if aabb_overlap(l1, u1, l2, u2, self._margin):
+                    if self_test and j < i:
+                        found.append((j, i))
+                    else:
+                        found.append((i, j))
+
+    def pairs(self):
+        """
+        calculates all pairs of objects with overlapping bounding
+        boxes
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) with i < j
+        """
+        found = []
+        if self._root is not None:
+            self._pairs_nodes(self._root, self, self._root, self, found,
+                              True)
+        self._pairs_unbounded(self, found, True)
+        return sorted(found)
+
+    def pairs_with(self, tree):
+        """
+        calculates all pairs of objects of this tree and another
+        tree with overlapping bounding boxes
+
+        Parameters
+        ----------
+        tree: AABBTree
+            the other tree
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) where i is the index
+            in this tree and j the index in the other tree
+        """
+        found = []
+        if self._root is not None and tree._root is not None:
+            self._pairs_nodes(self._root, self, tree._root, tree, found,
+                              False)
+        self._pairs_unbounded(tree, found, False)
+
+        # the objects in this tree against the unbounded objects of
+        # the other tree, unbounded pairs are already found
+        reverse = []
+        tree._pairs_unbounded(self, reverse, False)
+        found += [(i, j) for j, i in reverse if i not in self._unbounded]
+        return sorted(found)
+
+    def _validate(self):
+        # checks the consistency of the tree, used for testing
+        for idx in self._unbounded:
+            assert idx not in self._leaves
+            assert not self._is_bounded(idx)
+        assert len(self._leaves) + len(self._unbounded) == len(self._bounds)
+
+        if self._root is None:
+            assert len(self._leaves) == 0
+            return
+        assert self._root.parent is None
+
+        nleaves = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.is_leaf:
+                nleaves += 1
+                assert node.height == 0
+                assert self._leaves[node.idx] is node
+                lower, upper = self._bounds[node.idx]
+                assert np.all(node.lower <= lower)
+                assert np.all(upper <= node.upper)
+                continue
+            assert node.left.parent is node
+            assert node.right.parent is node
+            assert node.height == 1 + max(node.left.height,
+                                          node.right.height)
+            assert abs(node.left.height - node.right.height) <= 1
+            for child in (node.left, node.right):
+                assert np.all(node.lower <= child.lower)
+                assert np.all(child.upper <= node.upper)
+                stack.append(child)
+
+        assert nleaves == len(self._leaves)
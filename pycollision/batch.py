@@ -0,0 +1,759 @@
+#
+# pycollision/batch.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines vectorized collision routines which work on
+complete sets of objects at once. All calculations are done with
+numpy arrays, no per-pair python calls are involved.
+
+"""
+
+import numpy as np
+
+from pycollision.geometry import sat_rtol, sat_parallel, \
+                                 _sat_i, _sat_j, _sat_i1, _sat_i2, \
+                                 _sat_j1, _sat_j2
+from pycollision.collision import intersects, _lookup_procedure, \
+                                  _intersection_registry, \
+                                  find_intersection_procedure, \
+                                  find_collision_procedure
+from pycollision.objects import Sphere, Box, Plane
+
+
+# constants
+cmp_atol = 1e-08
+
+# the kinds of the vectorized routines and their base classes
+_kind_classes = (('sphere', Sphere), ('box', Box), ('plane', Plane))
+
+# number of rows of the first set processed at once, this limits the
+# size of the temporary (chunk, M, 3) difference arrays
+default_chunksize = 1024
+
+
+def sphere_arrays(spheres):
+    """
+    converts a set of spheres into the array representation used
+    by the vectorized routines
+
+    Parameters
+    ----------
+    spheres:
+        either a sequence of Sphere objects or a tuple (centers, radii)
+        with an (N,3) array of centers and an (N,) array of radii
+
+    Returns
+    -------
+    tuple
+        (centers, radii) as float64 arrays with the shapes (N,3) and (N,)
+
+    Raises
+    ------
+    ValueError
+        if the shapes of the arrays don't fit together
+    """
+    if isinstance(spheres, tuple) and len(spheres) == 2:
+        centers, radii = spheres
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64),
+                                (len(centers),))
+    else:
+        centers = np.array([s.position for s in spheres],
+                           dtype=np.float64).reshape(-1, 3)
+        radii = np.array([s.radius for s in spheres], dtype=np.float64)
+
+    if len(radii) != len(centers):
+        raise ValueError('number of radii doesn\'t fit to the number' +
+                         ' of centers')
+
+    return centers, radii
+
+
+def _dot(a, b):
+    return np.einsum('...k,...k->...', a, b)
+
+
+def _spheres_touch(dist2, r1, r2, atol):
+    # collision if distance - (r1+r2) <= atol, the limit is always
+    # positive, so the comparison can be done with squared values
+    limit = r1 + r2 + atol
+    return dist2 <= limit * limit
+
+
+def sphere_overlap_batch(centers1, radii1, centers2, radii2, atol=cmp_atol):
+    """
+    vectorized collision test for P pairs of spheres, all arrays
+    broadcast against each other
+
+    Parameters
+    ----------
+    centers1, centers2: np.array
+        (P,3) arrays of the sphere centers
+    radii1, radii2: np.array
+        (P,) arrays of the radii
+    atol: float, optional
+        spheres with a smaller gap are colliding
+
+    Returns
+    -------
+    np.array
+        (P,) boolean array, True for colliding pairs
+    """
+    diff = np.asarray(centers1) - np.asarray(centers2)
+    return _spheres_touch(_dot(diff, diff), radii1, radii2, atol)
+
+
+def _sphere_chunks(c1, r1, c2, r2, atol, chunksize, self_test):
+    # yields (row offset, squared distances, squared limits) for
+    # blocks of rows of the first set
+    for start in range(0, len(c1), chunksize):
+        stop = min(start + chunksize, len(c1))
+        diff = c1[start:stop, None, :] - c2[None, :, :]
+        dist2 = np.einsum('ijk,ijk->ij', diff, diff)
+
+        mask = _spheres_touch(dist2, r1[start:stop, None], r2[None, :],
+                              atol)
+        if self_test:
+            # only the upper triangle without the diagonal
+            cols = np.arange(len(c2))[None, :]
+            rows = np.arange(start, stop)[:, None]
+            mask &= cols > rows
+
+        yield start, dist2, mask
+
+
+def coll_spheres2spheres(spheres1, spheres2=None, atol=cmp_atol,
+                         sparse=False, chunksize=default_chunksize):
+    """
+    calculates the collisions between all spheres of two sets of
+    spheres. The collision criterion is the same as in
+    coll_sphere2sphere, two spheres collide if the outer distance
+    is smaller than atol.
+
+    Parameters
+    ----------
+    spheres1:
+        the first set of spheres, a sequence of Sphere objects or
+        a tuple (centers, radii)
+    spheres2: optional
+        the second set of spheres, if None the first set is tested
+        against itself and every pair is reported only once
+    atol: float, optional
+        absolute tolerance for touching spheres
+    sparse: bool, optional
+        if True, returns only the colliding pairs, default is False
+    chunksize: int, optional
+        number of spheres of the first set which were processed at once
+
+    Returns
+    -------
+    np.array or tuple
+        the (N,M) boolean collision matrix if sparse is False, otherwise
+        a tuple (idx1, idx2, distance, outerdistance) of 1d arrays
+        for all colliding pairs, sorted by idx1 and idx2
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        centers = np.random.uniform(0., 100., (10000, 3))
+        radii = np.ones(10000)
+        i, j, dist, outer = coll_spheres2spheres((centers, radii),
+                                                 sparse=True)
+    """
+    self_test = spheres2 is None
+    c1, r1 = sphere_arrays(spheres1)
+    if self_test:
+        c2, r2 = c1, r1
+    else:
+        c2, r2 = sphere_arrays(spheres2)
+
+    chunksize = max(int(chunksize), 1)
+
+    if not sparse:
+        matrix = np.zeros((len(c1), len(c2)), dtype=bool)
+        for start, dist2, mask in _sphere_chunks(c1, r1, c2, r2, atol,
+                                                 chunksize, self_test):
+            matrix[start:start+len(mask)] = mask
+        return matrix
+
+    idx1 = []
+    idx2 = []
+    dist = []
+    for start, dist2, mask in _sphere_chunks(c1, r1, c2, r2, atol,
+                                             chunksize, self_test):
+        i, j = np.nonzero(mask)
+        idx1.append(i + start)
+        idx2.append(j)
+        dist.append(np.sqrt(dist2[i, j]))
+
+    if len(idx1) == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), \
+            empty, empty.copy()
+
+    idx1 = np.concatenate(idx1)
+    idx2 = np.concatenate(idx2)
+    distance = np.concatenate(dist)
+    outerdistance = distance - (r1[idx1] + r2[idx2])
+
+    return idx1, idx2, distance, outerdistance
+
+
+def _sat_separated_batch(dist, radius, atol):
+    return np.any(dist - radius > atol + sat_rtol * (dist + radius),
+                  axis=1)
+
+
+def obb_overlap_batch(centers1, axes1, half1, centers2, axes2, half2,
+                      atol=cmp_atol):
+    """
+    vectorized separating axis test for P pairs of oriented boxes, see
+    pycollision.geometry.obb_overlap for the single pair version
+
+    Parameters
+    ----------
+    centers1, centers2: np.array
+        (P,3) arrays of the box centers
+    axes1, axes2: np.array
+        (P,3,3) arrays of the box axes, the axes are the columns
+    half1, half2: np.array
+        (P,3) arrays of the half lengths
+    atol: float, optional
+        boxes with a smaller gap are colliding
+
+    Returns
+    -------
+    np.array
+        (P,) boolean array, True for colliding pairs
+    """
+    R = np.einsum('pki,pkj->pij', axes1, axes2)
+    absR = np.abs(R)
+    t = np.einsum('pki,pk->pi', axes1, centers2 - centers1)
+
+    # the face normals of the first box
+    separated = _sat_separated_batch(
+        np.abs(t), half1 + np.einsum('pij,pj->pi', absR, half2), atol)
+
+    # the face normals of the second box
+    separated |= _sat_separated_batch(
+        np.abs(np.einsum('pi,pij->pj', t, R)),
+        np.einsum('pi,pij->pj', half1, absR) + half2, atol)
+
+    # the cross products of the edges
+    i, j = _sat_i, _sat_j
+    i1, i2, j1, j2 = _sat_i1, _sat_i2, _sat_j1, _sat_j2
+    proj3 = t[:, i2] * R[:, i1, j] - t[:, i1] * R[:, i2, j]
+    radius3 = half1[:, i1] * absR[:, i2, j] + \
+        half1[:, i2] * absR[:, i1, j] + \
+        half2[:, j1] * absR[:, i, j2] + half2[:, j2] * absR[:, i, j1]
+    length3 = np.sqrt(np.clip(1. - R[:, i, j]**2, 0., None))
+
+    # parallel edges give no new axis
+    valid = length3 > sat_parallel
+    length3 = np.where(valid, length3, 1.)
+    dist3 = np.where(valid, np.abs(proj3) / length3, 0.)
+    radius3 = np.where(valid, radius3 / length3, 0.)
+    separated |= _sat_separated_batch(dist3, radius3, atol)
+
+    return ~separated
+
+
+def coll_boxes2boxes(centers1, axes1, half1, centers2=None, axes2=None,
+                     half2=None, atol=cmp_atol):
+    """
+    calculates the collisions between all boxes of two sets of
+    oriented boxes. The bounding boxes are used as a first filter,
+    only the remaining pairs are tested with obb_overlap_batch.
+
+    Parameters
+    ----------
+    centers1, centers2: np.array
+        (N,3) and (M,3) arrays of the box centers
+    axes1, axes2: np.array
+        (N,3,3) and (M,3,3) arrays of the box axes
+    half1, half2: np.array
+        (N,3) and (M,3) arrays of the half lengths
+    atol: float, optional
+        absolute tolerance for touching boxes
+
+    Returns
+    -------
+    np.array
+        the (N,M) boolean collision matrix, if the second set is
+        not given the first set is tested against itself and only
+        the upper triangle is filled
+    """
+    self_test = centers2 is None
+    if self_test:
+        centers2, axes2, half2 = centers1, axes1, half1
+
+    # projection of the half lengths onto the world axes
+    ext1 = np.einsum('nij,nj->ni', np.abs(axes1), half1)
+    ext2 = np.einsum('nij,nj->ni', np.abs(axes2), half2)
+    l1 = centers1 - ext1
+    u1 = centers1 + ext1
+    l2 = centers2 - ext2
+    u2 = centers2 + ext2
+
+    # bounding boxes as first filter
+    mask = np.all(l1[:, None, :] <= u2[None, :, :] + atol, axis=2) & \
+        np.all(l2[None, :, :] <= u1[:, None, :] + atol, axis=2)
+    if self_test:
+        mask = np.triu(mask, k=1)
+
+    i, j = np.nonzero(mask)
+    hits = obb_overlap_batch(centers1[i], axes1[i], half1[i],
+                             centers2[j], axes2[j], half2[j], atol=atol)
+    mask[i[~hits], j[~hits]] = False
+
+    return mask
+
+
+def _parallel_planes(n1, n2, atol):
+    # the cosine of the angle between the normal vectors and the mask
+    # of the parallel planes
+    cos = _dot(n1, n2)
+    cross = np.sqrt(np.clip(1. - cos**2, 0., None))
+    return cos, np.isclose(cross, 0., atol=atol)
+
+
+def plane_equations(planes):
+    """
+    converts a set of planes into the array representation used by
+    the vectorized routines
+
+    Parameters
+    ----------
+    planes:
+        either a sequence of Plane objects or a (P,4) array of plane
+        equations
+
+    Returns
+    -------
+    np.array
+        (P,4) float64 array, every row contains the normalized normal
+        vector and the signed distance to the origin
+    """
+    if isinstance(planes, np.ndarray):
+        return np.asarray(planes, dtype=np.float64).reshape(-1, 4)
+    return np.array([np.append(*p.equation) for p in planes],
+                    dtype=np.float64).reshape(-1, 4)
+
+
+def _sphere_touches_plane(distances, radii, atol):
+    # collision if the signed distance of the center is inside the
+    # radius
+    return np.abs(distances) - radii <= atol
+
+
+def sphere_plane_overlap_batch(centers, radii, equations, atol=cmp_atol):
+    """
+    vectorized collision test for P pairs of a sphere and a plane, all
+    arrays broadcast against each other
+
+    Parameters
+    ----------
+    centers: np.array
+        (P,3) array of the sphere centers
+    radii: np.array
+        (P,) array of the radii
+    equations: np.array
+        (P,4) array of the plane equations, see coll_spheres2planes
+    atol: float, optional
+        spheres with a smaller gap are colliding
+
+    Returns
+    -------
+    np.array
+        (P,) boolean array, True for colliding pairs
+    """
+    equations = np.asarray(equations, dtype=np.float64)
+    distances = _dot(centers, equations[..., :3]) - equations[..., 3]
+    return _sphere_touches_plane(distances, radii, atol)
+
+
+def classify_spheres2planes(centers, radii, equations, atol=cmp_atol):
+    """
+    classifies a set of spheres against a set of planes, all signed
+    distances are calculated with one matrix product. The planes are
+    seen as half-spaces, spheres with a positive distance are on the
+    side of the normal vector.
+
+    Parameters
+    ----------
+    centers: np.array
+        (N,3) array of the sphere centers
+    radii: np.array
+        (N,) array of the radii
+    equations: np.array
+        (P,4) array of the plane equations, see plane_equations
+    atol: float, optional
+        absolute tolerance for touching spheres
+
+    Returns
+    -------
+    tuple
+        (contact, distances, closest) with the (N,P) boolean contact
+        matrix, the (N,P) signed distances of the centers and the (N,)
+        index of the closest plane of every sphere, -1 if there are
+        no planes
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        walls = plane_equations([create_xy_plane(0.), create_yz_plane(0.)])
+        contact, dist, closest = classify_spheres2planes(centers, radii,
+                                                         walls)
+        # spheres which are completely inside all half-spaces
+        inside = np.all(dist > radii[:, None], axis=1)
+    """
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64),
+                            (len(centers),))
+    equations = np.asarray(equations, dtype=np.float64).reshape(-1, 4)
+
+    distances = np.dot(centers, equations[:, :3].T)
+    distances -= equations[:, 3]
+    absolute = np.abs(distances)
+    contact = _sphere_touches_plane(distances, radii[:, None], atol)
+
+    if len(equations) == 0:
+        closest = np.full(len(centers), -1, dtype=np.intp)
+    else:
+        closest = np.argmin(absolute, axis=1)
+
+    return contact, distances, closest
+
+
+def coll_spheres2planes(centers, radii, equations, atol=cmp_atol):
+    """
+    calculates the collisions between a set of spheres and a set
+    of planes
+
+    Parameters
+    ----------
+    centers: np.array
+        (N,3) array of the sphere centers
+    radii: np.array
+        (N,) array of the radii
+    equations: np.array
+        (P,4) array of the plane equations n*x = d, given as rows
+        (n_x, n_y, n_z, d) with normalized vectors n
+    atol: float, optional
+        absolute tolerance for touching spheres
+
+    Returns
+    -------
+    np.array
+        the (N,P) boolean collision matrix
+    """
+    return classify_spheres2planes(centers, radii, equations, atol=atol)[0]
+
+
+def box_plane_overlap_batch(corners, equations, atol=cmp_atol):
+    """
+    vectorized collision test for P pairs of a box and a plane, a box
+    collides with a plane if its corners are not all on the same side
+    of the plane. All arrays broadcast against each other.
+
+    Parameters
+    ----------
+    corners: np.array
+        (P,8,3) array of the box corners
+    equations: np.array
+        (P,4) array of the plane equations, see coll_spheres2planes
+    atol: float, optional
+        boxes with a smaller gap are colliding
+
+    Returns
+    -------
+    np.array
+        (P,) boolean array, True for colliding pairs
+    """
+    equations = np.asarray(equations, dtype=np.float64)
+    dist = np.einsum('...ck,...k->...c', corners, equations[..., :3]) - \
+        equations[..., 3, None]
+    return (dist.min(axis=-1) <= atol) & (dist.max(axis=-1) >= -atol)
+
+
+def coll_boxes2planes(corners, equations, atol=cmp_atol):
+    """
+    calculates the collisions between a set of boxes and a set
+    of planes, a box collides with a plane if its corners are not
+    all on the same side of the plane
+
+    Parameters
+    ----------
+    corners: np.array
+        (N,8,3) array of the box corners
+    equations: np.array
+        (P,4) array of the plane equations, see coll_spheres2planes
+    atol: float, optional
+        absolute tolerance for touching boxes
+
+    Returns
+    -------
+    np.array
+        the (N,P) boolean collision matrix
+    """
+    equations = np.asarray(equations, dtype=np.float64).reshape(-1, 4)
+    return box_plane_overlap_batch(np.asarray(corners)[:, None],
+                                   equations[None], atol=atol)
+
+
+def plane_overlap_batch(equations1, equations2, atol=cmp_atol):
+    """
+    vectorized collision test for P pairs of planes, planes which are
+    not parallel are always colliding, parallel planes only if they
+    are identical. All arrays broadcast against each other.
+
+    Parameters
+    ----------
+    equations1, equations2: np.array
+        (P,4) arrays of the plane equations, see coll_spheres2planes
+    atol: float, optional
+        absolute tolerance for parallel and identical planes
+
+    Returns
+    -------
+    np.array
+        (P,) boolean array, True for colliding pairs
+    """
+    equations1 = np.asarray(equations1, dtype=np.float64)
+    equations2 = np.asarray(equations2, dtype=np.float64)
+    cos, parallel = _parallel_planes(equations1[..., :3],
+                                     equations2[..., :3], atol)
+
+    # parallel planes with opposite normal vectors are identical if
+    # the distances have opposite signs
+    sign = np.where(cos < 0., -1., 1.)
+    same = np.abs(equations1[..., 3] - sign * equations2[..., 3]) <= atol
+
+    return ~parallel | same
+
+
+def coll_planes2planes(equations1, equations2, atol=cmp_atol):
+    """
+    calculates the collisions between two sets of planes, planes which
+    are not parallel are always colliding, parallel planes only if
+    they are identical
+
+    Parameters
+    ----------
+    equations1, equations2: np.array
+        (P,4) and (Q,4) arrays of the plane equations, see
+        coll_spheres2planes
+
+    Returns
+    -------
+    np.array
+        the (P,Q) boolean collision matrix
+    """
+    equations1 = np.asarray(equations1, dtype=np.float64).reshape(-1, 4)
+    equations2 = np.asarray(equations2, dtype=np.float64).reshape(-1, 4)
+    return plane_overlap_batch(equations1[:, None], equations2[None],
+                               atol=atol)
+
+
+def _base_class(cls):
+    # the kind and the base class of a class, (None, None) for classes
+    # without a vectorized routine
+    for kind, base in _kind_classes:
+        if issubclass(cls, base):
+            return kind, base
+    return None, None
+
+
+def _builtin(registry, cls1, cls2, base1, base2):
+    # True if a pair of classes uses the function of the base classes
+    return _lookup_procedure(registry, cls1, cls2) == \
+        _lookup_procedure(registry, base1, base2)
+
+
+def _class_kind(cls, registry=None):
+    # the kind of a class, subclasses with own functions in the
+    # registry against the base classes or themselves have no kind
+    kind, base = _base_class(cls)
+    if base is None or cls is base or registry is None:
+        return kind
+    for other_kind, other in _kind_classes:
+        if not _builtin(registry, cls, other, base, other):
+            return None
+    if not _builtin(registry, cls, cls, base, base):
+        return None
+    return kind
+
+
+def _custom_pairs(objs1, objs2, pairs, registry):
+    # mask of the (P,2) index pairs of two different subclasses with
+    # an own function for the pair in the registry, the objects of
+    # these pairs have a kind but the pair must be tested one by one
+    custom = np.zeros(len(pairs), dtype=bool)
+    cache = {}
+    for n, (i, j) in enumerate(pairs):
+        key = (objs1[i].__class__, objs2[j].__class__)
+        if key not in cache:
+            kind1, base1 = _base_class(key[0])
+            kind2, base2 = _base_class(key[1])
+            cache[key] = base1 is not None and base2 is not None and \
+                not (key[0] is base1 and key[1] is base2) and \
+                not _builtin(registry, key[0], key[1], base1, base2)
+        custom[n] = cache[key]
+    return custom
+
+
+def _subclass_pairs(objs1, objs2, self_test):
+    # all index pairs of two objects which are both subclasses of the
+    # base classes, candidates for _custom_pairs
+    sub1 = [i for i, obj in enumerate(objs1)
+            if obj.__class__ is not _base_class(obj.__class__)[1]]
+    sub2 = sub1 if self_test else \
+        [j for j, obj in enumerate(objs2)
+         if obj.__class__ is not _base_class(obj.__class__)[1]]
+    return np.array([(i, j) for i in sub1 for j in sub2
+                     if not self_test or i < j],
+                    dtype=np.intp).reshape(-1, 2)
+
+
+def _group_objects(objs, registry=None):
+    # splits the objects into spheres, boxes, planes and all others,
+    # returns a dict with the kind as key and the (indices, data) tuple.
+    # With a registry subclasses with own functions are grouped with
+    # all others, see _class_kind
+    groups = {}
+    kinds = {}
+    for idx, obj in enumerate(objs):
+        cls = obj.__class__
+        if cls not in kinds:
+            kinds[cls] = _class_kind(cls, registry)
+        groups.setdefault(kinds[cls], []).append(idx)
+
+    result = {}
+    for kind, idx in groups.items():
+        members = [objs[i] for i in idx]
+        if kind == 'sphere':
+            data = sphere_arrays(members)
+        elif kind == 'box':
+            data = (np.array([b.center for b in members]),
+                    np.array([b.axes for b in members]),
+                    np.array([b.half_extents for b in members]),
+                    np.array([b.corners for b in members]))
+        elif kind == 'plane':
+            data = plane_equations(members)
+        else:
+            data = members
+        result[kind] = (np.array(idx, dtype=np.intp), data)
+
+    return result
+
+
+def _intersects_kernel(kind1, data1, kind2, data2, atol, self_test):
+    # returns the collision matrix of two groups or None if there
+    # is no vectorized routine for the kinds
+    if kind1 == 'sphere' and kind2 == 'sphere':
+        if self_test:
+            return coll_spheres2spheres(data1, atol=atol)
+        return coll_spheres2spheres(data1, data2, atol=atol)
+    if kind1 == 'box' and kind2 == 'box':
+        if self_test:
+            return coll_boxes2boxes(*data1[:3], atol=atol)
+        return coll_boxes2boxes(*(data1[:3] + data2[:3]), atol=atol)
+    if kind1 == 'plane' and kind2 == 'plane':
+        return coll_planes2planes(data1, data2, atol=atol)
+    if kind1 == 'sphere' and kind2 == 'plane':
+        return coll_spheres2planes(data1[0], data1[1], data2, atol=atol)
+    if kind1 == 'box' and kind2 == 'plane':
+        return coll_boxes2planes(data1[3], data2, atol=atol)
+    if kind2 in ('sphere', 'box') and kind1 == 'plane':
+        return _intersects_kernel(kind2, data2, kind1, data1,
+                                  atol, False).T
+    return None
+
+
+def _has_procedure(obj1, obj2):
+    # True if intersects can test the pair of objects
+    return find_intersection_procedure(obj1, obj2) is not None or \
+        find_collision_procedure(obj1, obj2) is not None
+
+
+def intersects_matrix(objs1, objs2=None, atol=cmp_atol):
+    """
+    boolean only collision test for all pairs of two sequences of
+    objects. The objects are grouped by their type, spheres, boxes and
+    planes were tested with the vectorized routines of this module,
+    all other combinations with pycollision.collision.intersects.
+    Subclasses with own intersection functions (see
+    pycollision.collision.register_intersection) are tested with
+    these functions. Pairs without a collision procedure are False.
+
+    Parameters
+    ----------
+    objs1:
+        the first sequence of objects
+    objs2: optional
+        the second sequence of objects, if None the first sequence
+        is tested against itself and only the upper triangle of the
+        matrix is filled
+    atol: float, optional
+        absolute tolerance for touching objects
+
+    Returns
+    -------
+    np.array
+        the (N,M) boolean collision matrix
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        objs = [Sphere([0., 0., 0.], 1.), Box([-1., -1., 1.], [1., 1., 3.]),
+                Plane([0., 0., 1.], 1.)]
+        matrix = intersects_matrix(objs)
+    """
+    self_test = objs2 is None
+    objs1 = list(objs1)
+    objs2 = objs1 if self_test else list(objs2)
+
+    matrix = np.zeros((len(objs1), len(objs2)), dtype=bool)
+    groups1 = _group_objects(objs1, _intersection_registry)
+    groups2 = groups1 if self_test else \
+        _group_objects(objs2, _intersection_registry)
+
+    for kind1, (idx1, data1) in groups1.items():
+        for kind2, (idx2, data2) in groups2.items():
+            same = self_test and kind1 == kind2
+            sub = _intersects_kernel(kind1, data1, kind2, data2, atol, same)
+            if sub is None:
+                sub = np.zeros((len(idx1), len(idx2)), dtype=bool)
+                # the kinds use the functions of the base classes
+                if kind1 is not None and kind2 is not None and \
+                        not _has_procedure(objs1[idx1[0]], objs2[idx2[0]]):
+                    continue
+                for a, i in enumerate(idx1):
+                    for b, j in enumerate(idx2):
+                        if (not self_test or i < j) and \
+                                _has_procedure(objs1[i], objs2[j]):
+                            sub[a, b] = intersects(objs1[i], objs2[j],
+                                                   atol=atol)
+            matrix[np.ix_(idx1, idx2)] = sub
+
+    # pairs of subclasses with own functions for the pair
+    pairs = _subclass_pairs(objs1, objs2, self_test)
+    for i, j in pairs[_custom_pairs(objs1, objs2, pairs,
+                                    _intersection_registry)]:
+        matrix[i, j] = intersects(objs1[i], objs2[j], atol=atol)
+
+    if self_test:
+        matrix = np.triu(matrix, k=1)
+
+    return matrix
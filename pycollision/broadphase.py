@@ -0,0 +1,548 @@
+#
+# pycollision/broadphase.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines the broad phase algorithms which select the
+candidate pairs of objects for the real collision tests. All broad
+phases work only on the axis aligned bounding boxes of the objects,
+which are identified by integer indices.
+
+"""
+
+import abc
+import itertools
+
+import numpy as np
+
+
+# constants
+cmp_atol = 1e-08
+
+
+class BroadPhase(object, metaclass=abc.ABCMeta):
+    """
+    Abstract base class for all broad phase algorithms. It stores the
+    bounding boxes of all objects, the subclasses need to implement
+    the pairs method.
+
+    Parameters
+    ----------
+    margin: float, optional
+        tolerance which is used for the overlap test of two bounding
+        boxes, touching boxes are always overlapping
+
+    Attributes
+    ----------
+    _bounds: dict
+        the (lower, upper) bounding box for each object index
+    """
+    def __init__(self, margin=cmp_atol):
+        self._margin = margin
+        self._bounds = {}
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, idx):
+        return idx in self._bounds
+
+    def insert(self, idx, lower, upper):
+        """
+        inserts a new object into the broad phase
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+        lower: Vector
+            lower corner of the bounding box
+        upper: Vector
+            upper corner of the bounding box
+
+        Raises
+        ------
+        KeyError
+            if the index is already used
+        """
+        if idx in self._bounds:
+            raise KeyError('index {} is already used'.format(idx))
+        self._bounds[idx] = (np.array(lower, dtype=np.float64),
+                             np.array(upper, dtype=np.float64))
+
+    def update(self, idx, lower, upper):
+        """
+        updates the bounding box of an object
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+        lower: Vector
+            lower corner of the bounding box
+        upper: Vector
+            upper corner of the bounding box
+
+        Raises
+        ------
+        KeyError
+            if the index is unknown
+        """
+        if idx not in self._bounds:
+            raise KeyError('index {} is unknown'.format(idx))
+        self._bounds[idx] = (np.array(lower, dtype=np.float64),
+                             np.array(upper, dtype=np.float64))
+
+    def remove(self, idx):
+        """
+        removes an object from the broad phase
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+
+        Raises
+        ------
+        KeyError
+            if the index is unknown
+        """
+        del self._bounds[idx]
+
+    def clear(self):
+        """
+        removes all objects
+        """
+        self._bounds.clear()
+
+    def overlap(self, idx1, idx2):
+        """
+        tests the bounding boxes of two objects for an overlap
+
+        Returns
+        -------
+        bool
+            True if both bounding boxes overlap or touch each other
+        """
+        l1, u1 = self._bounds[idx1]
+        l2, u2 = self._bounds[idx2]
+        return bool(np.all(l1 <= u2 + self._margin) and
+                    np.all(l2 <= u1 + self._margin))
+
+    @abc.abstractmethod
+    def pairs(self):
+        """
+        calculates all pairs of objects with overlapping bounding
+        boxes
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) with i < j
+        """
+
+
+class SpatialHashGrid(BroadPhase):
+    """
+    Broad phase based on a uniform grid. The bounding boxes of all
+    objects were sorted into the cells of the grid, only objects which
+    share at least one cell are candidates for a collision. Objects
+    with infinite bounding boxes (e.g. planes) or objects covering
+    too many cells were tested against all other objects.
+
+    Parameters
+    ----------
+    cell_size: float, optional
+        the edge length of a grid cell, if None the cell size is
+        estimated from the object sizes (twice the mean extent)
+    max_cells: int, optional
+        objects which cover more cells are tested against all
+        other objects
+    margin: float, optional
+        tolerance which is used for the overlap test of two
+        bounding boxes
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        grid = SpatialHashGrid(cell_size=2.)
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+        grid.insert(1, [0.5, 0.5, 0.5], [3., 3., 3.])
+        grid.pairs()   # -> [(0, 1)]
+    """
+    def __init__(self, cell_size=None, max_cells=64, margin=cmp_atol):
+        BroadPhase.__init__(self, margin=margin)
+
+        if cell_size is not None and cell_size <= 0.:
+            raise ValueError('cell_size needs to be positive')
+        self._cell_size = cell_size
+        self._max_cells = max_cells
+
+    @property
+    def cell_size(self):
+        """
+        returns the configured cell size, None means automatic
+        """
+        return self._cell_size
+
+    def _get_cell_size(self, lower, upper, bounded):
+        if self._cell_size is not None:
+            return self._cell_size
+
+        if not np.any(bounded):
+            return 1.
+        extent = (upper[bounded] - lower[bounded]).max(axis=1)
+        size = 2. * extent.mean()
+        if size <= 0.:
+            return 1.
+        return size
+
+    def cells(self):
+        """
+        sorts all bounded objects into the grid cells
+
+        Returns
+        -------
+        dict
+            the indices of all objects for each used cell, the keys
+            are the integer cell coordinates
+        """
+        ids, lower, upper = self._arrays()
+        bounded = self._bounded(lower, upper)
+        grid, large = self._cells(ids, lower, upper, bounded)
+        return {key: [ids[i] for i in rows] for key, rows in grid.items()}
+
+    def _arrays(self):
+        ids = sorted(self._bounds)
+        if len(ids) == 0:
+            return ids, np.zeros((0, 3)), np.zeros((0, 3))
+        lower = np.array([self._bounds[i][0] for i in ids])
+        upper = np.array([self._bounds[i][1] for i in ids])
+        return ids, lower, upper
+
+    def _bounded(self, lower, upper):
+        return np.all(np.isfinite(lower), axis=1) & \
+            np.all(np.isfinite(upper), axis=1)
+
+    def _cells(self, ids, lower, upper, bounded):
+        # returns the cell dictionary with row numbers and the
+        # rows of all objects which are too large for the grid
+        cell_size = self._get_cell_size(lower, upper, bounded)
+
+        large = list(np.nonzero(~bounded)[0])
+        grid = {}
+        if not np.any(bounded):
+            return grid, large
+
+        lo = np.zeros(lower.shape, dtype=np.int64)
+        hi = np.zeros(upper.shape, dtype=np.int64)
+        lo[bounded] = np.floor((lower[bounded] - self._margin) / cell_size)
+        hi[bounded] = np.floor((upper[bounded] + self._margin) / cell_size)
+        ncells = np.prod(hi - lo + 1, axis=1)
+
+        for row in np.nonzero(bounded)[0]:
+            if ncells[row] > self._max_cells:
+                large.append(row)
+                continue
+            lc = lo[row]
+            hc = hi[row]
+            if ncells[row] == 1:
+                grid.setdefault((lc[0], lc[1], lc[2]), []).append(row)
+                continue
+            for key in itertools.product(range(lc[0], hc[0]+1),
+                                         range(lc[1], hc[1]+1),
+                                         range(lc[2], hc[2]+1)):
+                grid.setdefault(key, []).append(row)
+
+        return grid, sorted(large)
+
+    def pairs(self):
+        """
+        calculates all pairs of objects with overlapping bounding
+        boxes
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) with i < j
+        """
+        ids, lower, upper = self._arrays()
+        bounded = self._bounded(lower, upper)
+        grid, large = self._cells(ids, lower, upper, bounded)
+
+        candidates = set()
+        for rows in grid.values():
+            if len(rows) > 1:
+                candidates.update(itertools.combinations(rows, 2))
+
+        # large objects against everything
+        for row in large:
+            for other in range(len(ids)):
+                if other < row:
+                    candidates.add((other, row))
+                elif other > row:
+                    candidates.add((row, other))
+
+        if len(candidates) == 0:
+            return []
+
+        rows = np.array(sorted(candidates), dtype=np.intp)
+        i = rows[:, 0]
+        j = rows[:, 1]
+        mask = np.all(lower[i] <= upper[j] + self._margin, axis=1) & \
+            np.all(lower[j] <= upper[i] + self._margin, axis=1)
+
+        # the ids are sorted, so the pairs keep the order i < j
+        return [(ids[a], ids[b]) for a, b in rows[mask]]
+
+
+class SweepAndPrune(BroadPhase):
+    """
+    Incremental sweep and prune broad phase. For each axis the lower
+    and upper ends of all bounding boxes are kept in a sorted list.
+    After moving objects the lists are re-sorted with an insertion
+    sort and the set of overlapping pairs is updated with every swap
+    of two ends. If the objects move only a little between two steps
+    the costs are O(n + swaps). New objects are collected and inserted
+    in bulk with the next call of pairs: their ends are sorted once
+    and merged into the lists, their overlaps are found with one
+    vectorized sweep along the axis with the fewest candidates, so
+    the initial build costs O(n log n + pairs).
+
+    Parameters
+    ----------
+    margin: float, optional
+        tolerance which is used for the overlap test of two
+        bounding boxes
+
+    Attributes
+    ----------
+    _axes: list
+        the sorted lists of the ends for all 3 axes, every end is a
+        list [value, index, is_upper]
+    _ends: dict
+        the 6 ends (lower and upper for each axis) of every object
+    _pairs: set
+        the current set of overlapping pairs
+    _pending: set
+        the indices of the objects inserted since the last call of
+        pairs, their ends are not yet in the sorted lists
+    _swaps: int
+        number of swaps during the last update
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        sap = SweepAndPrune()
+        sap.insert(0, [0., 0., 0.], [1., 1., 1.])
+        sap.insert(1, [2., 0., 0.], [3., 1., 1.])
+        sap.pairs()   # -> []
+        sap.update(1, [0.5, 0., 0.], [1.5, 1., 1.])
+        sap.pairs()   # -> [(0, 1)]
+    """
+    def __init__(self, margin=cmp_atol):
+        BroadPhase.__init__(self, margin=margin)
+
+        self._axes = [[], [], []]
+        self._ends = {}
+        self._pairs = set()
+        self._pending = set()
+        self._swaps = 0
+
+    @property
+    def swaps(self):
+        """
+        returns the number of swaps during the last update
+        """
+        return self._swaps
+
+    def _set_ends(self, idx):
+        lower, upper = self._bounds[idx]
+        ends = self._ends[idx]
+        for axis in range(3):
+            ends[2*axis][0] = lower[axis]
+            ends[2*axis+1][0] = upper[axis] + self._margin
+
+    def insert(self, idx, lower, upper):
+        """
+        inserts a new object into the broad phase
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+        lower: Vector
+            lower corner of the bounding box
+        upper: Vector
+            upper corner of the bounding box
+
+        Raises
+        ------
+        KeyError
+            if the index is already used
+        """
+        BroadPhase.insert(self, idx, lower, upper)
+
+        # the ends are merged into the sorted lists with the next
+        # call of pairs
+        self._ends[idx] = [[0., idx, upper] for axis in range(3)
+                           for upper in (False, True)]
+        self._set_ends(idx)
+        self._pending.add(idx)
+
+    def update(self, idx, lower, upper):
+        """
+        updates the bounding box of an object
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+        lower: Vector
+            lower corner of the bounding box
+        upper: Vector
+            upper corner of the bounding box
+
+        Raises
+        ------
+        KeyError
+            if the index is unknown
+        """
+        BroadPhase.update(self, idx, lower, upper)
+        self._set_ends(idx)
+
+    def remove(self, idx):
+        """
+        removes an object from the broad phase
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+
+        Raises
+        ------
+        KeyError
+            if the index is unknown
+        """
+        BroadPhase.remove(self, idx)
+
+        del self._ends[idx]
+        if idx in self._pending:
+            self._pending.discard(idx)
+            return
+        for axis in range(3):
+            self._axes[axis] = [e for e in self._axes[axis] if e[1] != idx]
+        self._pairs = set(p for p in self._pairs if idx not in p)
+
+    def clear(self):
+        """
+        removes all objects
+        """
+        BroadPhase.clear(self)
+        self._axes = [[], [], []]
+        self._ends.clear()
+        self._pairs.clear()
+        self._pending.clear()
+
+    def _sort_axis(self, ends):
+        # insertion sort, every swap of a lower end with an upper
+        # end of another object changes the overlap on this axis
+        swaps = 0
+        for k in range(1, len(ends)):
+            e = ends[k]
+            value = e[0]
+            upper = e[2]
+            j = k - 1
+            while j >= 0:
+                f = ends[j]
+                if f[0] < value or (f[0] == value and f[2] <= upper):
+                    break
+                swaps += 1
+                if f[1] != e[1] and upper != f[2]:
+                    pair = (e[1], f[1]) if e[1] < f[1] else (f[1], e[1])
+                    if upper:
+                        # upper end of e moves before the lower
+                        # end of f -> separated
+                        self._pairs.discard(pair)
+                    elif self.overlap(pair[0], pair[1]):
+                        # lower end of e moves before the upper
+                        # end of f -> overlap on this axis
+                        self._pairs.add(pair)
+                ends[j+1] = f
+                j -= 1
+            ends[j+1] = e
+
+        return swaps
+
+    def _merge_pending(self):
+        # bulk insertion of the new objects, the sort of the lists
+        # finds the sorted runs of the old and the new ends
+        for axis in range(3):
+            ends = self._axes[axis]
+            for idx in self._pending:
+                ends += self._ends[idx][2*axis:2*axis+2]
+            ends.sort(key=lambda e: (e[0], e[2]))
+
+        ids = np.array(list(self._bounds), dtype=np.intp)
+        lower = np.array([self._bounds[i][0] for i in ids]).reshape(-1, 3)
+        upper = np.array([self._bounds[i][1] for i in ids]).reshape(-1, 3) \
+            + self._margin
+        new = np.isin(ids, list(self._pending))
+        self._pending.clear()
+
+        # sweep along the axis with the fewest overlapping intervals:
+        # in the order of the lower ends every object overlaps on
+        # this axis with the following objects up to its upper end
+        best = None
+        for axis in range(3):
+            order = np.argsort(lower[:, axis], kind='mergesort')
+            stop = np.searchsorted(lower[order, axis], upper[order, axis],
+                                   side='right')
+            count = np.maximum(stop - np.arange(1, len(ids)+1), 0)
+            if best is None or count.sum() < best[1].sum():
+                best = (order, count)
+        order, count = best
+
+        first = np.repeat(np.arange(len(ids)), count)
+        offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count,
+                                                    count)
+        i = order[first]
+        j = order[first + 1 + offset]
+
+        mask = (new[i] | new[j]) & \
+            np.all(lower[i] <= upper[j], axis=1) & \
+            np.all(lower[j] <= upper[i], axis=1)
+        a = ids[i[mask]]
+        b = ids[j[mask]]
+        self._pairs.update(zip(np.minimum(a, b).tolist(),
+                               np.maximum(a, b).tolist()))
+
+    def pairs(self):
+        """
+        calculates all pairs of objects with overlapping bounding
+        boxes, updating the pairs of the last call
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) with i < j
+        """
+        # the old objects are updated incrementally before the new
+        # objects are merged
+        self._swaps = 0
+        for ends in self._axes:
+            self._swaps += self._sort_axis(ends)
+
+        if len(self._pending) > 0:
+            self._merge_pending()
+
+        return sorted(self._pairs)
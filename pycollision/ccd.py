@@ -0,0 +1,487 @@
+#
+# pycollision/ccd.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines the continuous collision detection. Instead of
+testing the objects at single poses, the objects move during a time
+step and the earliest time of impact is calculated. Spheres which
+only translate or rotate around their centers are swept analytically,
+all other cases use the conservative advancement: the objects are
+moved forward in time by the largest step which can't miss a contact.
+
+"""
+
+from pycollision.objects import Sphere, Box, Plane
+from pycollision.collision import _lookup_procedure
+from pycollision.geometry import obb_separation
+from pycollision.distance import dist_spheres2boxes
+from pycollision.rotation import create_rotation_matrices, \
+                                 matrices_to_axis_angle
+
+import numpy as np
+import numpy.linalg as nl
+
+
+# constants
+cmp_atol = 1e-08
+
+# maximal number of steps of the conservative advancement
+default_max_iterations = 1000
+
+
+# registry of the time of impact functions, see register_collision
+_toi_registry = {}
+
+
+class Motion(object):
+    """
+    Rigid motion of an object during a time step, a linear velocity
+    and a rotation with constant angular velocity around a pivot
+    point which moves with the linear velocity. A point x of the
+    object is at the time t at
+
+        R(angular * t) (x - pivot) + pivot + linear * t
+
+    Parameters
+    ----------
+    linear: Vector, optional
+        the linear velocity, default is no translation
+    angular: Vector, optional
+        the angular velocity, the direction is the rotation axis and
+        the length the angle per time in radians, default is no
+        rotation
+    pivot: Vector, optional
+        the pivot point in world coordinates at the time 0, default
+        is the center of the object
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        # a falling domino which rotates around its edge
+        motion = Motion(angular=[0., 0., -np.pi/2.], pivot=[1., 0., 0.])
+    """
+    def __init__(self, linear=None, angular=None, pivot=None):
+        if linear is None:
+            linear = np.zeros(3)
+        if angular is None:
+            angular = np.zeros(3)
+        self._linear = np.array(linear, dtype=np.float64).reshape(3)
+        self._angular = np.array(angular, dtype=np.float64).reshape(3)
+        if pivot is not None:
+            pivot = np.array(pivot, dtype=np.float64).reshape(3)
+        self._pivot = pivot
+
+    @classmethod
+    def from_transforms(cls, start, end, center=None):
+        """
+        creates the motion between two transformations, the time step
+        of the motion is 1
+
+        Parameters
+        ----------
+        start: Position
+            the object or position at the start of the time step
+        end: Position
+            the object or position at the end of the time step
+        center: Vector, optional
+            the pivot point in local coordinates, default is the
+            center of the object
+
+        Returns
+        -------
+        Motion
+            the motion, the pivot moves on a straight line and the
+            object rotates around the pivot
+        """
+        if center is None:
+            center = _local_center(start)
+        center = np.asarray(center, dtype=np.float64)
+
+        p0 = start.calculate_positions(center)
+        p1 = end.calculate_positions(center)
+        rel = np.dot(end.rotation, start.rotation.T)
+        axis, angle = matrices_to_axis_angle(rel, degrees=False)
+
+        return cls(linear=p1 - p0, angular=axis[0] * angle[0], pivot=p0)
+
+    @property
+    def linear(self):
+        """
+        returns the linear velocity
+        """
+        return self._linear
+
+    @property
+    def angular(self):
+        """
+        returns the angular velocity
+        """
+        return self._angular
+
+    @property
+    def pivot(self):
+        """
+        returns the pivot point or None for the center of the object
+        """
+        return self._pivot
+
+    def rotation(self, t):
+        """
+        returns the rotation matrix after the time t
+        """
+        speed = nl.norm(self._angular)
+        if speed == 0.:
+            return np.eye(3)
+        return create_rotation_matrices(self._angular / speed, speed * t,
+                                        degrees=False)[0]
+
+    def _points(self, points, pivot, t):
+        # moves world points, the pivot is already resolved
+        rot = self.rotation(t)
+        return np.dot(points - pivot, rot.T) + pivot + self._linear * t
+
+    def _rotation_speed(self, center, radius, pivot):
+        # upper limit of the speed of all points inside a sphere
+        # around center caused by the rotation
+        return nl.norm(self._angular) * (nl.norm(center - pivot) + radius)
+
+    def apply(self, obj, t):
+        """
+        moves an object to the time t of the motion, the object is
+        transformed with the normal rotation and translation operations
+
+        Parameters
+        ----------
+        obj:
+            the object, Sphere, Box or Plane
+        t: float
+            the time
+        """
+        pivot = self._pivot
+        if pivot is None:
+            pivot = _center(obj)
+        rot = self.rotation(t)
+
+        # the rotation is applied to the complete transformation, the
+        # post translation is corrected with the translation
+        post = obj.post_translation
+        obj.transform(rotation=rot,
+                      translation=np.dot(rot, post - pivot) + pivot +
+                      self._linear * t - post)
+
+
+def _center(obj):
+    # reference point of an object in world coordinates
+    if isinstance(obj, Sphere):
+        return obj.position
+    if isinstance(obj, Box):
+        return obj.center
+    return obj.calculate_positions(np.zeros(3))
+
+
+def _local_center(obj):
+    # reference point of an object in local coordinates
+    if isinstance(obj, Sphere):
+        return obj._x
+    if isinstance(obj, Box):
+        return (obj._x1 + obj._x2) / 2.
+    return np.zeros(3)
+
+
+def _orbiting(motion, center):
+    # True if the center moves on a curve, the rotation around a pivot
+    # outside the center changes its position
+    if motion.pivot is None or nl.norm(motion.angular) == 0.:
+        return False
+    return not np.allclose(motion.pivot, center, rtol=0., atol=cmp_atol)
+
+
+def _pivot(motion, center):
+    # the pivot point in world coordinates
+    return center if motion.pivot is None else motion.pivot
+
+
+def _plane_motion(motion):
+    # planes can't rotate, an infinite plane has no limited speed
+    if nl.norm(motion.angular) > 0.:
+        raise ValueError('rotating planes are not supported')
+
+
+def register_time_of_impact(cls1, cls2, symmetric=True):
+    """
+    decorator which registers a time of impact function for a pair of
+    classes, see pycollision.collision.register_collision. The function
+    is called with the two objects, the two motions, dt, atol and
+    max_iterations.
+    """
+    def decorator(func):
+        _toi_registry[(cls1, cls2)] = (func, symmetric)
+        return func
+
+    return decorator
+
+
+def time_of_impact(obj1, obj2, motion1=None, motion2=None, dt=1.,
+                   atol=cmp_atol, max_iterations=default_max_iterations):
+    """
+    calculates the earliest time of impact of two moving objects
+
+    Parameters
+    ----------
+    obj1:
+        the first object at the start of the time step
+    obj2:
+        the second object at the start of the time step
+    motion1: Motion, optional
+        the motion of the first object, default is no motion
+    motion2: Motion, optional
+        the motion of the second object, default is no motion
+    dt: float, optional
+        the length of the time step, default is 1
+    atol: float, optional
+        objects with a smaller distance are touching
+    max_iterations: int, optional
+        maximal number of steps of the conservative advancement, if
+        it is reached without a contact the result is None like for
+        objects without contact, a larger value or a smaller dt
+        resolves the time of impact
+
+    Returns
+    -------
+    float or None
+        the time of impact in the range [0, dt], 0 if the objects are
+        colliding at the start or None if there is no contact during
+        the time step or the conservative advancement didn't reach
+        a contact within max_iterations steps
+
+    Raises
+    ------
+    ValueError
+        if there is no time of impact function for the objects or
+        a plane is rotating
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        s1 = Sphere([0., 0., 0.], 1.)
+        s2 = Sphere([10., 0., 0.], 1.)
+        t = time_of_impact(s1, s2, Motion(linear=[10., 0., 0.]))
+        # t = 0.8
+    """
+    if motion1 is None:
+        motion1 = Motion()
+    if motion2 is None:
+        motion2 = Motion()
+
+    proc = _lookup_procedure(_toi_registry, obj1.__class__, obj2.__class__)
+    if proc is None:
+        raise ValueError('Cannot find any time of impact procedure' +
+                         ' for given types {} and {}'.format(
+                                obj1.__class__.__name__,
+                                obj2.__class__.__name__))
+    func, swapped = proc
+    if swapped:
+        return func(obj2, obj1, motion2, motion1, dt, atol, max_iterations)
+    return func(obj1, obj2, motion1, motion2, dt, atol, max_iterations)
+
+
+def toi_sphere2sphere(sph1, sph2, motion1, motion2, dt, atol,
+                      max_iterations):
+    """
+    time of impact of two spheres, analytic for translating spheres,
+    spheres rotating around a pivot outside the center use the
+    conservative advancement
+    """
+    c1 = sph1.position
+    c2 = sph2.position
+    radii = sph1.radius + sph2.radius
+
+    if _orbiting(motion1, c1) or _orbiting(motion2, c2):
+        pivot1 = _pivot(motion1, c1)
+        pivot2 = _pivot(motion2, c2)
+        speed = nl.norm(motion1.linear - motion2.linear) + \
+            motion1._rotation_speed(c1, 0., pivot1) + \
+            motion2._rotation_speed(c2, 0., pivot2)
+
+        def gap(t):
+            return nl.norm(motion2._points(c2, pivot2, t) -
+                           motion1._points(c1, pivot1, t)) - radii
+
+        return _advance(gap, speed, dt, atol, max_iterations)
+
+    p = c2 - c1
+    v = motion2.linear - motion1.linear
+
+    if nl.norm(p) - radii <= atol:
+        return 0.
+
+    # solve |p + v t| = r1 + r2
+    c = np.dot(p, p) - radii**2
+    a = np.dot(v, v)
+    b = np.dot(p, v)
+    if a == 0. or b >= 0.:
+        return None
+    disc = b * b - a * c
+    if disc < 0.:
+        return None
+
+    t = (-b - np.sqrt(disc)) / a
+    if t > dt:
+        return None
+    return float(t)
+
+
+def toi_sphere2plane(sphere, plane, motion_s, motion_p, dt, atol,
+                     max_iterations):
+    """
+    time of impact of a sphere and a moving plane, analytic for a
+    translating sphere, a sphere rotating around a pivot outside the
+    center uses the conservative advancement
+    """
+    _plane_motion(motion_p)
+    n, d = plane.equation
+    c = sphere.position
+
+    if _orbiting(motion_s, c):
+        pivot = _pivot(motion_s, c)
+        speed = np.abs(np.dot(n, motion_s.linear - motion_p.linear)) + \
+            motion_s._rotation_speed(c, 0., pivot)
+
+        def gap(t):
+            s = np.dot(n, motion_s._points(c, pivot, t)) - d - \
+                np.dot(n, motion_p.linear) * t
+            return np.abs(s) - sphere.radius
+
+        return _advance(gap, speed, dt, atol, max_iterations)
+
+    s0 = np.dot(n, c) - d
+    if np.abs(s0) - sphere.radius <= atol:
+        return 0.
+
+    # velocity of the sphere towards the plane
+    rate = np.dot(n, motion_s.linear - motion_p.linear)
+    approach = -rate if s0 > 0. else rate
+    if approach <= 0.:
+        return None
+
+    t = (np.abs(s0) - sphere.radius) / approach
+    if t > dt:
+        return None
+    return float(t)
+
+
+def _box_pose(box, motion, pivot, t):
+    # center and axes of a box after the time t
+    center = motion._points(box.center, pivot, t)
+    axes = np.dot(motion.rotation(t), box.axes)
+    return center, axes
+
+
+def _advance(gap, speed, dt, atol, max_iterations):
+    # conservative advancement with gap(t) as lower limit of the
+    # distance and speed as upper limit of the approach velocity
+    t = 0.
+    for i in range(max_iterations):
+        g = gap(t)
+        if g <= atol:
+            return t
+        if speed == 0.:
+            return None
+        t += g / speed
+        if t > dt:
+            return None
+    # no convergence, no contact is reported
+    return None
+
+
+def toi_box2box(box1, box2, motion1, motion2, dt, atol, max_iterations):
+    """
+    time of impact of two boxes with the conservative advancement,
+    the gap of the separating axis test is used as lower limit of
+    the distance
+    """
+    c1 = box1.center
+    c2 = box2.center
+    pivot1 = _pivot(motion1, c1)
+    pivot2 = _pivot(motion2, c2)
+    half1 = box1.half_extents
+    half2 = box2.half_extents
+
+    speed = nl.norm(motion1.linear - motion2.linear) + \
+        motion1._rotation_speed(c1, nl.norm(half1), pivot1) + \
+        motion2._rotation_speed(c2, nl.norm(half2), pivot2)
+
+    def gap(t):
+        center1, axes1 = _box_pose(box1, motion1, pivot1, t)
+        center2, axes2 = _box_pose(box2, motion2, pivot2, t)
+        return obb_separation(center1, axes1, half1, center2, axes2, half2)
+
+    return _advance(gap, speed, dt, atol, max_iterations)
+
+
+def toi_sphere2box(sphere, box, motion_s, motion_b, dt, atol,
+                   max_iterations):
+    """
+    time of impact of a sphere and a box with the conservative
+    advancement, the exact distance of the sphere and the box is
+    used as gap
+    """
+    c = sphere.position
+    cb = box.center
+    pivot_s = _pivot(motion_s, c)
+    pivot_b = _pivot(motion_b, cb)
+    half = box.half_extents
+
+    speed = nl.norm(motion_s.linear - motion_b.linear) + \
+        motion_s._rotation_speed(c, 0., pivot_s) + \
+        motion_b._rotation_speed(cb, nl.norm(half), pivot_b)
+
+    def gap(t):
+        center, axes = _box_pose(box, motion_b, pivot_b, t)
+        return dist_spheres2boxes(motion_s._points(c, pivot_s, t),
+                                  sphere.radius, center, axes, half)[0]
+
+    return _advance(gap, speed, dt, atol, max_iterations)
+
+
+def toi_box2plane(box, plane, motion_b, motion_p, dt, atol, max_iterations):
+    """
+    time of impact of a box and a moving plane with the conservative
+    advancement
+    """
+    _plane_motion(motion_p)
+    n, d = plane.equation
+
+    c = box.center
+    pivot = _pivot(motion_b, c)
+    corners = box.corners
+
+    # only the velocity along the normal vector changes the distance
+    speed = np.abs(np.dot(n, motion_b.linear - motion_p.linear)) + \
+        motion_b._rotation_speed(c, nl.norm(box.half_extents), pivot)
+
+    def gap(t):
+        s = np.dot(motion_b._points(corners, pivot, t), n) - d - \
+            np.dot(n, motion_p.linear) * t
+        if s.min() <= 0. <= s.max():
+            return 0.
+        return np.abs(s).min()
+
+    return _advance(gap, speed, dt, atol, max_iterations)
+
+
+# registration of the time of impact functions
+register_time_of_impact(Sphere, Sphere)(toi_sphere2sphere)
+register_time_of_impact(Sphere, Plane)(toi_sphere2plane)
+register_time_of_impact(Sphere, Box)(toi_sphere2box)
+register_time_of_impact(Box, Box)(toi_box2box)
+register_time_of_impact(Box, Plane)(toi_box2plane)
@@ -11,13 +11,8 @@ This module defines all 3d collision routines
 """
 import sys
 
-try:
-    import pycollision.objects
-except:
-    pass
 
-
-from pycollision.debug import debug
+from pycollision.debug import debug, debug_enabled
 from pycollision.geometry import *
 
 import numpy as np
@@ -27,6 +22,18 @@ import numpy as np
 cmp_atol = 1e-08
 
 
+# registry of all collision functions, the keys are pairs of classes,
+# the values are tuples (func, symmetric)
+_collision_registry = {}
+
+# cache of the lookups for pairs of classes
+_collision_cache = {}
+
+# registry and cache of the boolean intersection functions
+_intersection_registry = {}
+_intersection_cache = {}
+
+
 class Collision(object):
     """
     The collision object, provides only the member has_collisions.
@@ -54,31 +61,226 @@ class Collision(object):
             functions
 
         """
-        if isinstance(self, pycollision.objects.Sphere):
-            if isinstance(obj, pycollision.objects.Sphere):
-                return coll_sphere2sphere(self, obj, **kwargs)
-            elif isinstance(obj, pycollision.objects.Plane):
-                return coll_sphere2plane(self, obj, **kwargs)
-
-        if isinstance(self, pycollision.objects.Box):
-            if isinstance(obj, pycollision.objects.Box):
-                return coll_box2box(self, obj, **kwargs)
-            elif isinstance(obj, pycollision.objects.Plane):
-                return coll_box2plane(self, obj, **kwargs)
-
-        if isinstance(self, pycollision.objects.Plane):
-            if isinstance(obj, pycollision.objects.Plane):
-                return coll_plane2plane(self, obj, **kwargs)
-            elif isinstance(obj, pycollision.objects.Sphere):
-                return coll_sphere2plane(obj, self, **kwargs)
-            elif isinstance(obj, pycollision.objects.Box):
-                return coll_box2plane(obj, self, **kwargs)
+        proc = find_collision_procedure(self, obj)
+        if proc is not None:
+            if getattr(self, '_verbose', False) or \
+                    getattr(obj, '_verbose', False):
+                kwargs.setdefault('verbose', True)
+            func, swapped = proc
+            if swapped:
+                return func(obj, self, **kwargs)
+            return func(self, obj, **kwargs)
 
         raise ValueError('Cannot find any collision procedure' +
                          ' for given types {} and {}'.format(
                                 self.__class__.__name__,
                                 obj.__class__.__name__))
 
+    def intersects(self, obj, atol=cmp_atol):
+        """
+        tests only if the objects are colliding, see intersects
+
+        Parameters
+        ----------
+        obj:
+            the object to test for collision
+        atol: float, optional
+            absolute tolerance for touching objects
+
+        Returns
+        -------
+        bool
+            True if both objects are colliding
+
+        Raises
+        ------
+        ValueError
+            will be raised if obj doesn't fit to any collision
+            functions
+        """
+        return intersects(self, obj, atol=atol)
+
+
+def register_collision(cls1, cls2, symmetric=True):
+    """
+    decorator which registers a collision function for a pair of
+    classes. The function is also used for all subclasses. An
+    existing registration for the same pair is replaced.
+
+    Parameters
+    ----------
+    cls1:
+        the class of the first argument of the function
+    cls2:
+        the class of the second argument of the function
+    symmetric: bool, optional
+        if True the function is also used for the reversed pair, the
+        arguments are swapped automatically, default is True
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        @register_collision(Sphere, Box)
+        def coll_sphere2box(sphere, box, **kwargs):
+            ...
+
+        box.has_collisions(sphere)  # calls coll_sphere2box(sphere, box)
+    """
+    def decorator(func):
+        _collision_registry[(cls1, cls2)] = (func, symmetric)
+        _collision_cache.clear()
+        return func
+
+    return decorator
+
+
+def unregister_collision(cls1, cls2):
+    """
+    removes the registered collision function for a pair of classes
+
+    Raises
+    ------
+    KeyError
+        if there is no registered function for the pair
+    """
+    del _collision_registry[(cls1, cls2)]
+    _collision_cache.clear()
+
+
+def register_intersection(cls1, cls2, symmetric=True):
+    """
+    decorator which registers a boolean intersection function for a
+    pair of classes, see register_collision. The function is called
+    with the two objects and atol and returns only True or False.
+    """
+    def decorator(func):
+        _intersection_registry[(cls1, cls2)] = (func, symmetric)
+        _intersection_cache.clear()
+        return func
+
+    return decorator
+
+
+def unregister_intersection(cls1, cls2):
+    """
+    removes the registered intersection function for a pair of classes
+
+    Raises
+    ------
+    KeyError
+        if there is no registered function for the pair
+    """
+    del _intersection_registry[(cls1, cls2)]
+    _intersection_cache.clear()
+
+
+def _lookup_procedure(registry, type1, type2):
+    # the most specific registration wins, exact order first
+    for c1 in type1.__mro__:
+        for c2 in type2.__mro__:
+            entry = registry.get((c1, c2))
+            if entry is not None:
+                return entry[0], False
+
+    for c2 in type2.__mro__:
+        for c1 in type1.__mro__:
+            entry = registry.get((c2, c1))
+            if entry is not None and entry[1]:
+                return entry[0], True
+
+    return None
+
+
+def find_collision_procedure(obj1, obj2):
+    """
+    looks up the collision function for the given pair of objects,
+    the result is cached for every pair of classes
+
+    Parameters
+    ----------
+    obj1:
+        the first object
+    obj2:
+        the second object
+
+    Returns
+    -------
+    tuple or None
+        (func, swapped) where func is the collision function and
+        swapped indicates that the function expects the objects in
+        reversed order, None if there is no collision function for
+        the given pair
+    """
+    key = (obj1.__class__, obj2.__class__)
+    try:
+        return _collision_cache[key]
+    except KeyError:
+        proc = _lookup_procedure(_collision_registry, key[0], key[1])
+        _collision_cache[key] = proc
+        return proc
+
+
+def find_intersection_procedure(obj1, obj2):
+    """
+    looks up the boolean intersection function for the given pair
+    of objects, see find_collision_procedure
+    """
+    key = (obj1.__class__, obj2.__class__)
+    try:
+        return _intersection_cache[key]
+    except KeyError:
+        proc = _lookup_procedure(_intersection_registry, key[0], key[1])
+        _intersection_cache[key] = proc
+        return proc
+
+
+def intersects(obj1, obj2, atol=cmp_atol):
+    """
+    tests only if two objects are colliding. The registered
+    intersection functions skip all additional results of the
+    collision functions. If there is no intersection function for
+    the pair the collision function is used.
+
+    Parameters
+    ----------
+    obj1:
+        the first object
+    obj2:
+        the second object
+    atol: float, optional
+        absolute tolerance for touching objects
+
+    Returns
+    -------
+    bool
+        True if both objects are colliding
+
+    Raises
+    ------
+    ValueError
+        will be raised if the objects don't fit to any collision
+        functions
+    """
+    proc = find_intersection_procedure(obj1, obj2)
+    if proc is not None:
+        func, swapped = proc
+        if swapped:
+            return func(obj2, obj1, atol)
+        return func(obj1, obj2, atol)
+
+    proc = find_collision_procedure(obj1, obj2)
+    if proc is None:
+        raise ValueError('Cannot find any collision procedure' +
+                         ' for given types {} and {}'.format(
+                                obj1.__class__.__name__,
+                                obj2.__class__.__name__))
+    func, swapped = proc
+    if swapped:
+        return bool(func(obj2, obj1, atol=atol)())
+    return bool(func(obj1, obj2, atol=atol)())
+
 
 class CollisionResult(object):
     """
@@ -86,7 +288,9 @@ class CollisionResult(object):
     the collision test. It works like a normal Python
     dictionary. The only item which is always available is
     'collision'. All additional data are different for different
-    collision types.
+    collision types. Expensive data can be stored as a deferred
+    function, which is only called when the item is read. The value
+    is stored, so the function is called only once.
 
     Attributes
     ----------
@@ -94,23 +298,87 @@ class CollisionResult(object):
         hold the collision result
     _data: dict
         additional information
+    _deferred: dict
+        functions which calculate additional information on demand,
+        the values are tuples (names, func)
     """
-    def __init__(self):
-        self._collision = False
+    __slots__ = ('_collision', '_data', '_deferred')
+
+    def __init__(self, collision=False):
+        self._collision = collision
         self._data = {}
+        self._deferred = None
 
     def __setitem__(self, idx, val):
         if idx == 'collision':
             self._collision = val
         else:
             self._data[idx] = val
+            if self._deferred is not None:
+                self._deferred.pop(idx, None)
 
     def __getitem__(self, idx):
         if idx == 'collision':
             return self._collision
-        else:
+        try:
+            return self._data[idx]
+        except KeyError:
+            if self._deferred is None or idx not in self._deferred:
+                raise
+            self._resolve(idx)
             return self._data[idx]
 
+    def __contains__(self, idx):
+        return idx == 'collision' or idx in self._data or \
+            (self._deferred is not None and idx in self._deferred)
+
+    def defer(self, idx, func):
+        """
+        stores a function which calculates the item idx on
+        the first access
+
+        Parameters
+        ----------
+        idx: str or tuple
+            the name of the item or a tuple of names for items which
+            are calculated together
+        func:
+            function without arguments which returns the value or
+            a tuple of values if idx is a tuple
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            result.defer(('depth', 'axis'), lambda: (1., axis))
+            result['axis']   # calculates and stores both items
+        """
+        if self._deferred is None:
+            self._deferred = {}
+        names = idx if isinstance(idx, tuple) else (idx,)
+        for name in names:
+            self._data.pop(name, None)
+            self._deferred[name] = (idx, func)
+
+    def _resolve(self, idx):
+        # calls the deferred function of the item idx and stores all
+        # items of this function which were not replaced meanwhile
+        names, func = self._deferred[idx]
+        values = func()
+        if not isinstance(names, tuple):
+            names, values = (names,), (values,)
+        for name, val in zip(names, values):
+            entry = self._deferred.get(name)
+            if entry is not None and entry[1] is func:
+                del self._deferred[name]
+                self._data[name] = val
+
+    def _evaluate(self):
+        # calculates all deferred items
+        while self._deferred:
+            self._resolve(next(iter(self._deferred)))
+
     def items(self):
         """
         Returns
@@ -119,48 +387,43 @@ class CollisionResult(object):
             the complete data of the result dictionary
 
         """
+        self._evaluate()
         return self._data.items()
 
     def __call__(self):
         return self._collision
 
     def __str__(self):
+        self._evaluate()
         return '{{collision: {}, data: {}}}'.format(self._collision,
                                                     self._data)
 
 
-def coll_sphere2sphere(sph1, sph2, **kwargs):
-    atol = cmp_atol
-    verbose = False
-    # handle all arguments
-    for key, value in kwargs.items():
-        if key == 'verbose':
-            verbose = value
-        elif key == 'atol':
-            atol = value
-
+def coll_sphere2sphere(sph1, sph2, atol=cmp_atol, verbose=False, **kwargs):
+    verbose = debug_enabled(verbose)
     if verbose:
         debug('calculating collision between two spheres')
     result = CollisionResult()
 
-    # calculate the distance of the two spheres
-    distance = np.sqrt(np.sum((sph1.position - sph2.position)**2))
+    # calculate the squared distance of the two spheres
+    diff = sph1.position - sph2.position
+    distance2 = np.dot(diff, diff)
+    radii = sph1.radius + sph2.radius
 
-    result['distance'] = distance
+    result.defer('distance', lambda: np.sqrt(distance2))
+    result.defer('outerdistance', lambda: np.sqrt(distance2) - radii)
     if verbose:
-        debug(' absolute distance is: %g' % distance)
-
-    distance -= sph1.radius + sph2.radius
+        debug(' absolute distance is: %g' % result['distance'])
+        debug(' outer distance is: %g' % result['outerdistance'])
 
-    result['outerdistance'] = distance
-    if verbose:
-        debug(' outer distance is: %g' % distance)
+    # every outside atol is clear, the outer distance is smaller
+    # than atol if the squared values are
+    limit = radii + atol
+    result['collision'] = bool(distance2 <= limit * limit)
 
-    # every outside atol is clear
-    if distance < atol:
-        result['collision'] = True
-    else:
-        result['collision'] = np.isclose(distance, 0., atol=atol)
+    if result['collision']:
+        result.defer('contact', lambda: _sphere_contact(
+            sph1.position, sph1.radius, sph2.position, sph2.radius))
 
     if verbose:
         debug(' collision:', result['collision'])
@@ -169,43 +432,54 @@ def coll_sphere2sphere(sph1, sph2, **kwargs):
     return result
 
 
-def box_inside_box(box1, box2, atol, verbose):
-    # the algorithm based on the assumption that we can check if
-    # all corner points of box1 are not in box2 the box1 has no
-    # overlap with box2 (true, but one has to check the other way
-    # as well)!
-
-    for i in box1._corners:
-        i = box1.calculate_position(i)
-        vol = box2.get_volume(center=i)
-        if verbose:
-            debug(' c=%s vol=%g vol_ref=%g' % (i, vol, box2._volume))
-        if np.isclose(vol, box2._volume, rtol=atol, atol=atol):
-            return True
+def _sphere_contact(center1, radius1, center2, radius2):
+    # the contact point is in the middle of the overlap of both
+    # spheres on the line between the centers
+    diff = center2 - center1
+    distance = nl.norm(diff)
+    if distance == 0.:
+        return center1.copy()
+    return center1 + diff * ((distance + radius1 - radius2) / 2. / distance)
 
-    return False
 
+def isect_sphere2sphere(sph1, sph2, atol=cmp_atol):
+    """
+    fast boolean version of coll_sphere2sphere
+    """
+    diff = sph1.position - sph2.position
+    limit = sph1.radius + sph2.radius + atol
+    return bool(np.dot(diff, diff) <= limit * limit)
 
-def coll_box2box(box1, box2, **kwargs):
-    atol = cmp_atol
-    verbose = False
-    # handle all arguments
-    for key, value in kwargs.items():
-        if key == 'verbose':
-            verbose = value
-        elif key == 'atol':
-            atol = value
 
+def coll_box2box(box1, box2, atol=cmp_atol, verbose=False,
+                 penetration=False, **kwargs):
+    verbose = debug_enabled(verbose)
     if verbose:
         debug('calculating collision between two boxes')
         debug(' atol=%g' % atol)
     result = CollisionResult()
 
-    collision = box_inside_box(box1, box2, atol, verbose)
-    if not collision:
-        collision = box_inside_box(box2, box1, atol, verbose)
+    # separating axis test of both oriented boxes
+    collision, depth, axis = obb_overlap(box1.center, box1.axes,
+                                         box1.half_extents,
+                                         box2.center, box2.axes,
+                                         box2.half_extents,
+                                         atol=atol,
+                                         penetration=penetration)
 
     result['collision'] = collision
+    if depth is not None:
+        result['depth'] = depth
+        result['axis'] = axis
+        if verbose:
+            debug(' penetration depth=%g axis=%s' % (depth, axis))
+    elif collision:
+        # the search for the axis with the smallest overlap tests
+        # all 15 axes, so it runs only if the items are read
+        result.defer(('depth', 'axis'), lambda: obb_overlap(
+            box1.center, box1.axes, box1.half_extents,
+            box2.center, box2.axes, box2.half_extents,
+            atol=atol, penetration=True)[1:])
 
     if verbose:
         debug('collision:', result['collision'])
@@ -214,22 +488,26 @@ def coll_box2box(box1, box2, **kwargs):
     return result
 
 
-def coll_plane2plane(plane1, plane2, **kwargs):
-    atol = cmp_atol
-    verbose = False
-    # handle all arguments
-    for key, value in kwargs.items():
-        if key == 'verbose':
-            verbose = value
-        elif key == 'atol':
-            atol = value
+def isect_box2box(box1, box2, atol=cmp_atol):
+    """
+    fast boolean version of coll_box2box
+    """
+    return obb_overlap(box1.center, box1.axes, box1.half_extents,
+                       box2.center, box2.axes, box2.half_extents,
+                       atol=atol)[0]
+
 
+def coll_plane2plane(plane1, plane2, atol=cmp_atol, verbose=False,
+                     **kwargs):
+    verbose = debug_enabled(verbose)
     if verbose:
         debug('calculating collision between two planes')
         debug(' atol=%g' % atol)
     result = CollisionResult()
 
-    cross = np.cross(plane1.norm_vector, plane2.norm_vector)
+    n1, d1 = plane1.equation
+    n2, d2 = plane2.equation
+    cross = np.cross(n1, n2)
 
     if verbose:
         debug(' cross_check_vector=%s' % cross)
@@ -239,16 +517,15 @@ def coll_plane2plane(plane1, plane2, **kwargs):
     if not np.isclose(nl.norm(cross), 0., atol=atol):
         result['collision'] = True
         result['type'] = 'crossing'
-        p, v = intersection_of_planes(plane1.norm_vector, plane1.distance,
-                                      plane2.norm_vector, plane2.distance)
         result['intersection'] = 'line'
-        result['intersection_params'] = (p, v)
+        result.defer('intersection_params', lambda: intersection_of_planes(
+            n1, d1, n2, d2))
     else:
-        if np.isclose(plane1.distance, plane2.distance, atol=atol):
+        if _same_plane(n1, d1, n2, d2, atol):
             result['collision'] = True
             result['type'] = 'identical'
             result['intersection'] = 'plane'
-            result['intersection_params'] = (plane1.distance, plane2.distance)
+            result['intersection_params'] = (d1, d2)
 
     if verbose:
         debug('collision:', result['collision'])
@@ -257,16 +534,28 @@ def coll_plane2plane(plane1, plane2, **kwargs):
     return result
 
 
-def coll_sphere2plane(sphere, plane, **kwargs):
-    atol = cmp_atol
-    verbose = False
-    # handle all arguments
-    for key, value in kwargs.items():
-        if key == 'verbose':
-            verbose = value
-        elif key == 'atol':
-            atol = value
+def isect_plane2plane(plane1, plane2, atol=cmp_atol):
+    """
+    fast boolean version of coll_plane2plane
+    """
+    n1, d1 = plane1.equation
+    n2, d2 = plane2.equation
+    if not np.isclose(nl.norm(np.cross(n1, n2)), 0., atol=atol):
+        return True
+    return _same_plane(n1, d1, n2, d2, atol)
+
+
+def _same_plane(n1, d1, n2, d2, atol):
+    # parallel planes with opposite normal vectors are identical if
+    # the distances have opposite signs
+    if np.dot(n1, n2) < 0.:
+        d2 = -d2
+    return bool(np.isclose(d1, d2, atol=atol))
+
 
+def coll_sphere2plane(sphere, plane, atol=cmp_atol, verbose=False,
+                      **kwargs):
+    verbose = debug_enabled(verbose)
     if verbose:
         debug('calculating collision between a sphere and a plane')
         debug(' atol=%g' % atol)
@@ -274,11 +563,9 @@ def coll_sphere2plane(sphere, plane, **kwargs):
 
     v = sphere.position
 
-    # the vector s is the vector which is perpendicular to
-    # the plane pointing direct to the center of the sphere
-    # s = projection_vector(v, plane.norm_vector)
-    # distance = nl.norm(s) + plane.distance
-    distance = np.abs(distance_to_plane(v, plane.norm_vector, plane.distance))
+    # the absolute value of the signed distance of the center
+    n, d = plane.equation
+    distance = np.abs(np.dot(v, n) - d)
 
     result['distance'] = distance
     if verbose:
@@ -291,7 +578,10 @@ def coll_sphere2plane(sphere, plane, **kwargs):
         debug(' outer distance is: %g' % distance)
 
     # every outside atol is clear
-    result['collision'] = np.isclose(distance, 0., atol=atol)
+    result['collision'] = bool(distance <= atol)
+
+    if result['collision']:
+        result.defer('contact', lambda: _plane_contact(v, plane))
 
     if verbose:
         debug('collision:', result['collision'])
@@ -300,88 +590,71 @@ def coll_sphere2plane(sphere, plane, **kwargs):
     return result
 
 
+def _plane_contact(point, plane):
+    # the projection of the point onto the plane
+    n, d = plane.equation
+    return point - n * (np.dot(point, n) - d)
+
+
+def isect_sphere2plane(sphere, plane, atol=cmp_atol):
+    """
+    fast boolean version of coll_sphere2plane
+    """
+    n, d = plane.equation
+    distance = np.abs(np.dot(sphere.position, n) - d)
+    return bool(distance - sphere.radius <= atol)
+
+
 """
 coll_box2plane
 
-the algorithm based on the brute force test of all eight corners and
-their distances to the plane. If all distances have the same sign,
-they are always on the same side of the plane and therefore there is
-no collision. Otherwise with some points in front and behind the plane
-we have a collision. The collision figure, the polygon is a different
-story.
+the algorithm is based on the signed distances of all eight corners to
+the plane. If all distances have the same sign, the corners are on the
+same side of the plane and therefore there is no collision. Otherwise
+with some points in front and behind the plane we have a collision.
+The collision figure is the polygon of the corners on the plane and
+the intersection points of the edges which cross the plane. It is
+calculated only if the item 'intersection_params' is read.
 """
 
 
-def coll_box2plane(box, plane, **kwargs):
-    atol = cmp_atol
-    verbose = False
-    # handle all arguments
-    for key, value in kwargs.items():
-        if key == 'verbose':
-            verbose = value
-        elif key == 'atol':
-            atol = value
-
+def coll_box2plane(box, plane, atol=cmp_atol, verbose=False, **kwargs):
+    verbose = debug_enabled(verbose)
     if verbose:
         debug('calculating collision between a box and a plane')
         debug(' atol=%g' % atol)
     result = CollisionResult()
 
-    distances = np.zeros(len(box._corners))
-    c = box.corners
-    for i in range(len(distances)):
-        distances[i] = distance_to_plane(c[i],
-                                         plane.norm_vector,
-                                         plane.distance)
+    n, d = plane.equation
+    corners = box.corners
+    distances = np.dot(corners, n) - d
 
     if verbose:
         debug(' distances=%s' % distances)
 
-    nnp = nnm = nnn = 0
-    for i in distances:
-        if np.isclose(i, 0., atol=atol):
-            nnn += 1
-        elif i > atol:
-            nnp += 1
-        else:
-            nnm += 1
-
-    if verbose:
-        debug(' (nnp, nnm, nnn)=(%i, %i, %i)' % (nnp, nnm, nnn))
-
-    if nnn > 0:
-        # one or more points directly on the plane
-        result['collision'] = True
-    else:
-        if (nnp != 8) or (nnm != 8):
-            result['collision'] = True
+    result['collision'] = bool(distances.min() <= atol and
+                               distances.max() >= -atol)
 
     if result['collision']:
-        # try to get the intersection figure
-        edges = box.edges
-        points = []
-        for e in edges:
-            # test a single edge ...
-            p = intersection_line_plane(e, plane.norm_vector, plane.distance)
-            if p is not None:
-                vol = box.get_volume(center=p)
-                if verbose:
-                    debug(' c=%s vol=%g vol_ref=%g' % (i, vol, box._volume))
-                if np.isclose(vol, box._volume, rtol=atol, atol=atol):
-                    points.append(p)
-
-        points = np.array(points)
-
-        if verbose:
-            debug(' points (unsorted) in the plane = %s' % points)
-        if len(points) > 3:
-            points = polygon_sort(points, plane.norm_vector, atol=atol)
+        result['intersection'] = 'polygon'
+        result.defer('intersection_params', lambda: box_plane_polygon(
+            corners, distances, n, atol=atol))
 
         if verbose:
-            debug(' points (sorted) in the plane = %s' % points)
+            debug(' polygon = %s' % result['intersection_params'])
 
     if verbose:
         debug('collision:', result['collision'])
         debug('Done.')
 
     return result
+
+
+def isect_box2plane(box, plane, atol=cmp_atol):
+    """
+    fast boolean version of coll_box2plane, the box collides with
+    the plane if the corners are not all on the same side
+    """
+    n, d = plane.equation
+    distances = np.dot(box.corners, n) - d
+    return bool(distances.min() <= atol and distances.max() >= -atol)
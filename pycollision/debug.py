@@ -2,7 +2,7 @@
 # pycollision/debug.py
 #
 # written by: Oliver Cordes 2019-06-30
-# changed by: Oliver Cordes 2019-08-02
+# changed by: Oliver Cordes 2026-10-18
 #
 
 """
@@ -10,10 +10,82 @@
 debug
 
 writes a debug message
+
+The messages are only written if the caller is verbose, all calls
+should be guarded with
+
+.. code-block:: python
+
+    if debug_enabled(verbose):
+        debug(' distance=%g' % distance)
+
+so that nothing is formatted if debugging is switched off. Debugging
+can be switched on for all objects with set_debug, the messages can
+be redirected to the logging module. Every message has a level of the
+logging module, the default is DEBUG, summaries use INFO:
+
+.. code-block:: python
+
+    if debug_enabled(verbose, logging.INFO):
+        debug('%i collisions' % n, level=logging.INFO)
+
+set_debug takes a minimum level for the global switch, the messages
+of verbose objects are always written.
 """
 
+import logging
+
+
+# logger which receives the messages if logging is used
+logger = logging.getLogger('pycollision')
+
+# global switches, see set_debug
+_debug_all = False
+_debug_logging = False
+_debug_level = logging.DEBUG
+
+
+def set_debug(enabled=True, use_logging=None, level=None):
+    """
+    switches the debug output for all objects and functions on or off
+
+    Parameters
+    ----------
+    enabled: bool, optional
+        if True, all guarded debug messages were written even if the
+        objects are not verbose
+    use_logging: bool, optional
+        if True, the messages were sent to the logger 'pycollision'
+        with the level of the message instead of stdout, if None the
+        setting is not changed
+    level: int, optional
+        minimum level of the messages which were written by the
+        global switch, e.g. logging.INFO, if None the setting is
+        not changed
+    """
+    global _debug_all, _debug_logging, _debug_level
+    _debug_all = bool(enabled)
+    if use_logging is not None:
+        _debug_logging = bool(use_logging)
+    if level is not None:
+        _debug_level = level
+
+
+def debug_enabled(verbose=False, level=logging.DEBUG):
+    """
+    returns True if debug messages should be written
+
+    Parameters
+    ----------
+    verbose: bool, optional
+        the verbose flag of the object or function
+    level: int, optional
+        the level of the messages, default is logging.DEBUG
+    """
+    return verbose or (_debug_all and level >= _debug_level)
+
 
-def debug(*vars):
+def debug(*vars, level=logging.DEBUG):
     """
     prints a debug message
 
@@ -21,6 +93,12 @@ def debug(*vars):
     ---------
     vars:
         variable number of arguments similar to the print function
+    level: int, optional
+        the level of the message, default is logging.DEBUG
     """
+    if _debug_logging:
+        if logger.isEnabledFor(level):
+            logger.log(level, ' '.join([str(i) for i in vars]))
+        return
     s = ' '.join([str(i) for i in vars])
-    print('DEBUG: '+s, flush=True)
+    print(logging.getLevelName(level)+': '+s, flush=True)
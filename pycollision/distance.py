@@ -0,0 +1,485 @@
+#
+# pycollision/distance.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines distance queries between two objects. The signed
+separation is the distance of the surfaces, it is negative if the
+objects overlap. The closest points are the points on both objects
+which realize the separation, for overlapping objects the points of
+the deepest penetration. Queries with a maximum distance stop as soon
+as a lower limit of the separation exceeds the threshold.
+
+"""
+
+from pycollision.objects import Sphere, Box, Plane
+from pycollision.collision import _lookup_procedure
+from pycollision.batch import _group_objects, _subclass_pairs, \
+                              _custom_pairs, _parallel_planes
+from pycollision.geometry import obb_overlap, obb_separation, box_edges
+
+import numpy as np
+import numpy.linalg as nl
+
+
+# constants
+cmp_atol = 1e-08
+
+
+# registry of the distance functions, see register_collision
+_distance_registry = {}
+
+
+def _dot(a, b):
+    return np.einsum('...k,...k->...', a, b)
+
+
+def _unit(v):
+    # normalized vectors, the x axis for zero vectors
+    length = nl.norm(v, axis=-1)[..., None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = v / length
+    return np.where(length > 0., u, np.array([1., 0., 0.]))
+
+
+"""
+The distance kernels work on broadcastable arrays, so they are used
+for single pairs and for complete distance matrices. All return the
+tuple (separation, point1, point2).
+"""
+
+
+def dist_spheres2spheres(c1, r1, c2, r2):
+    """
+    distances between spheres with the centers c1, c2 and the radii
+    r1, r2
+    """
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
+    diff = c2 - c1
+    u = _unit(diff)
+    separation = nl.norm(diff, axis=-1) - r1 - r2
+    return separation, c1 + u * r1[..., None], c2 - u * r2[..., None]
+
+
+def dist_spheres2planes(c, r, n, d):
+    """
+    distances between spheres and planes with the normalized plane
+    equations n, d
+    """
+    r = np.asarray(r, dtype=np.float64)
+    s = _dot(c, n) - d
+    side = np.where(s < 0., -1., 1.)
+    separation = np.abs(s) - r
+    return separation, c - n * (side * r)[..., None], c - n * s[..., None]
+
+
+def dist_spheres2boxes(c, r, centers, axes, half):
+    """
+    distances between spheres and oriented boxes, the axes are given
+    as columns
+    """
+    r = np.asarray(r, dtype=np.float64)
+    local = np.einsum('...j,...jk->...k', c - centers, axes)
+    outside = np.any(np.abs(local) > half, axis=-1)
+
+    # the closest point of the box to an outside center
+    q = centers + np.einsum('...jk,...k->...j', axes,
+                            np.clip(local, -half, half))
+    diff = c - q
+    length = nl.norm(diff, axis=-1)
+
+    # centers inside the box are pushed out through the nearest face
+    depth = half - np.abs(local)
+    face = np.argmin(depth, axis=-1)[..., None]
+    depth = np.take_along_axis(depth, face, axis=-1)[..., 0]
+    sign = np.where(np.take_along_axis(local, face, axis=-1) < 0., -1., 1.)
+    normal = np.einsum('...jk,...k->...j', axes,
+                       (np.arange(3) == face) * sign)
+
+    u = np.where(outside[..., None], _unit(diff), normal)
+    separation = np.where(outside, length - r, -(depth + r))
+    point2 = np.where(outside[..., None], q, c + normal * depth[..., None])
+    return separation, c - u * r[..., None], point2
+
+
+def dist_boxes2planes(corners, n, d):
+    """
+    distances between boxes given by their (...,8,3) corners and planes
+    """
+    s = np.einsum('...ck,...k->...c', corners, n) - \
+        np.asarray(d, dtype=np.float64)[..., None]
+    smin = s.min(axis=-1)
+    smax = s.max(axis=-1)
+
+    # the corner closest to the plane from outside or the deepest
+    # corner on the side with the smaller penetration
+    use_min = np.where(smin >= 0., True,
+                       np.where(smax <= 0., False, -smin <= smax))
+    separation = np.where(smin >= 0., smin,
+                          np.where(smax <= 0., -smax,
+                                   np.where(use_min, smin, -smax)))
+    idx = np.where(use_min, s.argmin(axis=-1), s.argmax(axis=-1))[..., None]
+    corner = np.take_along_axis(
+        np.broadcast_to(corners, s.shape + (3,)), idx[..., None],
+        axis=-2)[..., 0, :]
+    sc = np.take_along_axis(s, idx, axis=-1)
+    return separation, corner, corner - n * sc
+
+
+def dist_planes2planes(n1, d1, n2, d2, atol=cmp_atol):
+    """
+    distances between planes, crossing planes have the separation 0
+    and a common point on the intersection line
+    """
+    cos, parallel = _parallel_planes(n1, n2, atol)
+    sin2 = 1. - cos**2
+    sign = np.where(cos < 0., -1., 1.)
+    separation = np.where(parallel, np.abs(d1 - sign * d2), 0.)
+
+    # point on the intersection line, see intersection_of_planes
+    with np.errstate(divide='ignore', invalid='ignore'):
+        c1 = (d1 - d2 * cos) / sin2
+        c2 = (d2 - d1 * cos) / sin2
+        line = c1[..., None] * n1 + c2[..., None] * n2
+
+    p = n1 * np.asarray(d1, dtype=np.float64)[..., None]
+    point1 = np.where(parallel[..., None], p, line)
+    point2 = np.where(parallel[..., None],
+                      p - n2 * (_dot(n2, p) - d2)[..., None], line)
+    return separation, point1, point2
+
+
+def _segments(p1, q1, p2, q2):
+    # closest points of segment pairs
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = _dot(d1, d1)
+    e = _dot(d2, d2)
+    b = _dot(d1, d2)
+    c = _dot(d1, r)
+    f = _dot(d2, r)
+
+    denom = a * e - b * b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(denom > cmp_atol, np.clip((b * f - c * e) / denom,
+                                               0., 1.), 0.)
+        t = (b * s + f) / e
+        s = np.where(t < 0., np.clip(-c / a, 0., 1.),
+                     np.where(t > 1., np.clip((b - c) / a, 0., 1.), s))
+    t = np.clip(t, 0., 1.)
+    return p1 + d1 * s[..., None], p2 + d2 * t[..., None]
+
+
+def _box_arrays(box):
+    return box.center, box.axes, box.half_extents
+
+
+def dist_box2box(box1, box2, max_distance=np.inf):
+    """
+    distance of two boxes, the gap of the separating axis test is a
+    lower limit and stops the query early. Separated boxes are tested
+    with all corners against the other box and all edge pairs.
+    """
+    gap = obb_separation(*(_box_arrays(box1) + _box_arrays(box2)))
+    if gap > max_distance:
+        return None
+
+    if gap <= 0.:
+        collision, depth, axis = obb_overlap(
+            *(_box_arrays(box1) + _box_arrays(box2)), atol=0.,
+            penetration=True)
+        if depth is not None:
+            # the deepest point of the second box inside the first
+            center, axes, half = _box_arrays(box2)
+            point2 = center - np.dot(axes, np.sign(np.dot(axes.T, axis)) *
+                                     half)
+            return -depth, point2 + axis * depth, point2
+
+    c1 = box1.corners
+    c2 = box2.corners
+    candidates = []
+
+    sep, q, p = dist_spheres2boxes(c1, 0., *_box_arrays(box2))
+    i = np.argmin(sep)
+    candidates.append((sep[i], c1[i], p[i]))
+
+    sep, q, p = dist_spheres2boxes(c2, 0., *_box_arrays(box1))
+    i = np.argmin(sep)
+    candidates.append((sep[i], p[i], c2[i]))
+
+    e1 = c1[box_edges]
+    e2 = c2[box_edges]
+    point1, point2 = _segments(e1[:, None, 0], e1[:, None, 1],
+                               e2[None, :, 0], e2[None, :, 1])
+    sep = nl.norm(point2 - point1, axis=-1)
+    i, j = np.unravel_index(np.argmin(sep), sep.shape)
+    candidates.append((sep[i, j], point1[i, j], point2[i, j]))
+
+    return min(candidates, key=lambda c: c[0])
+
+
+def register_distance(cls1, cls2, symmetric=True):
+    """
+    decorator which registers a distance function for a pair of
+    classes, see pycollision.collision.register_collision. The function
+    is called with the two objects and max_distance and returns the
+    tuple (separation, point1, point2) or None if the separation is
+    known to be larger than max_distance.
+    """
+    def decorator(func):
+        _distance_registry[(cls1, cls2)] = (func, symmetric)
+        return func
+
+    return decorator
+
+
+def distance(obj1, obj2, max_distance=np.inf):
+    """
+    calculates the signed separation and the closest points of two
+    objects
+
+    Parameters
+    ----------
+    obj1:
+        the first object
+    obj2:
+        the second object
+    max_distance: float, optional
+        objects which are farther away are not calculated completely
+
+    Returns
+    -------
+    tuple or None
+        (separation, point1, point2) with the signed separation, which
+        is negative for overlapping objects, and the closest points on
+        obj1 and obj2, or None if the separation is larger than
+        max_distance
+
+    Raises
+    ------
+    ValueError
+        if there is no distance function for the objects
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        result = distance(box, wall, max_distance=0.1)
+        if result is not None:
+            separation, p1, p2 = result
+    """
+    proc = _lookup_procedure(_distance_registry, obj1.__class__,
+                             obj2.__class__)
+    if proc is None:
+        raise ValueError('Cannot find any distance procedure' +
+                         ' for given types {} and {}'.format(
+                                obj1.__class__.__name__,
+                                obj2.__class__.__name__))
+    func, swapped = proc
+    if swapped:
+        result = func(obj2, obj1, max_distance)
+    else:
+        result = func(obj1, obj2, max_distance)
+    if result is None:
+        return None
+
+    separation, point1, point2 = result
+    if separation > max_distance:
+        return None
+    if swapped:
+        point1, point2 = point2, point1
+    return float(separation), point1, point2
+
+
+def _sphere2sphere(sph1, sph2, max_distance):
+    return dist_spheres2spheres(sph1.position, sph1.radius,
+                                sph2.position, sph2.radius)
+
+
+def _sphere2box(sphere, box, max_distance):
+    return dist_spheres2boxes(sphere.position, sphere.radius,
+                              *_box_arrays(box))
+
+
+def _sphere2plane(sphere, plane, max_distance):
+    n, d = plane.equation
+    return dist_spheres2planes(sphere.position, sphere.radius, n, d)
+
+
+def _box2plane(box, plane, max_distance):
+    n, d = plane.equation
+    return dist_boxes2planes(box.corners, n, d)
+
+
+def _plane2plane(plane1, plane2, max_distance):
+    n1, d1 = plane1.equation
+    n2, d2 = plane2.equation
+    return dist_planes2planes(n1, d1, n2, d2)
+
+
+# kinds of pycollision.batch._group_objects in the order of the
+# distance kernels
+_kind_order = {'sphere': 0, 'box': 1, 'plane': 2}
+
+
+def _bounding(kind, data):
+    # centers and radii of the bounding spheres of a group
+    if kind == 'sphere':
+        return data[0], data[1]
+    return data[0], nl.norm(data[2], axis=1)
+
+
+def _lower_limit(kind1, data1, kind2, data2):
+    # lower limits of the separations of two groups from the bounding
+    # spheres, kind1 <= kind2
+    if kind1 == 'plane':
+        return np.full((len(data1), len(data2)), -np.inf)
+    c1, r1 = _bounding(kind1, data1)
+    if kind2 == 'plane':
+        return np.abs(np.dot(c1, data2[:, :3].T) - data2[:, 3]) - r1[:, None]
+    c2, r2 = _bounding(kind2, data2)
+    return nl.norm(c1[:, None] - c2[None], axis=-1) - r1[:, None] - r2[None]
+
+
+def _pair_kernel(kind1, data1, objs1, i, kind2, data2, objs2, j,
+                 max_distance):
+    # separations and closest points of the pairs (i[k], j[k]) of two
+    # groups, kind1 <= kind2
+    if kind1 == 'sphere' and kind2 == 'sphere':
+        return dist_spheres2spheres(data1[0][i], data1[1][i],
+                                    data2[0][j], data2[1][j])
+    if kind1 == 'sphere' and kind2 == 'box':
+        return dist_spheres2boxes(data1[0][i], data1[1][i], data2[0][j],
+                                  data2[1][j], data2[2][j])
+    if kind1 == 'sphere' and kind2 == 'plane':
+        return dist_spheres2planes(data1[0][i], data1[1][i],
+                                   data2[j, :3], data2[j, 3])
+    if kind1 == 'box' and kind2 == 'plane':
+        return dist_boxes2planes(data1[3][i], data2[j, :3], data2[j, 3])
+    if kind1 == 'plane' and kind2 == 'plane':
+        return dist_planes2planes(data1[i, :3], data1[i, 3],
+                                  data2[j, :3], data2[j, 3])
+
+    # boxes, one pair after the other with the early exit
+    separation = np.full(len(i), np.inf)
+    point1 = np.full((len(i), 3), np.nan)
+    point2 = np.full((len(i), 3), np.nan)
+    for k in range(len(i)):
+        d = dist_box2box(objs1[i[k]], objs2[j[k]], max_distance)
+        if d is not None:
+            separation[k], point1[k], point2[k] = d
+    return separation, point1, point2
+
+
+def _single(objs1, i, objs2, j, max_distance, separations, points1,
+            points2):
+    # one pair of the distance matrix with distance, nan for pairs
+    # without a distance function
+    if _lookup_procedure(_distance_registry, objs1[i].__class__,
+                         objs2[j].__class__) is None:
+        separations[i, j] = np.nan
+        return
+    result = distance(objs1[i], objs2[j], max_distance)
+    if result is not None:
+        separations[i, j], points1[i, j], points2[i, j] = result
+
+
+def distance_matrix(objs1, objs2=None, max_distance=np.inf):
+    """
+    calculates the signed separations and the closest points between
+    two sets of objects, the objects are grouped by type and calculated
+    with the vectorized distance kernels. With max_distance only the
+    pairs whose bounding spheres are closer than max_distance are
+    calculated, boxes additionally stop with the separating axis test.
+    Subclasses with own distance functions (see register_distance)
+    and all other objects are calculated with distance.
+
+    Parameters
+    ----------
+    objs1:
+        sequence of Sphere, Box and Plane objects
+    objs2: optional
+        second sequence of objects, default is objs1
+    max_distance: float, optional
+        pairs with a separation larger than max_distance are not
+        calculated completely
+
+    Returns
+    -------
+    tuple
+        (separations, points1, points2) with the (N,M) array of the
+        separations and the (N,M,3) arrays of the closest points on
+        the objects of objs1 and objs2, see distance. Pairs with a
+        separation larger than max_distance have the separation inf,
+        pairs without a distance routine nan, the points of both
+        are nan.
+    """
+    if objs2 is None:
+        objs2 = objs1
+    groups1 = _group_objects(objs1, _distance_registry)
+    groups2 = _group_objects(objs2, _distance_registry)
+
+    separations = np.full((len(objs1), len(objs2)), np.nan)
+    points1 = np.full((len(objs1), len(objs2), 3), np.nan)
+    points2 = np.full((len(objs1), len(objs2), 3), np.nan)
+    for kind1, (idx1, data1) in groups1.items():
+        for kind2, (idx2, data2) in groups2.items():
+            separations[np.ix_(idx1, idx2)] = np.inf
+            if kind1 is None or kind2 is None:
+                for i in idx1:
+                    for j in idx2:
+                        _single(objs1, i, objs2, j, max_distance,
+                                separations, points1, points2)
+                continue
+
+            members1 = [objs1[i] for i in idx1]
+            members2 = [objs2[i] for i in idx2]
+            swapped = _kind_order[kind1] > _kind_order[kind2]
+            if swapped:
+                args = (kind2, data2, members2, kind1, data1, members1)
+            else:
+                args = (kind1, data1, members1, kind2, data2, members2)
+
+            limit = _lower_limit(args[0], args[1], args[3], args[4])
+            i, j = np.nonzero(limit <= max_distance)
+            sep, p1, p2 = _pair_kernel(args[0], args[1], args[2], i,
+                                       args[3], args[4], args[5], j,
+                                       max_distance)
+            if swapped:
+                rows, cols = idx1[j], idx2[i]
+                p1, p2 = p2, p1
+            else:
+                rows, cols = idx1[i], idx2[j]
+
+            separations[rows, cols] = sep
+            points1[rows, cols] = p1
+            points2[rows, cols] = p2
+
+    # pairs of subclasses with own functions for the pair
+    pairs = _subclass_pairs(objs1, objs2, False)
+    for i, j in pairs[_custom_pairs(objs1, objs2, pairs,
+                                    _distance_registry)]:
+        _single(objs1, i, objs2, j, max_distance, separations, points1,
+                points2)
+
+    far = separations > max_distance
+    separations[far] = np.inf
+    points1[far] = np.nan
+    points2[far] = np.nan
+    return separations, points1, points2
+
+
+# registration of the distance functions
+register_distance(Sphere, Sphere)(_sphere2sphere)
+register_distance(Sphere, Box)(_sphere2box)
+register_distance(Sphere, Plane)(_sphere2plane)
+register_distance(Box, Box)(dist_box2box)
+register_distance(Box, Plane)(_box2plane)
+register_distance(Plane, Plane)(_plane2plane)
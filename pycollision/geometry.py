@@ -17,11 +17,17 @@ import numpy.linalg as nl
 
 import numpy.random as nr
 
-from pycollision.debug import debug
+from pycollision.debug import debug, debug_enabled
 
 # constants
 cmp_atol = 1e-8
 
+# relative tolerance for round-off errors in the separating axis test
+sat_rtol = 1e-12
+
+# cross products of box axes shorter than this are treated as parallel
+sat_parallel = 1e-6
+
 zero_x = np.array([1., 0., 0.])
 zero_y = np.array([0., 1., 0.])
 zero_z = np.array([0., 0., 1.])
@@ -100,12 +106,11 @@ def distance_to_plane(v, plane_norm, plane_dist):
     """
     distance_to_plane
 
-    calculate the distance from a point v to the plane given
-    by the normal vector and the distance
+    calculate the signed distance from a point v to the plane given
+    by the normal vector and the distance, points on the side of the
+    normal vector have a positive distance
     """
-    s = projection_vector(v, plane_norm)
-
-    return nl.norm(s) - plane_dist
+    return np.dot(v, plane_norm) / nl.norm(plane_norm) - plane_dist
 
 
 def orthogonal_vector(plane_norm, atol=cmp_atol):
@@ -193,28 +198,9 @@ def get_center_of_points_3D(points):
     a simple approach of calculating the middle of the min and max
     values for all 3 dimensions
     """
-    first = True
-    for p in points:
-        if first:
-            min_x = max_x = p[0]
-            min_y = max_y = p[1]
-            min_z = max_z = p[2]
-            first = False
-        else:
-            if p[0] > max_x:
-                max_x = p[0]
-            if p[0] < min_x:
-                min_x = p[0]
-            if p[1] > max_y:
-                max_y = p[1]
-            if p[1] < min_y:
-                min_y = p[1]
-            if p[2] > max_z:
-                max_z = p[2]
-            if p[2] < min_z:
-                min_z = p[2]
-
-    return np.array([(max_x+min_x)/2., (max_y+min_y)/2., (max_z+min_z)/2.])
+    points = np.asarray(points, dtype=np.float64)
+
+    return (points.min(axis=0) + points.max(axis=0)) / 2.
 
 
 def angle_between_vectors(x, v, w):
@@ -252,13 +238,10 @@ def polygon_sort(points, norm_vector, atol=cmp_atol):
     # get the reference vectors inside the plane
     v, w = plane_vectors(norm_vector, atol=atol)
 
-    # to store the angles
-    angles = np.zeros(len(points))
-
-    i = 0
-    for p in points:
-        angles[i] = angle_between_vectors((center-p), v, w)
-        i += 1
+    # the angles of all points around the center, only used for
+    # sorting, see angle_between_vectors
+    x = center - points
+    angles = np.arctan2(np.dot(x, w), np.dot(x, v))
 
     # sort the angles -> argsort to apply on points
     a = np.argsort(angles)
@@ -266,6 +249,182 @@ def polygon_sort(points, norm_vector, atol=cmp_atol):
     return points[a]
 
 
+# the corner indices of the 12 edges of a box, the same order as
+# Box.edges
+box_edges = np.array([[0, 1], [1, 2], [2, 3], [3, 0],
+                      [0, 4], [1, 5], [2, 6], [3, 7],
+                      [4, 5], [5, 6], [6, 7], [7, 4]])
+
+
+def box_plane_polygon(corners, distances, norm_vector, atol=cmp_atol):
+    """
+    box_plane_polygon
+
+    calculates the intersection polygon of a box and a plane from
+    the signed distances of the box corners. The polygon consists of
+    the corners on the plane and the intersection points of all edges
+    crossing the plane.
+
+    :param corners:     (8,3) array of the box corners
+    :param distances:   (8,) array of the signed distances of the corners
+    :param norm_vector: the normal vector of the plane
+    :param atol:        corners with a smaller distance are on the plane
+
+    :returns: (K,3) array of the sorted polygon corners
+    """
+    on = np.abs(distances) <= atol
+
+    # edges with the end points on different sides of the plane
+    sa = distances[box_edges[:, 0]]
+    sb = distances[box_edges[:, 1]]
+    crossing = ((sa > atol) & (sb < -atol)) | ((sa < -atol) & (sb > atol))
+
+    a = corners[box_edges[crossing, 0]]
+    b = corners[box_edges[crossing, 1]]
+    f = sa[crossing] / (sa[crossing] - sb[crossing])
+
+    points = np.concatenate((corners[on], a + (b - a) * f[:, None]))
+    if len(points) > 2:
+        points = polygon_sort(points, norm_vector, atol=atol)
+
+    return points
+
+
+"""
+--------------------------------------------------------------------------------
+Separating axis test
+"""
+
+# index arrays for the 9 cross products of the axes of two boxes
+_sat_i = np.repeat(np.arange(3), 3)
+_sat_j = np.tile(np.arange(3), 3)
+_sat_i1 = (_sat_i + 1) % 3
+_sat_i2 = (_sat_i + 2) % 3
+_sat_j1 = (_sat_j + 1) % 3
+_sat_j2 = (_sat_j + 2) % 3
+
+
+def _sat_separated(dist, radius, atol):
+    return np.any(dist - radius > atol + sat_rtol * (dist + radius))
+
+
+def obb_overlap(center1, axes1, half1, center2, axes2, half2,
+                atol=cmp_atol, penetration=False):
+    """
+    obb_overlap
+
+    tests two oriented boxes for an overlap with the separating axis
+    theorem. The test uses the 3 face normals of both boxes and the
+    9 cross products of the box edges and stops at the first axis
+    which separates both boxes.
+
+    :param center1:     the center of the first box
+    :param axes1:       3x3 matrix with the axes of the first box as columns
+    :param half1:       the half lengths of the first box along its axes
+    :param center2:     the center of the second box
+    :param axes2:       3x3 matrix with the axes of the second box as columns
+    :param half2:       the half lengths of the second box along its axes
+    :param atol:        boxes with a smaller gap are colliding
+    :param penetration: calculate the penetration depth and axis
+
+    :returns: tuple (collision, depth, axis), depth and axis are None if
+              there is no collision or penetration is False. The axis
+              points from the first to the second box, depth is the
+              overlap along this axis.
+    """
+    R = np.dot(axes1.T, axes2)
+    absR = np.abs(R)
+
+    # translation vector in the coordinates of the first box
+    t = np.dot(axes1.T, center2 - center1)
+
+    # the face normals of the first box
+    dist1 = np.abs(t)
+    radius1 = half1 + np.dot(absR, half2)
+    if _sat_separated(dist1, radius1, atol):
+        return False, None, None
+
+    # the face normals of the second box
+    t2 = np.dot(t, R)
+    dist2 = np.abs(t2)
+    radius2 = np.dot(half1, absR) + half2
+    if _sat_separated(dist2, radius2, atol):
+        return False, None, None
+
+    # the cross products of the edges, all values are scaled with
+    # the length of the cross product
+    i, j = _sat_i, _sat_j
+    i1, i2, j1, j2 = _sat_i1, _sat_i2, _sat_j1, _sat_j2
+    proj3 = t[i2] * R[i1, j] - t[i1] * R[i2, j]
+    radius3 = half1[i1] * absR[i2, j] + half1[i2] * absR[i1, j] + \
+        half2[j1] * absR[i, j2] + half2[j2] * absR[i, j1]
+    length3 = np.sqrt(np.clip(1. - R[i, j]**2, 0., None))
+
+    # parallel edges give no new axis
+    valid = length3 > sat_parallel
+    length3 = length3[valid]
+    proj3 = proj3[valid]
+    dist3 = np.abs(proj3) / length3
+    radius3 = radius3[valid] / length3
+    if _sat_separated(dist3, radius3, atol):
+        return False, None, None
+
+    if not penetration:
+        return True, None, None
+
+    # the axis with the smallest overlap
+    overlaps = np.concatenate((radius1 - dist1, radius2 - dist2,
+                               radius3 - dist3))
+    k = np.argmin(overlaps)
+    if k < 3:
+        axis = axes1[:, k] * (1. if t[k] >= 0. else -1.)
+    elif k < 6:
+        axis = axes2[:, k-3] * (1. if t2[k-3] >= 0. else -1.)
+    else:
+        n = np.nonzero(valid)[0][k-6]
+        axis = np.cross(axes1[:, i[n]], axes2[:, j[n]]) / length3[k-6]
+        axis *= 1. if proj3[k-6] >= 0. else -1.
+
+    return True, overlaps[k], axis
+
+
+def obb_separation(center1, axes1, half1, center2, axes2, half2):
+    """
+    obb_separation
+
+    calculates the largest gap between the projections of two oriented
+    boxes on the 15 axes of the separating axis test. A positive value
+    is a lower bound of the distance between the boxes, otherwise the
+    boxes are colliding.
+
+    :param center1:     the center of the first box
+    :param axes1:       3x3 matrix with the axes of the first box as columns
+    :param half1:       the half lengths of the first box along its axes
+    :param center2:     the center of the second box
+    :param axes2:       3x3 matrix with the axes of the second box as columns
+    :param half2:       the half lengths of the second box along its axes
+
+    :returns: the largest gap
+    """
+    R = np.dot(axes1.T, axes2)
+    absR = np.abs(R)
+    t = np.dot(axes1.T, center2 - center1)
+
+    gap1 = np.abs(t) - (half1 + np.dot(absR, half2))
+    gap2 = np.abs(np.dot(t, R)) - (np.dot(half1, absR) + half2)
+
+    i, j = _sat_i, _sat_j
+    i1, i2, j1, j2 = _sat_i1, _sat_i2, _sat_j1, _sat_j2
+    proj3 = t[i2] * R[i1, j] - t[i1] * R[i2, j]
+    radius3 = half1[i1] * absR[i2, j] + half1[i2] * absR[i1, j] + \
+        half2[j1] * absR[i, j2] + half2[j2] * absR[i, j1]
+    length3 = np.sqrt(np.clip(1. - R[i, j]**2, 0., None))
+    valid = length3 > sat_parallel
+    gap3 = (np.abs(proj3[valid]) - radius3[valid]) / length3[valid]
+
+    return max(gap1.max(), gap2.max(), gap3.max(initial=-np.inf))
+
+
 """
 --------------------------------------------------------------------------------
 Intersections
@@ -300,29 +459,33 @@ def intersection_of_planes(n1, d1, n2, d2):
     return p, n1xn2
 
 
-def intersection_line_plane(edge, norm_vector, distance, atol=cmp_atol):
+def intersection_line_plane(edge, norm_vector, distance, atol=cmp_atol,
+                            verbose=False):
     """
     intersection_line_plane
 
     calculates the intersection point between a ray and a plane
     """
+    verbose = debug_enabled(verbose)
     edge_direction = edge[0] - edge[1]
 
     plane_point = point_of_plane(norm_vector, distance)
 
-    debug(' plane_point=%s' % plane_point)
+    if verbose:
+        debug(' plane_point=%s' % plane_point)
 
     ndotu = norm_vector.dot(edge_direction)
 
     if abs(ndotu) < atol:
-        debug(' no intersection or line is within plane')
+        if verbose:
+            debug(' no intersection or line is within plane')
         return None
 
     w = edge[0] - plane_point
     si = -norm_vector.dot(w) / ndotu
     Psi = w + si * edge_direction + plane_point
 
-    print(Psi)
-    debug(' intersection point=%s' % Psi)
+    if verbose:
+        debug(' intersection point=%s' % Psi)
 
     return Psi
@@ -11,10 +11,19 @@ implementations.
 
 """
 
+from collections import namedtuple
+
 from pycollision.position import Position
-from pycollision.collision import Collision
-from pycollision.geometry import projection_vector, pyramid_volume
-from pycollision.debug import debug
+from pycollision.collision import Collision, register_collision, \
+                                  register_intersection, \
+                                  coll_sphere2sphere, coll_sphere2plane, \
+                                  coll_box2box, coll_box2plane, \
+                                  coll_plane2plane, \
+                                  isect_sphere2sphere, isect_sphere2plane, \
+                                  isect_box2box, isect_box2plane, \
+                                  isect_plane2plane
+from pycollision.geometry import pyramid_volume, box_edges
+from pycollision.debug import debug, debug_enabled
 
 
 from typevalidation.decorator import typevalidate
@@ -23,9 +32,20 @@ from typevalidation.types import PosInt, PosFloat, Vector
 import numpy as np
 import numpy.linalg as nl
 
+
+# constants
+cmp_atol = 1e-08
+
 # every object needs
 
 
+def _new_trusted(cls, verbose=False):
+    # creates an object without calling the validated __init__
+    obj = cls.__new__(cls)
+    BasicObject.__init__(obj, verbose=verbose)
+    return obj
+
+
 class BasicObject(Position, Collision):
     """
 
@@ -38,6 +58,12 @@ class BasicObject(Position, Collision):
     verbose : bool, optional
         make the object verbose, default is False
 
+    Attributes
+    ----------
+    _cache: dict
+        cached world space geometry, only valid for the transform
+        version stored in _cache_version
+
     """
     def __init__(self, verbose=False):
 
@@ -46,6 +72,32 @@ class BasicObject(Position, Collision):
 
         self._verbose = verbose
 
+        self._cache = {}
+        self._cache_version = -1
+
+    def _cached(self, key, func):
+        """
+        returns the cached value for key, the value is calculated
+        with func if the transformation was changed since the last
+        call. Numpy arrays are stored read-only.
+        """
+        if self._cache_version != self._version:
+            self._cache = {}
+            self._cache_version = self._version
+
+        try:
+            return self._cache[key]
+        except KeyError:
+            val = func()
+            if isinstance(val, np.ndarray):
+                val.setflags(write=False)
+            elif isinstance(val, (tuple, list)):
+                for v in val:
+                    if isinstance(v, np.ndarray):
+                        v.setflags(write=False)
+            self._cache[key] = val
+            return val
+
 
 class Sphere(BasicObject):
     """
@@ -85,6 +137,58 @@ class Sphere(BasicObject):
         self._x = x
         self._radius = radius
 
+    @classmethod
+    def from_arrays(cls, centers, radii, verbose=False):
+        """
+        creates many spheres at once, the arrays are checked only once
+        and the type validation of the constructor is skipped
+
+        Parameters
+        ----------
+        centers: np.array
+            (N,3) array of the sphere centers
+        radii: np.array
+            (N,) array of the radii or a single radius for all spheres
+        verbose: bool, optional
+            make the objects verbose, default=False
+
+        Returns
+        -------
+        list
+            the list of the N spheres
+
+        Raises
+        ------
+        ValueError
+            if the shapes of the arrays don't fit together or a
+            radius is not positive
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            spheres = Sphere.from_arrays(np.random.uniform(0., 10.,
+                                                           (1000, 3)), 0.5)
+        """
+        centers = np.array(centers, dtype=np.float64).reshape(-1, 3)
+        radii = np.asarray(radii, dtype=np.float64)
+        if radii.ndim == 0:
+            radii = np.full(len(centers), float(radii))
+        if radii.shape != (len(centers),):
+            raise ValueError('number of radii doesn\'t fit to the number' +
+                             ' of centers')
+        if np.any(~(radii > 0.)):
+            raise ValueError('radii must be positive')
+
+        spheres = []
+        for x, radius in zip(centers, radii.tolist()):
+            obj = _new_trusted(cls, verbose)
+            obj._x = x
+            obj._radius = radius
+            spheres.append(obj)
+        return spheres
+
     @property
     def position(self):
         """
@@ -97,7 +201,8 @@ class Sphere(BasicObject):
             the 3D vector of the sphere center
 
         """
-        return self.calculate_position(self._x)
+        return self._cached('position',
+                            lambda: self.calculate_positions(self._x))
 
     @property
     def radius(self):
@@ -111,10 +216,88 @@ class Sphere(BasicObject):
         """
         return self._radius
 
+    @property
+    def bounds(self):
+        """
+        returns the axis aligned bounding box of the sphere in world
+        coordinates
+
+        Returns
+        -------
+        tuple
+            (lower, upper) corners of the bounding box
+        """
+        return self._cached('bounds', self._get_bounds)
+
+    def _get_bounds(self):
+        p = self.position
+        return p - self._radius, p + self._radius
+
+    def contains(self, points, atol=cmp_atol):
+        """
+        tests many points at once if they are inside the sphere
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (N,3) array of points
+        atol: float, optional
+            points with a smaller distance to the surface are inside
+
+        Returns
+        -------
+        np.array
+            boolean mask of the shape (N,), True for the points inside
+            the sphere
+        """
+        diff = np.subtract(points, self.position)
+        limit = self._radius + atol
+        return np.einsum('...k,...k->...', diff, diff) <= limit * limit
+
     def __repr__(self):
         return 'Sphere({}, {})'.format(self._x.__repr__(), self._radius)
 
 
+# the corner indices of the six faces, the same order as the planes
+# of Box.get_box_planes_and_corners
+box_faces = ((0, 3, 4, 7), (0, 1, 5, 4), (1, 2, 6, 5),
+             (3, 2, 6, 7), (0, 1, 2, 3), (4, 5, 6, 7))
+
+# selection of the coordinates of x1 (False) or x2 (True) for the
+# corners a..h of Box.get_box_planes_and_corners
+box_corner_select = np.array([[0, 0, 0], [1, 0, 0], [1, 0, 1], [0, 0, 1],
+                              [0, 1, 0], [1, 1, 0], [1, 1, 1], [0, 1, 1]],
+                             dtype=bool)
+
+# the signs of the half diagonal for the corners a..h
+box_corner_signs = np.where(box_corner_select, 1., -1.)
+
+# the oriented bounding box of a box in world coordinates, the axes
+# are the columns of the 3x3 matrix
+OBB = namedtuple('OBB', ['center', 'axes', 'half_extents'])
+
+
+def box_corners(x1, x2):
+    """
+    calculates the corners of boxes without any transformation
+
+    Parameters
+    ----------
+    x1, x2: np.array
+        the opposite corners of a box as (3,) arrays or of N boxes
+        as (N,3) arrays
+
+    Returns
+    -------
+    np.array
+        (8,3) or (N,8,3) array of the corners in the order of
+        Box.get_box_planes_and_corners
+    """
+    x1 = np.asarray(x1, dtype=np.float64)
+    x2 = np.asarray(x2, dtype=np.float64)
+    return np.where(box_corner_select, x2[..., None, :], x1[..., None, :])
+
+
 class Box(BasicObject):
     """
     This is the implementation of a Box Object.
@@ -149,35 +332,255 @@ class Box(BasicObject):
     @typevalidate(isclass=True)
     def __init__(self, x1: Vector, x2: Vector, verbose: bool=False):
         BasicObject.__init__(self, verbose=verbose)
+        self._setup(x1, x2)
+
+    def _setup(self, x1, x2):
+        # sets the geometry from already checked corners
         self._x1 = x1
         self._x2 = x2
 
-        self._center = (x2 - x1) / 2.
-
-        self._six, self._corners = self.get_box_planes_and_corners(self._x1,
-                                                                   self._x2)
+        # the signed half diagonal keeps the order of the corners
+        self._half_diagonal = (x2 - x1) / 2.
+        self._half = np.abs(self._half_diagonal)
 
-        self._volume = self.get_volume(self._center)
+        # the volume of a box is known analytically
+        self._volume = float(8. * np.prod(self._half))
 
-        if self._verbose:
+        if debug_enabled(self._verbose):
             debug('reference volume:', self._volume)
 
+    @classmethod
+    def from_arrays(cls, x1, x2, verbose=False):
+        """
+        creates many boxes at once, the arrays are checked only once
+        and the type validation of the constructor is skipped
+
+        Parameters
+        ----------
+        x1: np.array
+            (N,3) array of the lower front left corners
+        x2: np.array
+            (N,3) array of the upper back right corners
+        verbose: bool, optional
+            make the objects verbose, default=False
+
+        Returns
+        -------
+        list
+            the list of the N boxes
+
+        Raises
+        ------
+        ValueError
+            if the shapes of the arrays don't fit together
+        """
+        x1 = np.array(x1, dtype=np.float64).reshape(-1, 3)
+        x2 = np.array(x2, dtype=np.float64).reshape(-1, 3)
+        if x1.shape != x2.shape:
+            raise ValueError('number of x1 corners doesn\'t fit to the' +
+                             ' number of x2 corners')
+
+        boxes = []
+        for a, b in zip(x1, x2):
+            obj = _new_trusted(cls, verbose)
+            obj._setup(a, b)
+            boxes.append(obj)
+        return boxes
+
+    @classmethod
+    def from_center_extents(cls, center, half_extents, verbose=False):
+        """
+        creates a box from its center and the half lengths of the
+        edges, the type validation of the constructor is skipped
+
+        Parameters
+        ----------
+        center: Vector
+            the center of the box
+        half_extents: Vector
+            the half lengths of the three box edges
+        verbose: bool, optional
+            make the object verbose, default=False
+
+        Returns
+        -------
+        Box
+            the new box
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            b = Box.from_center_extents([0., 0., 0.], [1., 2., 3.])
+        """
+        center = np.array(center, dtype=np.float64).reshape(3)
+        half_extents = np.abs(np.array(half_extents,
+                                       dtype=np.float64).reshape(3))
+        obj = _new_trusted(cls, verbose)
+        obj._setup(center - half_extents, center + half_extents)
+        return obj
+
+    @property
+    def _six(self):
+        c = box_corners(self._x1, self._x2)
+        return [[c[j] for j in face] for face in box_faces]
+
+    @property
+    def obb(self):
+        """
+        returns the oriented bounding box, which is calculated once
+        after every transformation. All other geometric properties of
+        the box are derived from it.
+
+        Returns
+        -------
+        OBB
+            named tuple (center, axes, half_extents) with the center in
+            world coordinates, the 3x3 matrix with the orthonormal axes
+            as columns and the half lengths along the axes
+        """
+        return self._cached('obb', self._get_obb)
+
+    def _get_obb(self):
+        return OBB(self.calculate_positions((self._x1 + self._x2) / 2.),
+                   np.array(self.rotation, dtype=np.float64),
+                   self._half.copy())
+
     @property
     def position(self):
-        return [self.calculate_position(self._x1),
-                self.calculate_position(self._x2)]
+        return self._cached('position', lambda: self.calculate_positions(
+            np.array([self._x1, self._x2], dtype=np.float64)))
+
+    @property
+    def center(self):
+        """
+        returns the center of the box, after applying all
+        positional transformations
+
+        Returns
+        -------
+        Vector
+            the 3D vector of the box center
+        """
+        return self.obb.center
+
+    @property
+    def axes(self):
+        """
+        returns the axes of the box, after applying all rotations
+
+        Returns
+        -------
+        np.array
+            3x3 matrix with the three box axes as columns
+        """
+        return self.obb.axes
+
+    @property
+    def half_extents(self):
+        """
+        returns the half lengths of the box along its axes
+
+        Returns
+        -------
+        Vector
+            the half lengths of the three box edges
+        """
+        return self.obb.half_extents
 
     @property
     def corners(self):
-        return [self.calculate_position(i) for i in self._corners]
+        """
+        returns the 8 corners of the box, after applying all
+        positional transformations
+
+        Returns
+        -------
+        np.array
+            (8,3) array of the corners
+        """
+        return self._cached('corners', self._get_corners)
+
+    def _get_corners(self):
+        center, axes, half = self.obb
+        return center + np.dot(box_corner_signs * self._half_diagonal, axes.T)
 
     @property
     def edges(self):
-        c = self.corners
-        edges = [(c[0], c[1]), (c[1], c[2]), (c[2], c[3]), (c[3], c[0]),
-                 (c[0], c[4]), (c[1], c[5]), (c[2], c[6]), (c[3], c[7]),
-                 (c[4], c[5]), (c[5], c[6]), (c[6], c[7]), (c[7], c[4])]
-        return edges
+        """
+        returns the 12 edges of the box as tuples of two corners
+
+        Returns
+        -------
+        list
+            list of the edges
+        """
+        return self._cached('edges', self._get_edges)
+
+    def _get_edges(self):
+        return [(a, b) for a, b in self.corners[box_edges]]
+
+    @property
+    def normals(self):
+        """
+        returns the outer normal vectors of the six faces in the order
+        of the faces returned by get_six_plane_corrected
+
+        Returns
+        -------
+        np.array
+            (6,3) array of the normal vectors
+        """
+        return self._cached('normals', self._get_normals)
+
+    def _get_normals(self):
+        s = np.sign(self._half_diagonal)
+        a = self.axes
+        return np.array([-s[0] * a[:, 0], -s[2] * a[:, 2],
+                         s[0] * a[:, 0], s[2] * a[:, 2],
+                         -s[1] * a[:, 1], s[1] * a[:, 1]])
+
+    @property
+    def bounds(self):
+        """
+        returns the axis aligned bounding box of the box in world
+        coordinates
+
+        Returns
+        -------
+        tuple
+            (lower, upper) corners of the bounding box
+        """
+        return self._cached('bounds', self._get_bounds)
+
+    def _get_bounds(self):
+        # projection of the box onto the coordinate axes
+        center, axes, half = self.obb
+        extent = np.dot(np.abs(axes), half)
+        return center - extent, center + extent
+
+    def contains(self, points, atol=cmp_atol):
+        """
+        tests many points at once if they are inside the box, the
+        points are projected onto the axes of the box
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (N,3) array of points
+        atol: float, optional
+            points with a smaller distance to the surface are inside
+
+        Returns
+        -------
+        np.array
+            boolean mask of the shape (N,), True for the points inside
+            the box
+        """
+        center, axes, half = self.obb
+        local = np.dot(np.subtract(points, center), axes)
+        return np.all(np.abs(local) <= half + atol, axis=-1)
 
     def get_box_planes_and_corners(self, x1, x2):
         a = np.array([x1[0], x1[1], x1[2]])
@@ -201,19 +604,17 @@ class Box(BasicObject):
         return planes, corners
 
     def get_six_plane_corrected(self):
-        nsix = []
-        for i in self._six:
-            ni = []
-            for j in i:
-                nj = self.calculate_position(j)
-                ni.append(nj)
-            nsix.append(ni)
+        return self._cached('six', self._get_six)
 
-        return nsix
+    def _get_six(self):
+        c = self.corners
+        return [[c[j] for j in face] for face in box_faces]
 
     def get_volume(self, center=None):
+        # the volume of the pyramids from center to all faces, which
+        # is the box volume only for centers inside the box
         if center is None:
-            center = self.calculate_position(self._center)
+            return self._volume
         six = self.get_six_plane_corrected()
 
         vol = 0.
@@ -234,21 +635,132 @@ class Plane(BasicObject):
         self._n = n
         self._d = d
 
+    @classmethod
+    def from_arrays(cls, n, d, verbose=False):
+        """
+        creates many planes at once, the arrays are checked only once
+        and the type validation of the constructor is skipped
+
+        Parameters
+        ----------
+        n: np.array
+            (N,3) array of the normal vectors
+        d: np.array
+            (N,) array of the distances
+        verbose: bool, optional
+            make the objects verbose, default=False
+
+        Returns
+        -------
+        list
+            the list of the N planes
+
+        Raises
+        ------
+        ValueError
+            if the shapes of the arrays don't fit together
+        """
+        n = np.array(n, dtype=np.float64).reshape(-1, 3)
+        d = np.asarray(d, dtype=np.float64)
+        if d.ndim == 0:
+            d = np.full(len(n), float(d))
+        if d.shape != (len(n),):
+            raise ValueError('number of distances doesn\'t fit to the' +
+                             ' number of normal vectors')
+
+        planes = []
+        for nv, dist in zip(n, d.tolist()):
+            obj = _new_trusted(cls, verbose)
+            obj._n = nv
+            obj._d = dist
+            planes.append(obj)
+        return planes
+
     @property
     def norm_vector(self):
-        # calculate_position is not the right procedure here
+        return self._cached('norm_vector', self._get_norm_vector)
+
+    def _get_norm_vector(self):
+        # calculate_positions is not the right procedure here
         # we need only the rotation applied to the norm_vector
-        return np.dot(self.rotation, self._n)
+        return self.calculate_directions(self._n)
 
     @property
     def distance(self):
-        # the distance is a little bit crucial ...
-        # first we need the total translation
+        """
+        returns the signed distance of the plane to the origin along
+        the normalized normal vector, see equation
+        """
+        return self.equation[1]
+
+    @property
+    def equation(self):
+        """
+        returns the normalized plane equation, the value is cached
+        until the plane is transformed
+
+        Returns
+        -------
+        tuple
+            (n, d) with the unit normal vector n and the signed
+            distance d, a point x is on the plane if n.x = d
+        """
+        return self._cached('equation', self._get_equation)
+
+    def _get_equation(self):
+        n = self.norm_vector
+        n = n / nl.norm(n)
+        # only the part of the total translation parallel to the
+        # norm vector moves the plane, the sign tells the direction
         trans = self.translation + self.post_translation
-        # now we need the current norm vector
-        nv = self.norm_vector
-        # calculate the part of the translation vector parallel
-        # to the norm vector
-        tnv = projection_vector(trans, nv)
 
-        return self._d + nl.norm(tnv)
+        return n, float(self._d + np.dot(n, trans))
+
+    def contains(self, points, atol=cmp_atol):
+        """
+        tests many points at once if they are inside the half-space
+        behind the plane, the normal vector points to the outside
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (N,3) array of points
+        atol: float, optional
+            points with a smaller distance to the plane are inside
+
+        Returns
+        -------
+        np.array
+            boolean mask of the shape (N,), True for the points on
+            the plane or behind it
+        """
+        n, d = self.equation
+        return np.dot(points, n) - d <= atol
+
+    @property
+    def bounds(self):
+        """
+        returns the axis aligned bounding box of the plane, which
+        is always infinite
+
+        Returns
+        -------
+        tuple
+            (lower, upper) corners of the bounding box
+        """
+        return self._cached('bounds', lambda: (np.full(3, -np.inf),
+                                               np.full(3, np.inf)))
+
+
+# registration of the collision functions
+register_collision(Sphere, Sphere)(coll_sphere2sphere)
+register_collision(Sphere, Plane)(coll_sphere2plane)
+register_collision(Box, Box)(coll_box2box)
+register_collision(Box, Plane)(coll_box2plane)
+register_collision(Plane, Plane)(coll_plane2plane)
+
+register_intersection(Sphere, Sphere)(isect_sphere2sphere)
+register_intersection(Sphere, Plane)(isect_sphere2plane)
+register_intersection(Box, Box)(isect_box2box)
+register_intersection(Box, Plane)(isect_box2plane)
+register_intersection(Plane, Plane)(isect_plane2plane)
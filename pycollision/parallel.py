@@ -0,0 +1,343 @@
+#
+# pycollision/parallel.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines a parallel narrow phase. The candidate pairs of a
+broad phase are split into chunks which were tested in a pool of
+processes. The data of the objects is converted into arrays which are
+placed into shared memory, so the objects themselves are never sent
+to the workers. The results are merged in the order of the pairs.
+
+"""
+
+import os
+import multiprocessing
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # python < 3.8, all tests run in the main process
+    shared_memory = None
+
+from pycollision.objects import Sphere, Box, Plane
+from pycollision.collision import intersects, _intersection_registry
+from pycollision.batch import obb_overlap_batch, sphere_overlap_batch, \
+                              sphere_plane_overlap_batch, \
+                              box_plane_overlap_batch, plane_overlap_batch, \
+                              _class_kind, _custom_pairs, _has_procedure
+
+import numpy as np
+
+
+# constants
+cmp_atol = 1e-08
+
+# number of pairs per task of the worker processes
+default_chunksize = 4096
+
+# codes of the object types
+kind_other = -1
+kind_sphere = 0
+kind_box = 1
+kind_plane = 2
+
+# the base classes of the type codes
+_kind_classes = ((kind_sphere, Sphere), (kind_box, Box), (kind_plane, Plane))
+
+# the type codes of the kinds of pycollision.batch._class_kind
+_kind_codes = {None: kind_other, 'sphere': kind_sphere, 'box': kind_box,
+               'plane': kind_plane}
+
+# number of values per object: sphere center and radius, box center,
+# axes, half lengths and corners, plane normal vector and distance
+object_values = 39
+
+
+def _custom(objs, kinds, pairs):
+    # pairs of two different packed subclasses with an own intersection
+    # function for the pair
+    sub = np.array([kind >= 0 and obj.__class__ is not
+                    _kind_classes[kind][1]
+                    for obj, kind in zip(objs, kinds)], dtype=bool)
+    custom = np.zeros(len(pairs), dtype=bool)
+    if len(sub) == 0:
+        return custom
+    sel = np.nonzero(sub[pairs[:, 0]] & sub[pairs[:, 1]])[0]
+    custom[sel] = _custom_pairs(objs, objs, pairs[sel],
+                                _intersection_registry)
+    return custom
+
+
+def pack_objects(objs):
+    """
+    converts a sequence of objects into the array representation
+    used by the workers
+
+    Parameters
+    ----------
+    objs:
+        sequence of Sphere, Box and Plane objects, other objects and
+        subclasses with own intersection functions (see
+        pycollision.collision.register_intersection) are marked with
+        kind_other
+
+    Returns
+    -------
+    tuple
+        (kinds, data) with the (N,) array of the type codes and the
+        (N,39) array of the object data
+    """
+    kinds = np.full(len(objs), kind_other, dtype=np.int8)
+    data = np.zeros((len(objs), object_values), dtype=np.float64)
+
+    classes = {}
+    for idx, obj in enumerate(objs):
+        cls = obj.__class__
+        if cls not in classes:
+            classes[cls] = _kind_codes[_class_kind(cls,
+                                                   _intersection_registry)]
+        kind = classes[cls]
+        kinds[idx] = kind
+
+        if kind == kind_sphere:
+            data[idx, :3] = obj.position
+            data[idx, 3] = obj.radius
+        elif kind == kind_box:
+            data[idx, :3] = obj.center
+            data[idx, 3:12] = obj.axes.reshape(9)
+            data[idx, 12:15] = obj.half_extents
+            data[idx, 15:39] = obj.corners.reshape(24)
+        elif kind == kind_plane:
+            data[idx, :3], data[idx, 3] = obj.equation
+
+    return kinds, data
+
+
+def _supported(k1, k2):
+    # pairs of types which can be tested with the arrays, spheres and
+    # boxes have no collision function
+    return (k1 >= 0) & (k2 >= 0) & ~((k1 == kind_box) & (k2 == kind_sphere)) \
+        & ~((k1 == kind_sphere) & (k2 == kind_box))
+
+
+def pair_intersections(kinds, data, pairs, atol=cmp_atol):
+    """
+    boolean collision test for a list of pairs with the arrays of
+    pack_objects. Pairs of not supported types are False.
+
+    Parameters
+    ----------
+    kinds: np.array
+        (N,) array of the type codes
+    data: np.array
+        (N,39) array of the object data
+    pairs: np.array
+        (P,2) array of the object indices
+    atol: float, optional
+        absolute tolerance for touching objects
+
+    Returns
+    -------
+    np.array
+        (P,) boolean array, True for colliding pairs
+    """
+    result = np.zeros(len(pairs), dtype=bool)
+
+    # order the pairs by the type codes
+    k1 = kinds[pairs[:, 0]]
+    k2 = kinds[pairs[:, 1]]
+    swap = k1 > k2
+    a = np.where(swap, pairs[:, 1], pairs[:, 0])
+    b = np.where(swap, pairs[:, 0], pairs[:, 1])
+    ka = np.minimum(k1, k2)
+    kb = np.maximum(k1, k2)
+
+    sel = (ka == kind_sphere) & (kb == kind_sphere)
+    if np.any(sel):
+        da = data[a[sel]]
+        db = data[b[sel]]
+        result[sel] = sphere_overlap_batch(da[:, :3], da[:, 3], db[:, :3],
+                                           db[:, 3], atol=atol)
+
+    sel = (ka == kind_box) & (kb == kind_box)
+    if np.any(sel):
+        da = data[a[sel]]
+        db = data[b[sel]]
+        result[sel] = obb_overlap_batch(da[:, :3],
+                                        da[:, 3:12].reshape(-1, 3, 3),
+                                        da[:, 12:15], db[:, :3],
+                                        db[:, 3:12].reshape(-1, 3, 3),
+                                        db[:, 12:15], atol=atol)
+
+    sel = (ka == kind_sphere) & (kb == kind_plane)
+    if np.any(sel):
+        da = data[a[sel]]
+        db = data[b[sel]]
+        result[sel] = sphere_plane_overlap_batch(da[:, :3], da[:, 3],
+                                                 db[:, :4], atol=atol)
+
+    sel = (ka == kind_box) & (kb == kind_plane)
+    if np.any(sel):
+        da = data[a[sel]]
+        db = data[b[sel]]
+        result[sel] = box_plane_overlap_batch(da[:, 15:39].reshape(-1, 8, 3),
+                                              db[:, :4], atol=atol)
+
+    sel = (ka == kind_plane) & (kb == kind_plane)
+    if np.any(sel):
+        result[sel] = plane_overlap_batch(data[a[sel], :4], data[b[sel], :4],
+                                          atol=atol)
+
+    return result
+
+
+def _worker(args):
+    # runs in the worker processes, returns the positions of the
+    # colliding pairs in the complete pair list
+    blocks, start, stop, atol = args
+    shms = [shared_memory.SharedMemory(name=name)
+            for name, shape, dtype in blocks]
+    try:
+        kinds, data, pairs = [np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                              for shm, (name, shape, dtype)
+                              in zip(shms, blocks)]
+        hits = pair_intersections(kinds, data, pairs[start:stop], atol=atol)
+        # the arrays must be released before the blocks can be closed
+        del kinds, data, pairs
+    finally:
+        for shm in shms:
+            shm.close()
+
+    return np.nonzero(hits)[0] + start
+
+
+class ParallelNarrowPhase(object):
+    """
+    This is the implementation of a parallel narrow phase with a pool
+    of worker processes.
+
+    Parameters
+    ----------
+    processes: int, optional
+        number of worker processes, default is the number of CPUs
+    chunksize: int, optional
+        number of pairs per task
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        with ParallelNarrowPhase(processes=32) as executor:
+            pairs = scene.intersecting_pairs(executor=executor)
+    """
+    def __init__(self, processes=None, chunksize=default_chunksize):
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self._processes = max(int(processes), 1)
+        self._chunksize = max(int(chunksize), 1)
+        self._pool = None
+
+    @property
+    def processes(self):
+        """
+        returns the number of worker processes
+        """
+        return self._processes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        stops the worker processes
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self._processes)
+        return self._pool
+
+    def _parallel(self, arrays, npairs, atol):
+        # copies the arrays into shared memory and runs the chunks
+        # in the pool
+        shms = []
+        try:
+            blocks = []
+            for a in arrays:
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(a.nbytes, 1))
+                shms.append(shm)
+                view = np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)
+                view[...] = a
+                del view
+                blocks.append((shm.name, a.shape, a.dtype.str))
+
+            tasks = [(blocks, start, min(start + self._chunksize, npairs),
+                      atol)
+                     for start in range(0, npairs, self._chunksize)]
+            # map keeps the order of the tasks
+            results = self._get_pool().map(_worker, tasks)
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+        hits = np.zeros(npairs, dtype=bool)
+        for positions in results:
+            hits[positions] = True
+        return hits
+
+    def intersecting_pairs(self, objs, pairs, atol=cmp_atol):
+        """
+        tests all pairs for collisions, pairs of objects which can't be
+        converted into arrays were tested in the main process and
+        pairs without a collision routine were ignored
+
+        Parameters
+        ----------
+        objs:
+            sequence of the objects
+        pairs:
+            sequence of index tuples (i, j)
+        atol: float, optional
+            absolute tolerance for touching objects
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) of all colliding pairs
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        kinds, data = pack_objects(objs)
+
+        if self._processes > 1 and shared_memory is not None and \
+                len(pairs) > self._chunksize:
+            hits = self._parallel((kinds, data, pairs), len(pairs), atol)
+        else:
+            hits = pair_intersections(kinds, data, pairs, atol=atol)
+
+        # all other pairs in the main process
+        other = ~_supported(kinds[pairs[:, 0]], kinds[pairs[:, 1]]) | \
+            _custom(objs, kinds, pairs)
+        for n in np.nonzero(other)[0]:
+            obj1 = objs[pairs[n, 0]]
+            obj2 = objs[pairs[n, 1]]
+            if _has_procedure(obj1, obj2):
+                hits[n] = intersects(obj1, obj2, atol=atol)
+
+        result = pairs[hits]
+        order = np.lexsort((result[:, 1], result[:, 0]))
+        return [(int(i), int(j)) for i, j in result[order]]
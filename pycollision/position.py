@@ -2,7 +2,7 @@
 # pycollision/position.py
 #
 # written by: Oliver Cordes 2019-06-29
-# changed by: Oliver Cordes 2019-07-22
+# changed by: Oliver Cordes 2026-10-18
 #
 
 """
@@ -13,6 +13,10 @@ This module is for all positional operations and attributes
 from typevalidation.decorator import typevalidate
 from typevalidation.types import Vector, Matrix
 
+from pycollision.rotation import quaternion_from_matrix, \
+                                 quaternion_to_matrix, quaternion_multiply, \
+                                 quaternion_rotate
+
 import numpy as np
 
 
@@ -21,6 +25,52 @@ zero_matrix = np.array([[1., 0., 0., 0.],
                         [0., 0., 1., 0.],
                         [0., 0., 0., 1.]], dtype=np.float64)
 
+# names of the transform backends
+backends = ('matrix', 'quaternion')
+
+# backend of new objects, see set_default_backend
+default_backend = 'matrix'
+
+# number of quaternion compositions after which the quaternion
+# is normalized again
+quaternion_renorm_interval = 16
+
+
+def set_default_backend(backend):
+    """
+    sets the transform backend for all new objects
+
+    Parameters
+    ----------
+    backend: str
+        'matrix' or 'quaternion'
+
+    Raises
+    ------
+    ValueError
+        if the backend is unknown
+    """
+    global default_backend
+    if backend not in backends:
+        raise ValueError('Unknown transform backend {}'.format(backend))
+    default_backend = backend
+
+
+class _LazyMatrix(object):
+    # non-data descriptor for Position._matrix, the instance attribute
+    # of the matrix backend or a materialized matrix of the quaternion
+    # backend hides it, so it is only called if the quaternion backend
+    # has changed since the last access
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        m = zero_matrix.copy()
+        m[:3, :3] = quaternion_to_matrix(obj._quaternion)
+        m[:3, 3] = obj._translation
+        m.setflags(write=False)
+        obj.__dict__['_matrix'] = m
+        return m
+
 
 class Position(object):
     """
@@ -33,15 +83,153 @@ class Position(object):
     _post_translation: np.array(3)
         internal variable which holds a translation vector which is
         used after the transformation matrix
+    _version: int
+        transform version counter, which is increased with every
+        change of the transformation
+    _quaternion: np.array(4)
+        the rotation as unit quaternion (w, x, y, z) if the quaternion
+        backend is used, otherwise None
+    _translation: np.array(3)
+        the translation of the quaternion backend
 
     Note
     ----
-    Don't use _matrix or _post_translation is not necessary.
+    Don't use _matrix or _post_translation is not necessary. Changing
+    them directly doesn't increase the version counter, so cached
+    values of the objects are not updated. With the quaternion
+    backend _matrix is created on demand and is read-only.
 
     """
-    def __init__(self):
+    _matrix = _LazyMatrix()
+    _quaternion = None
+
+    def __init__(self, backend=None):
         self._matrix = zero_matrix.copy()
         self._post_translation = np.array([0., 0., 0.], dtype=np.float64)
+        self._version = 0
+
+        if backend is None:
+            backend = default_backend
+        if backend != 'matrix':
+            self.set_backend(backend)
+            self._version = 0
+
+    @property
+    def version(self):
+        """
+        returns the transform version counter, the value changes with
+        every change of the rotation, translation or post_translation
+
+        Returns
+        -------
+        int
+            the version counter
+        """
+        return self._version
+
+    @property
+    def backend(self):
+        """
+        returns the name of the transform backend
+
+        Returns
+        -------
+        str
+            'matrix' or 'quaternion'
+        """
+        return 'matrix' if self._quaternion is None else 'quaternion'
+
+    def set_backend(self, backend):
+        """
+        changes the transform backend, the current transformation
+        is converted. The quaternion backend stores a unit quaternion
+        and a translation, so incremental rotations are cheap and
+        don't drift from orthonormal matrices.
+
+        Parameters
+        ----------
+        backend: str
+            'matrix' or 'quaternion'
+
+        Raises
+        ------
+        ValueError
+            if the backend is unknown
+        """
+        if backend not in backends:
+            raise ValueError('Unknown transform backend {}'.format(backend))
+        if backend == self.backend:
+            return
+
+        m = self._matrix
+        if backend == 'quaternion':
+            self._quaternion = quaternion_from_matrix(m[:3, :3])
+            self._translation = m[:3, 3].copy()
+            self._compositions = 0
+            self._changed()
+        else:
+            self._quaternion = None
+            self._matrix = m.copy()
+
+    def _changed(self):
+        # removes the materialized matrix of the quaternion backend
+        if self._quaternion is not None:
+            self.__dict__.pop('_matrix', None)
+        self._version += 1
+
+    def _rotate(self, val, q=None):
+        # applies a rotation matrix val or a unit quaternion q
+        if self._quaternion is None:
+            if val is None:
+                val = quaternion_to_matrix(q)
+            zval = zero_matrix.copy()
+            zval[:3, :3] = val
+            self._matrix = np.dot(zval, self._matrix)
+            return
+
+        if q is None:
+            q = quaternion_from_matrix(val)
+        self._quaternion = quaternion_multiply(q, self._quaternion)
+        self._translation = quaternion_rotate(q, self._translation)
+
+        self._compositions += 1
+        if self._compositions >= quaternion_renorm_interval:
+            self._quaternion /= np.sqrt(np.dot(self._quaternion,
+                                               self._quaternion))
+            self._compositions = 0
+
+    def _translate(self, val):
+        if self._quaternion is None:
+            self._matrix[:3, 3] += val
+        else:
+            self._translation = self._translation + val
+
+    @property
+    def quaternion(self):
+        """
+        returns the rotation as unit quaternion
+
+        Returns
+        -------
+        np.array
+            the quaternion (w, x, y, z)
+        """
+        if self._quaternion is None:
+            return quaternion_from_matrix(self.rotation)
+        return self._quaternion.copy()
+
+    def rotate_quaternion(self, q):
+        """
+        applies a rotation given as unit quaternion in the same way
+        as the rotation setter, there is no type validation
+
+        Parameters
+        ----------
+        q: np.array
+            the unit quaternion (w, x, y, z)
+        """
+        self._rotate(None, np.asarray(q, dtype=np.float64))
+        self._changed()
 
     @property
     def rotation(self):
@@ -50,19 +238,20 @@ class Position(object):
     @rotation.setter
     @typevalidate(isclass=True)
     def rotation(self, val: Matrix):
-        zval = zero_matrix.copy()
-        zval[:3, :3] = val
-
-        self._matrix = np.dot(zval, self._matrix)
+        self._rotate(val)
+        self._changed()
 
     @property
     def translation(self):
+        if self._quaternion is not None:
+            return self._translation
         return self._matrix[:3, 3]
 
     @translation.setter
     @typevalidate(isclass=True)
     def translation(self, val: Vector):
-        self._matrix[:3, 3] += val
+        self._translate(val)
+        self._changed()
 
         # alternatively
         # zval = zero_matrix
@@ -77,10 +266,103 @@ class Position(object):
     @typevalidate(isclass=True)
     def post_translation(self, val: Vector):
         self._post_translation += val
+        self._changed()
+
+    def transform(self, rotation=None, translation=None,
+                  post_translation=None):
+        """
+        applies a rotation, a translation and a post translation at
+        once in the same way as the setters. There is no type
+        validation, the values must be float arrays of the right
+        shape. The version counter is increased only once.
+
+        Parameters
+        ----------
+        rotation: np.array, optional
+            3x3 rotation matrix
+        translation: np.array, optional
+            translation vector
+        post_translation: np.array, optional
+            post translation vector
+        """
+        if rotation is not None:
+            self._rotate(rotation)
+        if translation is not None:
+            self._translate(translation)
+        if post_translation is not None:
+            self._post_translation += post_translation
+        self._changed()
 
     @typevalidate(isclass=True)
     def calculate_position(self, val: Vector):
-        xval = np.array([0., 0., 0., 1.], dtype=np.float64)
-        xval[:3] = val
+        return self.calculate_positions(val)
+
+    def calculate_positions(self, points, out=None):
+        """
+        applies the complete transformation to many points at once,
+        there is no type validation
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (N,3) array of points
+        out: np.array, optional
+            output array of the same shape as points
+
+        Returns
+        -------
+        np.array
+            the transformed points
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            world = obj.calculate_positions(local_points)
+        """
+        m = self._matrix
+        out = np.matmul(points, m[:3, :3].T, out=out)
+        out += m[:3, 3] + self._post_translation
+        return out
+
+    def calculate_local_positions(self, points, out=None):
+        """
+        inverse of calculate_positions, transforms points from world
+        coordinates into the local coordinates of the object. The
+        rotations must be orthonormal.
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (N,3) array of points
+        out: np.array, optional
+            output array of the same shape as points
+
+        Returns
+        -------
+        np.array
+            the points in local coordinates
+        """
+        m = self._matrix
+        diff = np.subtract(points, m[:3, 3] + self._post_translation)
+        return np.matmul(diff, m[:3, :3], out=out)
+
+    def calculate_directions(self, vectors, out=None):
+        """
+        applies only the rotation to many vectors at once, e.g. for
+        normal vectors or edge directions
+
+        Parameters
+        ----------
+        vectors: np.array
+            a 3d vector or an (N,3) array of vectors
+        out: np.array, optional
+            output array of the same shape as vectors
 
-        return np.dot(self._matrix, xval)[:3] + self._post_translation
+        Returns
+        -------
+        np.array
+            the rotated vectors
+        """
+        return np.matmul(vectors, self._matrix[:3, :3].T, out=out)
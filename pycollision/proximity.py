@@ -0,0 +1,262 @@
+#
+# pycollision/proximity.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines proximity queries for many spheres. The centers
+are stored in a KD-tree, the queries use the center distances of the
+tree and correct them with the radii. To limit the search radius
+the spheres are split into groups of similar radii, every group has
+its own KD-tree. The distances have the same
+meaning as in the CollisionResult of coll_sphere2sphere: 'distance'
+is the distance of the centers and 'outerdistance' the distance of
+the surfaces, which is negative for overlapping spheres.
+
+"""
+
+from pycollision.batch import sphere_arrays
+
+from scipy.spatial import cKDTree
+
+import itertools
+
+import numpy as np
+import numpy.linalg as nl
+
+
+# constants
+cmp_atol = 1e-08
+
+
+def _radius_buckets(radii):
+    # splits the radii into groups within a factor of 2, returns the
+    # list of the index arrays and the largest radius of every group
+    mantissa, exponent = np.frexp(radii)
+    exponent = np.where(radii > 0., exponent, np.iinfo(exponent.dtype).min)
+    buckets = []
+    for e in np.unique(exponent):
+        idx = np.nonzero(exponent == e)[0]
+        buckets.append((idx, float(radii[idx].max())))
+    return buckets
+
+
+class ProximityIndex(object):
+    """
+    This is the implementation of a KD-tree index over a set of
+    spheres. The index is static, it must be created again if the
+    spheres were moved.
+
+    Parameters
+    ----------
+    spheres:
+        either a sequence of Sphere objects or a tuple (centers, radii),
+        see pycollision.batch.sphere_arrays
+    leafsize: int, optional
+        number of points in the leaves of the KD-tree
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        index = ProximityIndex(spheres)
+        idx, dist, outer = index.nearest(points, k=3)
+        alerts = index.within(points, max_distance=0.5)
+    """
+    def __init__(self, spheres, leafsize=16):
+        self._centers, self._radii = sphere_arrays(spheres)
+        self._radii = np.array(self._radii)
+        self._tree = cKDTree(self._centers, leafsize=leafsize)
+        if len(self._radii) > 0:
+            self._max_radius = float(self._radii.max())
+        else:
+            self._max_radius = 0.
+
+        # the trees of the groups with similar radii
+        self._buckets = [(idx, cKDTree(self._centers[idx], leafsize=leafsize),
+                          max_radius)
+                         for idx, max_radius in _radius_buckets(self._radii)]
+
+    def __len__(self):
+        return len(self._radii)
+
+    @property
+    def centers(self):
+        """
+        returns the (N,3) array of the sphere centers
+        """
+        return self._centers
+
+    @property
+    def radii(self):
+        """
+        returns the (N,) array of the radii
+        """
+        return self._radii
+
+    def _queries(self, points, radii):
+        # the query points and radii as arrays, points have radius 0
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if radii is None:
+            radii = np.zeros(len(points))
+        else:
+            radii = np.broadcast_to(np.asarray(radii, dtype=np.float64),
+                                    (len(points),))
+        return points, radii
+
+    def _pairs(self, points, radii, max_distance):
+        # all pairs (q, i) of query spheres and spheres of the index
+        # with an outer distance up to max_distance, every group of
+        # query radii is searched in every group of the index with one
+        # call of the KD-tree
+        queries = []
+        candidates = []
+        for qidx, qmax in _radius_buckets(radii):
+            for idx, tree, max_radius in self._buckets:
+                found = tree.query_ball_point(
+                    points[qidx], max_distance + qmax + max_radius + cmp_atol)
+                counts = np.array([len(f) for f in found], dtype=np.intp)
+                queries.append(np.repeat(qidx, counts))
+                candidates.append(idx[np.fromiter(
+                    itertools.chain.from_iterable(found), dtype=np.intp,
+                    count=counts.sum())])
+
+        q = np.concatenate(queries) if queries else np.zeros(0, np.intp)
+        cand = np.concatenate(candidates) if candidates else \
+            np.zeros(0, np.intp)
+        dist = nl.norm(self._centers[cand] - points[q], axis=1)
+        outer = dist - self._radii[cand] - radii[q]
+        keep = outer <= max_distance
+        return q[keep], cand[keep], dist[keep], outer[keep]
+
+    def _candidates(self, point, radius):
+        # indices and outer distances of all spheres whose surface is
+        # closer than radius to the point
+        q, cand, dist, outer = self._pairs(point[None], np.zeros(1), radius)
+        return cand, dist, outer
+
+    def nearest(self, points, k=1, radii=None):
+        """
+        finds the k spheres with the smallest outer distance to every
+        query point
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (Q,3) array of query points
+        k: int, optional
+            the number of spheres per query point, at most all spheres
+            of the index are returned
+        radii: np.array, optional
+            (Q,) radii of query spheres, which are subtracted from the
+            outer distances
+
+        Returns
+        -------
+        tuple
+            (indices, distances, outerdistances) as (Q,k) arrays sorted
+            by the outer distance, (Q,) arrays for k=1
+
+        Raises
+        ------
+        ValueError
+            if the index is empty or k is smaller than 1
+        """
+        if len(self) == 0 or k < 1:
+            raise ValueError('nearest needs a non empty index and k >= 1')
+        points, radii = self._queries(points, radii)
+        n = min(k, len(self))
+
+        dist, idx = self._tree.query(points, k=n)
+        dist = dist.reshape(len(points), n)
+        idx = idx.reshape(len(points), n)
+        outer = dist - self._radii[idx]
+
+        rows = np.arange(len(points))[:, None]
+        order = np.argsort(outer, axis=1, kind='mergesort')
+        idx = idx[rows, order]
+        dist = dist[rows, order]
+        outer = outer[rows, order]
+
+        # all other spheres have an outer distance larger than the
+        # k-th center distance minus the largest radius, only query
+        # points where a larger sphere can be closer are refined
+        if n < len(self):
+            bound = outer[:, -1]
+            refine = dist.max(axis=1) - self._max_radius < bound
+            for q in np.nonzero(refine)[0]:
+                cand, d, o = self._candidates(points[q], bound[q])
+                best = np.argsort(o, kind='mergesort')[:n]
+                idx[q] = cand[best]
+                dist[q] = d[best]
+                outer[q] = o[best]
+
+        outer -= radii[:, None]
+
+        if k == 1:
+            return idx[:, 0], dist[:, 0], outer[:, 0]
+        return idx, dist, outer
+
+    def within(self, points, max_distance=0., radii=None):
+        """
+        finds all spheres with an outer distance smaller than
+        max_distance to the query points
+
+        Parameters
+        ----------
+        points: np.array
+            a 3d vector or an (Q,3) array of query points
+        max_distance: float, optional
+            the maximum outer distance, with 0 and radii the query
+            returns the colliding spheres
+        radii: np.array, optional
+            (Q,) radii of query spheres
+
+        Returns
+        -------
+        list
+            list of Q sorted index arrays
+        """
+        points, radii = self._queries(points, radii)
+
+        if len(points) == 0:
+            return []
+
+        q, cand, dist, outer = self._pairs(points, radii, max_distance)
+        order = np.lexsort((cand, q))
+        counts = np.bincount(q, minlength=len(points))
+        return np.split(cand[order], np.cumsum(counts)[:-1])
+
+    def separation(self, spheres):
+        """
+        calculates the minimum outer distance between the spheres of
+        the index and a second group of spheres
+
+        Parameters
+        ----------
+        spheres:
+            the second group, see pycollision.batch.sphere_arrays
+
+        Returns
+        -------
+        tuple
+            (i, j, outerdistance) with the index i in this index and
+            the index j in the second group of the closest pair
+
+        Raises
+        ------
+        ValueError
+            if one of the groups is empty
+        """
+        centers, radii = sphere_arrays(spheres)
+        if len(centers) == 0:
+            raise ValueError('separation needs a non empty group')
+
+        idx, dist, outer = self.nearest(centers, k=1, radii=radii)
+        j = int(np.argmin(outer))
+
+        return int(idx[j]), j, float(outer[j])
@@ -0,0 +1,356 @@
+#
+# pycollision/raycast.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines ray queries against spheres, boxes and planes.
+Many rays are tested at once: spheres with the solution of the
+quadratic equation, boxes with the slab test in the coordinates of
+the box and planes with dot products. If an AABBTree is available
+only the objects whose bounding boxes are hit by a ray were tested.
+
+"""
+
+from pycollision.batch import _group_objects
+
+import numpy as np
+import numpy.linalg as nl
+
+
+# constants
+cmp_atol = 1e-08
+
+
+def _rays(origins, directions):
+    # checks the ray arrays and normalizes the directions
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    if directions.shape != origins.shape:
+        raise ValueError('number of directions doesn\'t fit to the' +
+                         ' number of origins')
+    length = nl.norm(directions, axis=1)
+    if np.any(length == 0.):
+        raise ValueError('zero direction given for ray!')
+    return origins, directions / length[:, None]
+
+
+def _dot(a, b):
+    return np.einsum('...k,...k->...', a, b)
+
+
+"""
+The hit functions work on broadcastable arrays of rays and objects,
+the public functions test all rays against all objects and the tree
+search tests only the pairs of rays and candidates.
+"""
+
+
+def _hit_spheres(origins, directions, centers, radii):
+    rel = origins - centers
+    b = _dot(rel, directions)
+    c = _dot(rel, rel) - radii**2
+    disc = b * b - c
+
+    with np.errstate(invalid='ignore'):
+        t = -b - np.sqrt(disc)
+    inside = c <= 0.
+    t = np.where(inside, 0., t)
+
+    # outside the sphere both solutions have the same sign
+    return np.where((disc >= 0.) & (inside | (t >= 0.)), t, np.inf)
+
+
+def _hit_boxes(origins, directions, centers, axes, half):
+    rel = origins - centers
+    local_origins = np.einsum('...j,...jk->...k', rel, axes)
+    local_directions = np.einsum('...j,...jk->...k', directions, axes)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1. / local_directions
+        t1 = (-half - local_origins) * inv
+        t2 = (half - local_origins) * inv
+    # nan appears for rays parallel to a slab starting on the border,
+    # fmax and fmin ignore these slabs
+    tnear = np.fmax.reduce(np.minimum(t1, t2), axis=-1)
+    tfar = np.fmin.reduce(np.maximum(t1, t2), axis=-1)
+
+    t = np.maximum(tnear, 0.)
+    return np.where((t <= tfar), t, np.inf)
+
+
+def _hit_planes(origins, directions, normals, d, atol):
+    s = _dot(origins, normals) - d
+    rate = _dot(directions, normals)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = -s / rate
+    t = np.where(np.abs(s) <= atol, 0., t)
+
+    # parallel rays give an infinite or nan distance
+    return np.where(np.isfinite(t) & (t >= 0.), t, np.inf)
+
+
+def ray_spheres(origins, directions, centers, radii):
+    """
+    calculates the distances of all rays to all spheres
+
+    Parameters
+    ----------
+    origins: np.array
+        (R,3) array of the ray origins
+    directions: np.array
+        (R,3) array of the normalized ray directions
+    centers: np.array
+        (M,3) array of the sphere centers
+    radii: np.array
+        (M,) array of the radii
+
+    Returns
+    -------
+    np.array
+        (R,M) array of the distances to the first hit, 0 for rays
+        starting inside a sphere and inf for misses
+    """
+    return _hit_spheres(origins[:, None], directions[:, None],
+                        centers[None], radii[None])
+
+
+def ray_boxes(origins, directions, centers, axes, half):
+    """
+    calculates the distances of all rays to all oriented boxes with
+    the slab test in the coordinates of the boxes
+
+    Parameters
+    ----------
+    origins: np.array
+        (R,3) array of the ray origins
+    directions: np.array
+        (R,3) array of the normalized ray directions
+    centers: np.array
+        (M,3) array of the box centers
+    axes: np.array
+        (M,3,3) array of the box axes as columns
+    half: np.array
+        (M,3) array of the half lengths
+
+    Returns
+    -------
+    np.array
+        (R,M) array of the distances to the first hit, 0 for rays
+        starting inside a box and inf for misses
+    """
+    return _hit_boxes(origins[:, None], directions[:, None], centers[None],
+                      axes[None], half[None])
+
+
+def ray_planes(origins, directions, equations, atol=cmp_atol):
+    """
+    calculates the distances of all rays to all planes
+
+    Parameters
+    ----------
+    origins: np.array
+        (R,3) array of the ray origins
+    directions: np.array
+        (R,3) array of the normalized ray directions
+    equations: np.array
+        (P,4) array of the plane equations, see
+        pycollision.batch.plane_equations
+    atol: float, optional
+        rays starting closer to a plane hit it at the distance 0
+
+    Returns
+    -------
+    np.array
+        (R,P) array of the distances, inf for misses
+    """
+    return _hit_planes(origins[:, None], directions[:, None],
+                       equations[None, :, :3], equations[None, :, 3], atol)
+
+
+def _kernel(kind, origins, directions, data, atol):
+    # distances of all rays to a group of objects, None for objects
+    # without a ray routine
+    if kind == 'sphere':
+        return ray_spheres(origins, directions, data[0], data[1])
+    if kind == 'box':
+        return ray_boxes(origins, directions, data[0], data[1], data[2])
+    if kind == 'plane':
+        return ray_planes(origins, directions, data, atol=atol)
+    return None
+
+
+def _normals(kind, points, directions, data):
+    # outer normal vectors at the hit points, one object per point
+    if kind == 'sphere':
+        n = points - data[0]
+    elif kind == 'box':
+        centers, axes, half = data[0], data[1], data[2]
+        local = np.einsum('kj,kji->ki', points - centers, axes)
+        # the face is the axis with the largest relative coordinate
+        face = np.argmax(np.abs(local) / half, axis=1)
+        rows = np.arange(len(points))
+        n = axes[rows, :, face] * np.sign(local[rows, face])[:, None]
+    else:
+        # the normal vector of a plane points to the ray origin
+        n = data[:, :3] * -np.sign(np.einsum('kj,kj->k', data[:, :3],
+                                             directions))[:, None]
+
+    length = nl.norm(n, axis=1)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(length > 0., n / length, -directions)
+
+
+def _pair_kernel(kind, origins, directions, data, k, atol):
+    # distances of the rays to the objects k of a group, one object
+    # per ray, None for objects without a ray routine
+    if kind == 'sphere':
+        return _hit_spheres(origins, directions, data[0][k], data[1][k])
+    if kind == 'box':
+        return _hit_boxes(origins, directions, data[0][k], data[1][k],
+                          data[2][k])
+    if kind == 'plane':
+        return _hit_planes(origins, directions, data[k, :3], data[k, 3],
+                           atol)
+    return None
+
+
+def _raycast_tree(origins, directions, objects, tree, max_distance, atol):
+    # tests only the pairs of rays and objects with a bounding box
+    # hit by the ray, the pairs are grouped by the type of the objects
+    distances = np.full(len(origins), np.inf)
+    index = np.full(len(origins), -1, dtype=np.intp)
+
+    rays = []
+    candidates = []
+    for r in range(len(origins)):
+        for entry, idx in tree.raycast(origins[r], directions[r],
+                                       max_distance=max_distance):
+            rays.append(r)
+            candidates.append(idx)
+    if len(rays) == 0:
+        return distances, index
+    rays = np.array(rays, dtype=np.intp)
+    candidates = np.array(candidates, dtype=np.intp)
+
+    # the position of every candidate in the sorted list of the
+    # candidate objects
+    keys, pos = np.unique(candidates, return_inverse=True)
+    t = np.full(len(rays), np.inf)
+    for kind, (members, data) in _group_objects(
+            [objects[i] for i in keys]).items():
+        group = np.full(len(keys), -1, dtype=np.intp)
+        group[members] = np.arange(len(members))
+        sel = np.nonzero(group[pos] >= 0)[0]
+        hits = _pair_kernel(kind, origins[rays[sel]], directions[rays[sel]],
+                            data, group[pos[sel]], atol)
+        if hits is not None:
+            t[sel] = hits
+
+    # the closest hit of every ray
+    order = np.lexsort((t, rays))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = rays[order[1:]] != rays[order[:-1]]
+    best = order[first & np.isfinite(t[order])]
+    distances[rays[best]] = t[best]
+    index[rays[best]] = candidates[best]
+
+    return distances, index
+
+
+def _raycast_all(origins, directions, objects, atol):
+    # tests all rays against all objects, grouped by type
+    distances = np.full(len(origins), np.inf)
+    index = np.full(len(origins), -1, dtype=np.intp)
+    rows = np.arange(len(origins))
+
+    for kind, (idx, data) in _group_objects(objects).items():
+        t = _kernel(kind, origins, directions, data, atol)
+        if t is None:
+            continue
+        best = np.argmin(t, axis=1)
+        t = t[rows, best]
+        better = t < distances
+        distances[better] = t[better]
+        index[better] = idx[best[better]]
+
+    return distances, index
+
+
+def raycast(origins, directions, objects, max_distance=np.inf, tree=None,
+            atol=cmp_atol):
+    """
+    calculates the first hit of many rays with a set of objects,
+    objects without a ray routine are ignored
+
+    Parameters
+    ----------
+    origins: np.array
+        (R,3) array of the ray origins
+    directions: np.array
+        (R,3) array of the ray directions, they are normalized, so
+        all distances are in world units
+    objects:
+        sequence of Sphere, Box and Plane objects, with a tree also a
+        dictionary with the indices of the tree as keys
+    max_distance: float, optional
+        hits farther away are ignored
+    tree: AABBTree, optional
+        tree with the bounding boxes of the objects, the indices in the
+        tree are the indices of the objects, the tree must be up to date
+    atol: float, optional
+        rays starting closer to a plane hit it at the distance 0
+
+    Returns
+    -------
+    tuple
+        (distances, indices, normals) with the (R,) distances to the
+        first hit (inf for misses), the (R,) indices of the hit objects
+        (-1 for misses) and the (R,3) outer normal vectors at the hit
+        points (0 for misses). Rays starting inside an object hit it
+        at the distance 0, the normal vector is the reversed ray
+        direction.
+
+    Raises
+    ------
+    ValueError
+        if the arrays don't fit together or a direction is zero
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        objs = [Sphere([5., 0., 0.], 1.), create_yz_plane(10.)]
+        dist, idx, normals = raycast([[0., 0., 0.]], [[1., 0., 0.]], objs)
+        # dist = [4.], idx = [0], normals = [[-1., 0., 0.]]
+    """
+    origins, directions = _rays(origins, directions)
+
+    if tree is not None:
+        distances, index = _raycast_tree(origins, directions, objects, tree,
+                                         max_distance, atol)
+    else:
+        distances, index = _raycast_all(origins, directions, objects, atol)
+
+    miss = (index < 0) | (distances > max_distance)
+    distances[miss] = np.inf
+    index[miss] = -1
+
+    normals = np.zeros(origins.shape)
+    hits = np.nonzero(~miss)[0]
+    if len(hits) > 0:
+        points = origins[hits] + directions[hits] * distances[hits, None]
+        hit_objects = [objects[i] for i in index[hits]]
+        for kind, (pos, data) in _group_objects(hit_objects).items():
+            rays = hits[pos]
+            normals[rays] = _normals(kind, points[pos], directions[rays],
+                                     data)
+        inside = hits[distances[hits] == 0.]
+        normals[inside] = -directions[inside]
+
+    return distances, index, normals
@@ -4,13 +4,19 @@ pycollision/rotation.py
 
 
 written by: Oliver Cordes 2019-06-30
-changed by: Oliver Cordes 2019-06-30
+changed by: Oliver Cordes 2026-10-18
 
 
 """
 
 import numpy as np
 
+
+# the coordinate axes
+axis_X = np.array([1., 0., 0.])
+axis_Y = np.array([0., 1., 0.])
+axis_Z = np.array([0., 0., 1.])
+
 """
 create _rotation_matrix
 
@@ -53,7 +59,7 @@ rotates around the x axis with the given angle
 
 
 def create_rotation_X(angle):
-    return create_rotation_matrix([1., 0., 0.], angle)
+    return create_rotation_matrix(axis_X, angle)
 
 
 """
@@ -64,7 +70,7 @@ rotates around the y axis with the given angle
 
 
 def create_rotation_Y(angle):
-    return create_rotation_matrix([0., 1., 0.], angle)
+    return create_rotation_matrix(axis_Y, angle)
 
 
 """
@@ -75,4 +81,379 @@ rotates around the z axis with the given angle
 
 
 def create_rotation_Z(angle):
-    return create_rotation_matrix([0., 0., 1.], angle)
+    return create_rotation_matrix(axis_Z, angle)
+
+
+"""
+quaternions
+
+unit quaternions are stored as arrays (w, x, y, z), the product
+q1 * q2 describes the rotation q2 followed by q1 like the product
+of rotation matrices
+"""
+
+
+"""
+create_rotation_quaternion
+
+creates a unit quaternion for a rotation around a given vector
+and angle
+
+:params vector:  the vector of the rotation axis
+:params angle:   rotate around this angle
+"""
+
+
+def create_rotation_quaternion(vector, angle):
+    angle = angle * np.pi / 180.
+    vector = np.asarray(vector, dtype=np.float64)
+    vector = vector / np.linalg.norm(vector)
+
+    q = np.zeros(4)
+    q[0] = np.cos(angle / 2.)
+    q[1:] = np.sin(angle / 2.) * vector
+
+    return q
+
+
+"""
+quaternion_multiply
+
+calculates the product q1 * q2 of two quaternions
+
+:params q1:  the first quaternion
+:params q2:  the second quaternion
+"""
+
+
+def quaternion_multiply(q1, q2):
+    w1, x1, y1, z1 = q1
+    w2, x2, y2, z2 = q2
+
+    return np.array([w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                     w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                     w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                     w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2])
+
+
+"""
+quaternion_rotate
+
+rotates a vector or an (N,3) array of vectors with a unit quaternion
+
+:params q:       the unit quaternion
+:params vector:  the vector(s)
+"""
+
+
+def quaternion_rotate(q, vector):
+    u = q[1:]
+    t = 2. * np.cross(u, vector)
+
+    return vector + q[0] * t + np.cross(u, t)
+
+
+"""
+quaternion_to_matrix
+
+converts a unit quaternion into a 3x3 rotation matrix
+
+:params q:  the unit quaternion
+"""
+
+
+def quaternion_to_matrix(q):
+    w, x, y, z = q
+
+    return np.array([[1. - 2. * (y * y + z * z), 2. * (x * y - w * z),
+                      2. * (x * z + w * y)],
+                     [2. * (x * y + w * z), 1. - 2. * (x * x + z * z),
+                      2. * (y * z - w * x)],
+                     [2. * (x * z - w * y), 2. * (y * z + w * x),
+                      1. - 2. * (x * x + y * y)]])
+
+
+"""
+quaternion_from_matrix
+
+converts a 3x3 rotation matrix into a unit quaternion with w >= 0,
+small deviations of the matrix from an orthonormal matrix are removed
+
+:params matrix:  the rotation matrix
+"""
+
+
+def quaternion_from_matrix(matrix):
+    m = np.asarray(matrix, dtype=np.float64)
+    trace = m[0, 0] + m[1, 1] + m[2, 2]
+
+    # choose the largest component to avoid the division by
+    # small numbers
+    if trace > 0.:
+        s = 2. * np.sqrt(trace + 1.)
+        q = np.array([0.25 * s, (m[2, 1] - m[1, 2]) / s,
+                      (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s])
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = 2. * np.sqrt(1. + m[0, 0] - m[1, 1] - m[2, 2])
+        q = np.array([(m[2, 1] - m[1, 2]) / s, 0.25 * s,
+                      (m[0, 1] + m[1, 0]) / s, (m[0, 2] + m[2, 0]) / s])
+    elif m[1, 1] > m[2, 2]:
+        s = 2. * np.sqrt(1. + m[1, 1] - m[0, 0] - m[2, 2])
+        q = np.array([(m[0, 2] - m[2, 0]) / s, (m[0, 1] + m[1, 0]) / s,
+                      0.25 * s, (m[1, 2] + m[2, 1]) / s])
+    else:
+        s = 2. * np.sqrt(1. + m[2, 2] - m[0, 0] - m[1, 1])
+        q = np.array([(m[1, 0] - m[0, 1]) / s, (m[0, 2] + m[2, 0]) / s,
+                      (m[1, 2] + m[2, 1]) / s, 0.25 * s])
+
+    if q[0] < 0.:
+        q = -q
+
+    return q / np.linalg.norm(q)
+
+
+"""
+batch versions
+
+all functions work on stacks of N rotations, the results can be written
+into preallocated arrays given with the out parameter
+"""
+
+
+def _output(out, shape):
+    # returns a new array or checks the given output array
+    if out is None:
+        return np.empty(shape, dtype=np.float64)
+    if out.shape != shape:
+        raise ValueError('output array has the shape {}, expected {}'.format(
+                            out.shape, shape))
+    return out
+
+
+def _angles(angles, degrees):
+    angles = np.asarray(angles, dtype=np.float64)
+    if degrees:
+        angles = angles * (np.pi / 180.)
+    return angles
+
+
+"""
+create_rotation_matrices
+
+creates a stack of matrices for rotations around given vectors and
+angles
+
+:params vectors:  (N,3) array of the rotation axes or a single axis
+:params angles:   (N,) array of the angles
+:params degrees:  True if the angles are given in degrees (default),
+                  False for radians
+:params out:      optional (N,3,3) output array
+"""
+
+
+def create_rotation_matrices(vectors, angles, degrees=True, out=None):
+    angles = _angles(angles, degrees).reshape(-1)
+    vectors = np.asarray(vectors, dtype=np.float64)
+    vectors = vectors / np.linalg.norm(vectors, axis=-1)[..., None]
+    vectors = np.broadcast_to(vectors, (len(angles), 3))
+
+    out = _output(out, (len(angles), 3, 3))
+
+    u_x = vectors[:, 0]
+    u_y = vectors[:, 1]
+    u_z = vectors[:, 2]
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    one_cos = 1. - cos_a
+
+    out[:, 0, 0] = cos_a + u_x**2 * one_cos
+    out[:, 0, 1] = u_x * u_y * one_cos - u_z * sin_a
+    out[:, 0, 2] = u_x * u_z * one_cos + u_y * sin_a
+    out[:, 1, 0] = u_y * u_x * one_cos + u_z * sin_a
+    out[:, 1, 1] = cos_a + u_y**2 * one_cos
+    out[:, 1, 2] = u_y * u_z * one_cos - u_x * sin_a
+    out[:, 2, 0] = u_z * u_x * one_cos - u_y * sin_a
+    out[:, 2, 1] = u_z * u_y * one_cos + u_x * sin_a
+    out[:, 2, 2] = cos_a + u_z**2 * one_cos
+
+    return out
+
+
+"""
+matrices_to_axis_angle
+
+converts a stack of rotation matrices into rotation axes and angles,
+the angles are in the range [0, 180] degrees
+
+:params matrices:  (N,3,3) array of rotation matrices
+:params degrees:   True to return the angles in degrees (default)
+:params out:       optional tuple of the (N,3) and (N,) output arrays
+"""
+
+
+def matrices_to_axis_angle(matrices, degrees=True, out=None):
+    q = matrices_to_quaternions(matrices)
+    if out is None:
+        out = (None, None)
+    axes = _output(out[0], (len(q), 3))
+    angles = _output(out[1], (len(q),))
+
+    sin_half = np.linalg.norm(q[:, 1:], axis=1)
+    np.arctan2(sin_half, q[:, 0], out=angles)
+    angles *= 2.
+
+    # the axis is arbitrary for rotations without angle
+    axes[:] = axis_Z
+    valid = sin_half > 0.
+    axes[valid] = q[valid, 1:] / sin_half[valid, None]
+
+    if degrees:
+        angles *= 180. / np.pi
+    return axes, angles
+
+
+"""
+quaternions_to_matrices
+
+converts a stack of unit quaternions into rotation matrices
+
+:params q:    (N,4) array of the quaternions (w, x, y, z)
+:params out:  optional (N,3,3) output array
+"""
+
+
+def quaternions_to_matrices(q, out=None):
+    q = np.asarray(q, dtype=np.float64).reshape(-1, 4)
+    out = _output(out, (len(q), 3, 3))
+    w, x, y, z = q.T
+
+    out[:, 0, 0] = 1. - 2. * (y * y + z * z)
+    out[:, 0, 1] = 2. * (x * y - w * z)
+    out[:, 0, 2] = 2. * (x * z + w * y)
+    out[:, 1, 0] = 2. * (x * y + w * z)
+    out[:, 1, 1] = 1. - 2. * (x * x + z * z)
+    out[:, 1, 2] = 2. * (y * z - w * x)
+    out[:, 2, 0] = 2. * (x * z - w * y)
+    out[:, 2, 1] = 2. * (y * z + w * x)
+    out[:, 2, 2] = 1. - 2. * (x * x + y * y)
+
+    return out
+
+
+"""
+matrices_to_quaternions
+
+converts a stack of rotation matrices into unit quaternions with w >= 0,
+see quaternion_from_matrix
+
+:params matrices:  (N,3,3) array of rotation matrices
+:params out:       optional (N,4) output array
+"""
+
+
+def matrices_to_quaternions(matrices, out=None):
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+    out = _output(out, (len(m), 4))
+
+    # the four candidates 4 q_i^2 of the squared components, the
+    # largest one gives the most accurate result
+    diag = np.stack((m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]), axis=1)
+    trace = diag.sum(axis=1)
+    cand = np.column_stack((1. + trace, 1. + 2. * diag - trace[:, None]))
+    k = np.argmax(cand, axis=1)
+    s = 2. * np.sqrt(cand[np.arange(len(m)), k])
+
+    # the differences and sums of the off diagonal elements
+    d0 = m[:, 2, 1] - m[:, 1, 2]
+    d1 = m[:, 0, 2] - m[:, 2, 0]
+    d2 = m[:, 1, 0] - m[:, 0, 1]
+    s0 = m[:, 2, 1] + m[:, 1, 2]
+    s1 = m[:, 0, 2] + m[:, 2, 0]
+    s2 = m[:, 1, 0] + m[:, 0, 1]
+
+    q = np.empty((len(m), 4))
+    q[k == 0] = np.column_stack((0.25 * s, d0 / s, d1 / s, d2 / s))[k == 0]
+    q[k == 1] = np.column_stack((d0 / s, 0.25 * s, s2 / s, s1 / s))[k == 1]
+    q[k == 2] = np.column_stack((d1 / s, s2 / s, 0.25 * s, s0 / s))[k == 2]
+    q[k == 3] = np.column_stack((d2 / s, s1 / s, s0 / s, 0.25 * s))[k == 3]
+
+    q[q[:, 0] < 0.] *= -1.
+    out[:] = q / np.linalg.norm(q, axis=1)[:, None]
+
+    return out
+
+
+"""
+euler_to_matrices
+
+creates rotation matrices from Euler angles. The rotations are done
+around the fixed coordinate axes in the given order, e.g. for 'xyz'
+first around x, then y and z, which is the same as setting the rotation
+of an object three times.
+
+:params angles:   (N,3) array of the three angles
+:params order:    the order of the axes, a permutation of 'xyz'
+:params degrees:  True if the angles are given in degrees (default)
+:params out:      optional (N,3,3) output array
+"""
+
+
+_euler_axes = {'x': axis_X, 'y': axis_Y, 'z': axis_Z}
+
+
+def _euler_permutation(order):
+    # returns the permutation matrix which maps the axes of the order
+    # to x, y and z and its determinant
+    if sorted(order) != ['x', 'y', 'z']:
+        raise ValueError('Unknown order of Euler angles {}'.format(order))
+    P = np.array([_euler_axes[a] for a in order])
+    return P, np.linalg.det(P)
+
+
+def euler_to_matrices(angles, order='xyz', degrees=True, out=None):
+    _euler_permutation(order)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1, 3)
+
+    r = [create_rotation_matrices(_euler_axes[a], angles[:, i],
+                                  degrees=degrees)
+         for i, a in enumerate(order)]
+    out = _output(out, (len(angles), 3, 3))
+    np.matmul(r[2], np.matmul(r[1], r[0]), out=out)
+
+    return out
+
+
+"""
+matrices_to_euler
+
+converts rotation matrices into Euler angles, see euler_to_matrices.
+The second angle is in the range [-90, 90] degrees, if it is close to
+the limits the third angle is set to 0
+
+:params matrices:  (N,3,3) array of rotation matrices
+:params order:     the order of the axes, a permutation of 'xyz'
+:params degrees:   True to return the angles in degrees (default)
+:params out:       optional (N,3) output array
+"""
+
+
+def matrices_to_euler(matrices, order='xyz', degrees=True, out=None):
+    P, sign = _euler_permutation(order)
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+
+    # the permutation changes the order to xyz, odd permutations
+    # change the sign of the angles
+    m = np.matmul(np.matmul(P, m), P.T)
+
+    angles = _output(out, (len(m), 3))
+    sin_b = np.clip(-m[:, 2, 0], -1., 1.)
+    angles[:, 1] = np.arcsin(sin_b)
+    lock = np.abs(sin_b) > 1. - 1e-12
+    angles[:, 0] = np.where(lock, np.arctan2(-m[:, 1, 2], m[:, 1, 1]),
+                            np.arctan2(m[:, 2, 1], m[:, 2, 2]))
+    angles[:, 2] = np.where(lock, 0., np.arctan2(m[:, 1, 0], m[:, 0, 0]))
+    angles *= sign
+
+    if degrees:
+        angles *= 180. / np.pi
+    return angles
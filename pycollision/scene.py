@@ -0,0 +1,297 @@
+#
+# pycollision/scene.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines the scene object, a container for many
+collision objects. The scene uses a broad phase to select the
+candidate pairs and runs the collision routines only on these
+pairs.
+
+"""
+
+from pycollision.broadphase import SpatialHashGrid
+from pycollision.collision import find_collision_procedure, \
+                                  find_intersection_procedure, intersects
+from pycollision.debug import debug, debug_enabled
+from pycollision.raycast import raycast
+
+import logging
+
+import numpy as np
+
+
+# constants
+cmp_atol = 1e-08
+
+
+class Scene(object):
+    """
+    This is the implementation of a Scene Object which holds Sphere,
+    Box and Plane objects.
+
+    Parameters
+    ----------
+    broadphase: BroadPhase, optional
+        the broad phase algorithm, default is a SpatialHashGrid with
+        an automatic cell size
+    verbose: bool, optional
+        make the object verbose, default=False
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        scene = Scene(SpatialHashGrid(cell_size=2.))
+        i = scene.add(Sphere([0., 0., 0.], 1.))
+        j = scene.add(Sphere([1., 0., 0.], 1.))
+        for i, j, result in scene.collisions():
+            print(i, j, result)
+    """
+    def __init__(self, broadphase=None, verbose=False):
+        if broadphase is None:
+            broadphase = SpatialHashGrid()
+        self._broadphase = broadphase
+        self._verbose = verbose
+
+        self._objects = {}
+        self._versions = {}
+        self._next_index = 0
+
+    @property
+    def broadphase(self):
+        """
+        returns the broad phase algorithm of the scene
+        """
+        return self._broadphase
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, idx):
+        return self._objects[idx]
+
+    def __contains__(self, idx):
+        return idx in self._objects
+
+    def __iter__(self):
+        return iter(sorted(self._objects.items()))
+
+    def add(self, obj):
+        """
+        adds an object to the scene
+
+        Parameters
+        ----------
+        obj:
+            the object, needs to provide the bounds attribute
+
+        Returns
+        -------
+        int
+            the index of the object inside the scene
+
+        Raises
+        ------
+        TypeError
+            if the object has no bounding box
+        """
+        if not hasattr(obj, 'bounds'):
+            raise TypeError('Cannot add objects of type {}'.format(
+                                obj.__class__.__name__) +
+                            ' to a scene')
+
+        idx = self._next_index
+        self._next_index += 1
+
+        lower, upper = obj.bounds
+        self._objects[idx] = obj
+        self._versions[idx] = getattr(obj, 'version', None)
+        self._broadphase.insert(idx, lower, upper)
+
+        return idx
+
+    def remove(self, idx):
+        """
+        removes an object from the scene
+
+        Parameters
+        ----------
+        idx: int
+            the index of the object
+
+        Returns
+        -------
+        object
+            the removed object
+        """
+        obj = self._objects.pop(idx)
+        del self._versions[idx]
+        self._broadphase.remove(idx)
+        return obj
+
+    def update(self, idx=None):
+        """
+        updates the bounding boxes after moving objects, objects
+        with an unchanged transform version are skipped
+
+        Parameters
+        ----------
+        idx: int or list, optional
+            the index or a list of indices of the moved objects,
+            default is to update all objects
+
+        Returns
+        -------
+        int
+            the number of updated objects
+        """
+        if idx is None:
+            idx = self._objects.keys()
+        elif isinstance(idx, int):
+            idx = [idx]
+
+        n = 0
+        for i in idx:
+            obj = self._objects[i]
+            version = getattr(obj, 'version', None)
+            if version is not None and version == self._versions[i]:
+                continue
+            self._versions[i] = version
+            lower, upper = obj.bounds
+            self._broadphase.update(i, lower, upper)
+            n += 1
+
+        return n
+
+    def candidate_pairs(self):
+        """
+        calculates the candidate pairs from the broad phase, the scene
+        must be updated before if objects were moved
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) with i < j
+        """
+        return self._broadphase.pairs()
+
+    def collisions(self, **kwargs):
+        """
+        runs the collision routines on all candidate pairs, pairs
+        without a collision routine were ignored
+
+        Parameters
+        ----------
+        kwargs:
+            additional named parameters which were redirected to
+            the collision functions
+
+        Returns
+        -------
+        list
+            list of tuples (i, j, result) of all colliding pairs with
+            the CollisionResult object
+        """
+        verbose = debug_enabled(self._verbose, logging.INFO)
+        pairs = self.candidate_pairs()
+        if verbose:
+            debug('scene: %i objects, %i candidate pairs' % (
+                len(self), len(pairs)), level=logging.INFO)
+
+        results = []
+        for i, j in pairs:
+            obj1 = self._objects[i]
+            obj2 = self._objects[j]
+            proc = find_collision_procedure(obj1, obj2)
+            if proc is None:
+                continue
+            func, swapped = proc
+            if swapped:
+                result = func(obj2, obj1, **kwargs)
+            else:
+                result = func(obj1, obj2, **kwargs)
+            if result():
+                results.append((i, j, result))
+
+        if verbose:
+            debug('scene: %i collisions' % len(results), level=logging.INFO)
+
+        return results
+
+    def intersecting_pairs(self, atol=cmp_atol, executor=None):
+        """
+        boolean only version of collisions, no CollisionResult objects
+        were created, pairs without a collision routine were ignored
+
+        Parameters
+        ----------
+        atol: float, optional
+            absolute tolerance for touching objects
+        executor: ParallelNarrowPhase, optional
+            runs the tests in parallel processes
+
+        Returns
+        -------
+        list
+            sorted list of index tuples (i, j) of all colliding pairs
+        """
+        if executor is not None:
+            keys = sorted(self._objects)
+            objs = [self._objects[i] for i in keys]
+            pos = {i: n for n, i in enumerate(keys)}
+            pairs = [(pos[i], pos[j]) for i, j in self.candidate_pairs()]
+            return [(keys[i], keys[j])
+                    for i, j in executor.intersecting_pairs(objs, pairs,
+                                                            atol=atol)]
+
+        results = []
+        for i, j in self.candidate_pairs():
+            obj1 = self._objects[i]
+            obj2 = self._objects[j]
+            if find_intersection_procedure(obj1, obj2) is None and \
+                    find_collision_procedure(obj1, obj2) is None:
+                continue
+            if intersects(obj1, obj2, atol=atol):
+                results.append((i, j))
+
+        return results
+
+    def raycast(self, origins, directions, max_distance=np.inf):
+        """
+        calculates the first hit of many rays with the objects of the
+        scene, see pycollision.raycast.raycast. A broad phase with a
+        raycast method (AABBTree) is used to select the candidates,
+        the scene must be updated before if objects were moved.
+
+        Parameters
+        ----------
+        origins: np.array
+            (R,3) array of the ray origins
+        directions: np.array
+            (R,3) array of the ray directions
+        max_distance: float, optional
+            hits farther away are ignored
+
+        Returns
+        -------
+        tuple
+            (distances, indices, normals), the indices are the indices
+            of the objects inside the scene, -1 for misses
+        """
+        if hasattr(self._broadphase, 'raycast'):
+            return raycast(origins, directions, self._objects,
+                           max_distance=max_distance, tree=self._broadphase)
+
+        keys = np.array(sorted(self._objects), dtype=np.intp)
+        objs = [self._objects[i] for i in keys]
+        distances, index, normals = raycast(origins, directions, objs,
+                                            max_distance=max_distance)
+        hit = index >= 0
+        index[hit] = keys[index[hit]]
+        return distances, index, normals
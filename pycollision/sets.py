@@ -0,0 +1,720 @@
+#
+# pycollision/sets.py
+#
+# written by: Oliver Cordes 2026-10-18
+# changed by: Oliver Cordes 2026-10-18
+#
+
+"""
+
+This module defines containers for many objects of the same type.
+All parameters and transformations are stored in contiguous numpy
+arrays (structure of arrays), so transformations and collision tests
+can be applied to the complete set at once. Single elements can be
+accessed as views which behave like the Sphere, Box and Plane objects.
+
+"""
+
+from pycollision.objects import Sphere, Box, Plane, box_corners
+from pycollision.rotation import quaternion_to_matrix
+from pycollision.batch import coll_spheres2spheres, coll_boxes2boxes, \
+                              coll_spheres2planes, coll_boxes2planes, \
+                              coll_planes2planes
+
+import numpy as np
+import numpy.linalg as nl
+
+
+# constants
+cmp_atol = 1e-08
+
+
+def _as_array(val, n, shape):
+    # broadcasts a single value or an array of values to n elements
+    val = np.asarray(val, dtype=np.float64)
+    return np.broadcast_to(val, (n,) + shape).copy()
+
+
+def _pairs(mask, sparse):
+    if sparse:
+        return np.nonzero(mask)
+    return mask
+
+
+class ObjectSet(object):
+    """
+    Basic object for all object sets, containing the transformations
+    of all elements. The transformations work like the Position
+    object, every element has a rotation, a translation and a post
+    translation.
+
+    Parameters
+    ----------
+    n: int
+        the number of elements
+
+    Attributes
+    ----------
+    _rotations: np.array(N,3,3)
+        the rotation matrices of all elements
+    _translations: np.array(N,3)
+        the translation vectors of all elements
+    _post_translations: np.array(N,3)
+        the post translation vectors of all elements
+    _versions: np.array(N)
+        the transform version counters of all elements
+    _version: int
+        the transform version counter of the complete set
+    """
+    _view_class = None
+
+    def __init__(self, n):
+        self._rotations = np.tile(np.eye(3), (n, 1, 1))
+        self._translations = np.zeros((n, 3), dtype=np.float64)
+        self._post_translations = np.zeros((n, 3), dtype=np.float64)
+        self._versions = np.zeros(n, dtype=np.int64)
+        self._version = 0
+        self._cache = {}
+        self._cache_version = -1
+
+    def __len__(self):
+        return len(self._translations)
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError('index out of range')
+        return self._view_class(self, idx)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def version(self):
+        """
+        returns the transform version counter of the set, the value
+        changes with every transformation of any element
+        """
+        return self._version
+
+    @property
+    def rotations(self):
+        """
+        returns the (N,3,3) rotation matrices
+        """
+        return self._rotations
+
+    @property
+    def translations(self):
+        """
+        returns the (N,3) translation vectors
+        """
+        return self._translations
+
+    @property
+    def post_translations(self):
+        """
+        returns the (N,3) post translation vectors
+        """
+        return self._post_translations
+
+    def _changed(self, idx):
+        self._version += 1
+        if idx is None:
+            self._versions += 1
+        else:
+            self._versions[idx] += 1
+
+    def rotate(self, val, idx=None):
+        """
+        applies a rotation to all or selected elements, the rotation
+        is applied like the rotation of a Position object
+
+        Parameters
+        ----------
+        val: np.array
+            a 3x3 matrix or an (K,3,3) array of matrices
+        idx: optional
+            index array or slice of the selected elements, default
+            are all elements
+        """
+        sel = slice(None) if idx is None else idx
+        val = np.asarray(val, dtype=np.float64)
+        self._rotations[sel] = np.matmul(val, self._rotations[sel])
+        self._translations[sel] = np.einsum('...ij,...j->...i', val,
+                                            self._translations[sel])
+        self._changed(idx)
+
+    def translate(self, val, idx=None):
+        """
+        applies a translation to all or selected elements
+
+        Parameters
+        ----------
+        val: np.array
+            a 3d vector or an (K,3) array of vectors
+        idx: optional
+            index array or slice of the selected elements, default
+            are all elements
+        """
+        sel = slice(None) if idx is None else idx
+        self._translations[sel] += np.asarray(val, dtype=np.float64)
+        self._changed(idx)
+
+    def post_translate(self, val, idx=None):
+        """
+        applies a post translation to all or selected elements
+
+        Parameters
+        ----------
+        val: np.array
+            a 3d vector or an (K,3) array of vectors
+        idx: optional
+            index array or slice of the selected elements, default
+            are all elements
+        """
+        sel = slice(None) if idx is None else idx
+        self._post_translations[sel] += np.asarray(val, dtype=np.float64)
+        self._changed(idx)
+
+    def _cached(self, key, func):
+        if self._cache_version != self._version:
+            self._cache = {}
+            self._cache_version = self._version
+
+        try:
+            return self._cache[key]
+        except KeyError:
+            val = func()
+            val.setflags(write=False)
+            self._cache[key] = val
+            return val
+
+    def _transform_points(self, points):
+        # points is an (N,3) or (N,K,3) array of local coordinates
+        if points.ndim == 2:
+            return np.einsum('nij,nj->ni', self._rotations, points) + \
+                self._translations + self._post_translations
+        return np.einsum('nij,nkj->nki', self._rotations, points) + \
+            (self._translations + self._post_translations)[:, None, :]
+
+
+class SphereSet(ObjectSet):
+    """
+    This is the implementation of a set of spheres.
+
+    Parameters
+    ----------
+    centers: np.array
+        (N,3) array of the sphere centers
+    radii: np.array
+        (N,) array of the radii or a single radius for all spheres
+
+    Raises
+    ------
+    ValueError
+        if a radius is not positive
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        spheres = SphereSet(np.random.uniform(0., 10., (1000, 3)), 0.1)
+        spheres.translate([1., 0., 0.])
+        i, j = spheres.collisions(sparse=True)
+        s = spheres[0]   # behaves like a Sphere object
+    """
+    def __init__(self, centers, radii):
+        centers = np.array(centers, dtype=np.float64).reshape(-1, 3)
+        ObjectSet.__init__(self, len(centers))
+
+        self._centers = centers
+        self._radii = _as_array(radii, len(centers), ())
+        if np.any(~(self._radii > 0.)):
+            raise ValueError('radii must be positive')
+
+    @classmethod
+    def from_objects(cls, spheres):
+        """
+        creates a set from a sequence of Sphere objects
+        """
+        spheres = list(spheres)
+        s = cls(np.array([i._x for i in spheres]).reshape(-1, 3),
+                np.array([i.radius for i in spheres]))
+        for n, i in enumerate(spheres):
+            s._rotations[n] = i.rotation
+            s._translations[n] = i.translation
+            s._post_translations[n] = i.post_translation
+        return s
+
+    @property
+    def radii(self):
+        """
+        returns the (N,) radii
+        """
+        return self._radii
+
+    @property
+    def positions(self):
+        """
+        returns the (N,3) sphere centers after applying all
+        transformations
+        """
+        return self._cached('positions',
+                            lambda: self._transform_points(self._centers))
+
+    @property
+    def bounds(self):
+        """
+        returns the (lower, upper) corners of the bounding boxes as
+        (N,3) arrays
+        """
+        p = self.positions
+        return p - self._radii[:, None], p + self._radii[:, None]
+
+    def collisions(self, other=None, atol=cmp_atol, sparse=False):
+        """
+        calculates the collisions with another set
+
+        Parameters
+        ----------
+        other: optional
+            a SphereSet or PlaneSet, if None the set is tested against
+            itself and every pair is reported once
+        atol: float, optional
+            absolute tolerance for touching objects
+        sparse: bool, optional
+            return the indices of the colliding pairs instead of the
+            collision matrix
+
+        Returns
+        -------
+        np.array or tuple
+            the boolean collision matrix or the index arrays
+            (idx1, idx2) of all colliding pairs
+
+        Raises
+        ------
+        ValueError
+            if there is no collision procedure for the other set
+        """
+        if other is None or isinstance(other, SphereSet):
+            spheres2 = None if other is None else (other.positions,
+                                                   other.radii)
+            mask = coll_spheres2spheres((self.positions, self._radii),
+                                        spheres2, atol=atol)
+        elif isinstance(other, PlaneSet):
+            mask = coll_spheres2planes(self.positions, self._radii,
+                                       other.equations, atol=atol)
+        else:
+            raise ValueError('Cannot find any collision procedure' +
+                             ' for given types {} and {}'.format(
+                                self.__class__.__name__,
+                                other.__class__.__name__))
+        return _pairs(mask, sparse)
+
+
+class BoxSet(ObjectSet):
+    """
+    This is the implementation of a set of boxes.
+
+    Parameters
+    ----------
+    x1: np.array
+        (N,3) array of the lower front left corners
+    x2: np.array
+        (N,3) array of the upper back right corners
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        boxes = BoxSet(lower, lower + 1.)
+        boxes.rotate(create_rotation_Z(10.), idx=[0, 5, 7])
+        i, j = boxes.collisions(sparse=True)
+    """
+    def __init__(self, x1, x2):
+        x1 = np.array(x1, dtype=np.float64).reshape(-1, 3)
+        x2 = np.array(x2, dtype=np.float64).reshape(-1, 3)
+        if x1.shape != x2.shape:
+            raise ValueError('number of corners doesn\'t fit together')
+        ObjectSet.__init__(self, len(x1))
+
+        self._x1 = x1
+        self._x2 = x2
+
+    @classmethod
+    def from_objects(cls, boxes):
+        """
+        creates a set from a sequence of Box objects
+        """
+        boxes = list(boxes)
+        s = cls(np.array([i._x1 for i in boxes]).reshape(-1, 3),
+                np.array([i._x2 for i in boxes]).reshape(-1, 3))
+        for n, i in enumerate(boxes):
+            s._rotations[n] = i.rotation
+            s._translations[n] = i.translation
+            s._post_translations[n] = i.post_translation
+        return s
+
+    @property
+    def half_extents(self):
+        """
+        returns the (N,3) half lengths of the boxes
+        """
+        return np.abs(self._x2 - self._x1) / 2.
+
+    @property
+    def centers(self):
+        """
+        returns the (N,3) box centers after applying all
+        transformations
+        """
+        return self._cached('centers', lambda: self._transform_points(
+            (self._x1 + self._x2) / 2.))
+
+    @property
+    def corners(self):
+        """
+        returns the (N,8,3) box corners after applying all
+        transformations, in the same order as Box.corners
+        """
+        return self._cached('corners', self._get_corners)
+
+    def _get_corners(self):
+        return self._transform_points(box_corners(self._x1, self._x2))
+
+    @property
+    def bounds(self):
+        """
+        returns the (lower, upper) corners of the bounding boxes as
+        (N,3) arrays
+        """
+        # projection of the half lengths onto the world axes
+        ext = np.einsum('nij,nj->ni', np.abs(self._rotations),
+                        self.half_extents)
+        c = self.centers
+        return c - ext, c + ext
+
+    def collisions(self, other=None, atol=cmp_atol, sparse=False):
+        """
+        calculates the collisions with another set
+
+        Parameters
+        ----------
+        other: optional
+            a BoxSet or PlaneSet, if None the set is tested against
+            itself and every pair is reported once
+        atol: float, optional
+            absolute tolerance for touching objects
+        sparse: bool, optional
+            return the indices of the colliding pairs instead of the
+            collision matrix
+
+        Returns
+        -------
+        np.array or tuple
+            the boolean collision matrix or the index arrays
+            (idx1, idx2) of all colliding pairs
+
+        Raises
+        ------
+        ValueError
+            if there is no collision procedure for the other set
+        """
+        if other is None or isinstance(other, BoxSet):
+            if other is None:
+                mask = coll_boxes2boxes(self.centers, self._rotations,
+                                        self.half_extents, atol=atol)
+            else:
+                mask = coll_boxes2boxes(self.centers, self._rotations,
+                                        self.half_extents, other.centers,
+                                        other._rotations,
+                                        other.half_extents, atol=atol)
+        elif isinstance(other, PlaneSet):
+            mask = coll_boxes2planes(self.corners, other.equations,
+                                     atol=atol)
+        else:
+            raise ValueError('Cannot find any collision procedure' +
+                             ' for given types {} and {}'.format(
+                                self.__class__.__name__,
+                                other.__class__.__name__))
+        return _pairs(mask, sparse)
+
+
+class PlaneSet(ObjectSet):
+    """
+    This is the implementation of a set of planes, every plane is
+    given by the equation n*x = d.
+
+    Parameters
+    ----------
+    n: np.array
+        (N,3) array of the normal vectors
+    d: np.array
+        (N,) array of the distances or a single distance for all
+        planes, the distances are measured along the normalized
+        normal vectors like for Plane objects
+
+    Raises
+    ------
+    ValueError
+        if a normal vector has zero length
+    """
+    def __init__(self, n, d):
+        n = np.array(n, dtype=np.float64).reshape(-1, 3)
+        ObjectSet.__init__(self, len(n))
+
+        if np.any(np.isclose(nl.norm(n, axis=1), 0.)):
+            raise ValueError('zero norm vector given for plane!')
+        self._n = n
+        self._d = _as_array(d, len(n), ())
+
+    @classmethod
+    def from_objects(cls, planes):
+        """
+        creates a set from a sequence of Plane objects
+        """
+        planes = list(planes)
+        s = cls(np.array([i._n for i in planes]).reshape(-1, 3),
+                np.array([i._d for i in planes]))
+        for n, i in enumerate(planes):
+            s._rotations[n] = i.rotation
+            s._translations[n] = i.translation
+            s._post_translations[n] = i.post_translation
+        return s
+
+    @property
+    def norm_vectors(self):
+        """
+        returns the (N,3) normalized normal vectors after applying all
+        rotations
+        """
+        return self.equations[:, :3]
+
+    @property
+    def distances(self):
+        """
+        returns the (N,) distances of the planes to the origin after
+        applying all transformations
+        """
+        return self.equations[:, 3]
+
+    @property
+    def equations(self):
+        """
+        returns the (N,4) plane equations, every row contains the
+        normalized normal vector and the distance to the origin
+        """
+        return self._cached('equations', self._get_equations)
+
+    def _get_equations(self):
+        n = np.einsum('nij,nj->ni', self._rotations, self._n)
+        length = nl.norm(n, axis=1)
+        n /= length[:, None]
+        trans = self._translations + self._post_translations
+        d = self._d + np.einsum('ni,ni->n', n, trans)
+        return np.column_stack((n, d))
+
+    @property
+    def bounds(self):
+        """
+        returns the (lower, upper) corners of the bounding boxes as
+        (N,3) arrays, which are always infinite
+        """
+        return np.full((len(self), 3), -np.inf), \
+            np.full((len(self), 3), np.inf)
+
+    def collisions(self, other=None, atol=cmp_atol, sparse=False):
+        """
+        calculates the collisions with another set
+
+        Parameters
+        ----------
+        other: optional
+            a PlaneSet, SphereSet or BoxSet, if None the set is tested
+            against itself and every pair is reported once
+        atol: float, optional
+            absolute tolerance for touching objects
+        sparse: bool, optional
+            return the indices of the colliding pairs instead of the
+            collision matrix
+
+        Returns
+        -------
+        np.array or tuple
+            the boolean collision matrix or the index arrays
+            (idx1, idx2) of all colliding pairs
+
+        Raises
+        ------
+        ValueError
+            if there is no collision procedure for the other set
+        """
+        if other is None:
+            mask = np.triu(coll_planes2planes(self.equations,
+                                              self.equations, atol=atol),
+                           k=1)
+        elif isinstance(other, PlaneSet):
+            mask = coll_planes2planes(self.equations, other.equations,
+                                      atol=atol)
+        elif isinstance(other, (SphereSet, BoxSet)):
+            mask = other.collisions(self, atol=atol).T
+        else:
+            raise ValueError('Cannot find any collision procedure' +
+                             ' for given types {} and {}'.format(
+                                self.__class__.__name__,
+                                other.__class__.__name__))
+        return _pairs(mask, sparse)
+
+
+"""
+--------------------------------------------------------------------------------
+Views
+"""
+
+
+class SetView(object):
+    """
+    Mixin for the views of single elements of a set. All positional
+    attributes read and write the arrays of the set.
+    """
+    def __init__(self, owner, index):
+        self._owner = owner
+        self._index = index
+
+        self._verbose = False
+        self._cache = {}
+        self._cache_version = -1
+
+    @property
+    def owner(self):
+        """
+        returns the set of the element
+        """
+        return self._owner
+
+    @property
+    def index(self):
+        """
+        returns the index of the element inside the set
+        """
+        return self._index
+
+    @property
+    def _version(self):
+        return int(self._owner._versions[self._index])
+
+    @property
+    def _matrix(self):
+        m = np.eye(4)
+        m[:3, :3] = self._owner._rotations[self._index]
+        m[:3, 3] = self._owner._translations[self._index]
+        return m
+
+    @property
+    def _post_translation(self):
+        return self._owner._post_translations[self._index]
+
+    @property
+    def rotation(self):
+        return self._owner._rotations[self._index]
+
+    @rotation.setter
+    def rotation(self, val):
+        self._owner.rotate(val, idx=[self._index])
+
+    @property
+    def translation(self):
+        return self._owner._translations[self._index]
+
+    @translation.setter
+    def translation(self, val):
+        self._owner.translate(val, idx=[self._index])
+
+    @property
+    def post_translation(self):
+        return self._owner._post_translations[self._index]
+
+    @post_translation.setter
+    def post_translation(self, val):
+        self._owner.post_translate(val, idx=[self._index])
+
+    def set_backend(self, backend):
+        # the transformation is stored in the matrices of the set
+        if backend != 'matrix':
+            raise ValueError('Elements of sets support only the' +
+                             ' matrix backend')
+
+    def rotate_quaternion(self, q):
+        self._owner.rotate(quaternion_to_matrix(q), idx=[self._index])
+
+    def transform(self, rotation=None, translation=None,
+                  post_translation=None):
+        idx = [self._index]
+        if rotation is not None:
+            self._owner.rotate(rotation, idx=idx)
+        if translation is not None:
+            self._owner.translate(translation, idx=idx)
+        if post_translation is not None:
+            self._owner.post_translate(post_translation, idx=idx)
+
+
+class SphereView(SetView, Sphere):
+    """
+    A single element of a SphereSet which behaves like a Sphere
+    """
+    @property
+    def _x(self):
+        return self._owner._centers[self._index]
+
+    @property
+    def _radius(self):
+        return float(self._owner._radii[self._index])
+
+
+class BoxView(SetView, Box):
+    """
+    A single element of a BoxSet which behaves like a Box
+    """
+    @property
+    def _x1(self):
+        return self._owner._x1[self._index]
+
+    @property
+    def _x2(self):
+        return self._owner._x2[self._index]
+
+    @property
+    def _half_diagonal(self):
+        return (self._x2 - self._x1) / 2.
+
+    @property
+    def _half(self):
+        return np.abs(self._half_diagonal)
+
+    @property
+    def _volume(self):
+        return float(8. * np.prod(self._half))
+
+
+class PlaneView(SetView, Plane):
+    """
+    A single element of a PlaneSet which behaves like a Plane
+    """
+    @property
+    def _n(self):
+        return self._owner._n[self._index]
+
+    @property
+    def _d(self):
+        return float(self._owner._d[self._index])
+
+
+SphereSet._view_class = SphereView
+BoxSet._view_class = BoxView
+PlaneSet._view_class = PlaneView
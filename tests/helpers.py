@@ -0,0 +1,29 @@
+"""
+
+tests/helpers.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+import numpy as np
+
+
+def brute_force_pairs(bounds1, bounds2=None, margin=1e-8):
+    pairs = []
+    for i, (l1, u1) in enumerate(bounds1):
+        for j, (l2, u2) in enumerate(bounds1 if bounds2 is None
+                                     else bounds2):
+            if bounds2 is None and j <= i:
+                continue
+            if np.all(l1 <= u2 + margin) and np.all(l2 <= u1 + margin):
+                pairs.append((i, j))
+    return pairs
+
+
+def random_bounds(n, seed=42, size=2.):
+    rng = np.random.RandomState(seed)
+    lower = rng.uniform(0., 20., (n, 3))
+    upper = lower + rng.uniform(0.1, size, (n, 3))
+    return list(zip(lower, upper))
@@ -0,0 +1,212 @@
+"""
+
+tests/test_aabbtree.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.aabbtree import AABBTree, ray_aabb
+from pycollision.objects import Box
+from pycollision.scene import Scene
+
+from helpers import brute_force_pairs, random_bounds
+
+
+import unittest
+import warnings
+
+import numpy as np
+
+
+def create_tree(bounds):
+    tree = AABBTree()
+    for i, (lower, upper) in enumerate(bounds):
+        tree.insert(i, lower, upper)
+    return tree
+
+
+class TestTree(unittest.TestCase):
+    # simple pairs and queries
+    def test_test1(self):
+        tree = AABBTree()
+        tree.insert(0, [0., 0., 0.], [1., 1., 1.])
+        tree.insert(1, [0.5, 0., 0.], [2., 1., 1.])
+        tree.insert(2, [5., 5., 5.], [6., 6., 6.])
+
+        self.assertEqual(tree.pairs(), [(0, 1)])
+        self.assertEqual(tree.query([1.5, 0., 0.], [3., 1., 1.]), [1])
+        self.assertEqual(tree.query([1.1, 0., 0.], [1.2, 1., 1.]), [1])
+        self.assertEqual(tree.query([10., 0., 0.], [11., 1., 1.]), [])
+
+    # structure of a larger tree
+    def test_test2(self):
+        bounds = random_bounds(300)
+        tree = create_tree(bounds)
+
+        tree._validate()
+        self.assertEqual(len(tree), 300)
+        # a balanced tree
+        self.assertEqual(tree.height < 20, True)
+
+    # self collision compared with brute force
+    def test_test3(self):
+        bounds = random_bounds(200)
+        tree = create_tree(bounds)
+
+        self.assertEqual(tree.pairs(), brute_force_pairs(bounds))
+
+    # mixed sizes, tree vs tree
+    def test_test4(self):
+        bounds1 = random_bounds(100, seed=1, size=1.)
+        bounds1[0] = (np.array([-5., -5., -5.]), np.array([30., 30., 1.]))
+        bounds2 = random_bounds(50, seed=2, size=5.)
+        tree1 = create_tree(bounds1)
+        tree2 = create_tree(bounds2)
+
+        self.assertEqual(tree1.pairs_with(tree2),
+                         brute_force_pairs(bounds1, bounds2))
+
+    # updates inside and outside of the fattened boxes
+    def test_test5(self):
+        tree = AABBTree(fattening=0.5)
+        tree.insert(0, [0., 0., 0.], [1., 1., 1.])
+        tree.insert(1, [3., 0., 0.], [4., 1., 1.])
+
+        self.assertEqual(tree.update(1, [3.2, 0., 0.], [4.2, 1., 1.]),
+                         False)
+        self.assertEqual(tree.pairs(), [])
+        self.assertEqual(tree.update(1, [0.9, 0., 0.], [1.9, 1., 1.]),
+                         True)
+        self.assertEqual(tree.pairs(), [(0, 1)])
+        tree._validate()
+
+    # random movements and removals
+    def test_test6(self):
+        rng = np.random.RandomState(3)
+        bounds = random_bounds(100)
+        tree = create_tree(bounds)
+
+        for step in range(10):
+            for i in range(len(bounds)):
+                d = rng.uniform(-1., 1., 3)
+                bounds[i] = (bounds[i][0] + d, bounds[i][1] + d)
+                tree.update(i, bounds[i][0], bounds[i][1])
+            tree._validate()
+            self.assertEqual(tree.pairs(), brute_force_pairs(bounds))
+
+        for i in range(0, 100, 2):
+            tree.remove(i)
+        tree._validate()
+
+        ids = list(range(1, 100, 2))
+        pairs_cmp = [(ids[i], ids[j]) for i, j in
+                     brute_force_pairs(bounds[1::2])]
+        self.assertEqual(tree.pairs(), pairs_cmp)
+
+        tree.clear()
+        self.assertEqual(tree.height, -1)
+        self.assertEqual(tree.pairs(), [])
+
+    # ray queries
+    def test_test7(self):
+        tree = AABBTree()
+        tree.insert(0, [2., -1., -1.], [3., 1., 1.])
+        tree.insert(1, [5., -1., -1.], [6., 1., 1.])
+        tree.insert(2, [5., 3., -1.], [6., 4., 1.])
+
+        hits = tree.raycast([0., 0., 0.], [1., 0., 0.])
+
+        self.assertEqual([i for t, i in hits], [0, 1])
+        self.assertEqual(np.isclose(hits[0][0], 2.), True)
+        self.assertEqual(np.isclose(hits[1][0], 5.), True)
+
+        hits = tree.raycast([0., 0., 0.], [1., 0., 0.], max_distance=4.)
+        self.assertEqual([i for t, i in hits], [0])
+
+        hits = tree.raycast([0., 0., 0.], [-1., 0., 0.])
+        self.assertEqual(hits, [])
+
+    # the tree as broad phase of a scene
+    def test_test8(self):
+        scene = Scene(AABBTree())
+        scene.add(Box([0, 0, 0], [1, 1, 1]))
+        scene.add(Box([0.5, 0, 0], [1.5, 1, 1]))
+        scene.add(Box([3, 0, 0], [4, 1, 1]))
+
+        self.assertEqual([(i, j) for i, j, r in scene.collisions()],
+                         [(0, 1)])
+
+    # infinite bounding boxes are kept outside of the tree
+    def test_test9(self):
+        inf = np.inf
+        bounds = random_bounds(40)
+        bounds[3] = (np.full(3, -inf), np.full(3, inf))
+        bounds[10] = (np.array([-inf, -inf, 5.]), np.array([inf, inf, 5.]))
+        bounds[25] = (np.array([-inf, 30., -inf]), np.array([inf, 30., inf]))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            tree = create_tree(bounds)
+            tree._validate()
+            self.assertEqual(tree.pairs(), brute_force_pairs(bounds))
+
+            found = tree.query([0., 4., 4.], [1., 6., 6.])
+            cmp = [i for i, (l1, u1) in enumerate(bounds)
+                   if np.all(l1 <= [1., 6., 6.]) and
+                   np.all(u1 >= [0., 4., 4.])]
+            self.assertEqual(found, cmp)
+            self.assertEqual(3 in found and 10 in found, True)
+
+            hits = tree.raycast([0., 40., 0.], [0., -1., 0.],
+                                max_distance=12.)
+            self.assertEqual(hits[:2], [(0., 3), (10., 25)])
+
+            other = create_tree(random_bounds(10, seed=1) + [bounds[10]])
+            self.assertEqual(tree.pairs_with(other),
+                             brute_force_pairs(bounds,
+                                               random_bounds(10, seed=1) +
+                                               [bounds[10]]))
+
+            # moving objects between the tree and the unbounded objects
+            self.assertEqual(tree.update(3, [0., 0., 0.], [1., 1., 1.]),
+                             True)
+            bounds[3] = (np.zeros(3), np.ones(3))
+            self.assertEqual(tree.update(7, *bounds[10]), True)
+            bounds[7] = bounds[10]
+            tree.remove(25)
+            del bounds[25]
+            tree._validate()
+            ids = [i for i in range(40) if i != 25]
+            self.assertEqual(tree.pairs(),
+                             [(ids[i], ids[j])
+                              for i, j in brute_force_pairs(bounds)])
+
+    # errors
+    def test_test100(self):
+        with self.assertRaises(ValueError) as context:
+            tree = AABBTree(fattening=-1.)
+
+
+class TestRayAABB(unittest.TestCase):
+    # origin inside the box
+    def test_test1(self):
+        t = ray_aabb(np.zeros(3), 1. / np.array([1., 2., 3.]),
+                     -np.ones(3), np.ones(3), np.inf)
+
+        self.assertEqual(t, 0.)
+
+    # ray parallel to one axis
+    def test_test2(self):
+        with np.errstate(divide='ignore'):
+            inv = 1. / np.array([0., 1., 0.])
+        t = ray_aabb(np.array([0., -5., 0.]), inv,
+                     -np.ones(3), np.ones(3), np.inf)
+
+        self.assertEqual(np.isclose(t, 4.), True)
+
+        t = ray_aabb(np.array([2., -5., 0.]), inv,
+                     -np.ones(3), np.ones(3), np.inf)
+
+        self.assertEqual(t, None)
@@ -0,0 +1,191 @@
+"""
+
+tests/test_batch.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_xy_plane, create_yz_plane
+from pycollision.rotation import create_rotation_Z
+from pycollision.batch import coll_spheres2spheres, sphere_arrays, \
+                              plane_equations, classify_spheres2planes, \
+                              coll_spheres2planes, coll_boxes2planes, \
+                              coll_planes2planes, sphere_overlap_batch, \
+                              sphere_plane_overlap_batch, \
+                              box_plane_overlap_batch, plane_overlap_batch
+
+
+import unittest
+
+import numpy as np
+
+
+class TestSphereArrays(unittest.TestCase):
+    # list of spheres
+    def test_test1(self):
+        s1 = Sphere([1, 2, 3], 2.)
+        s2 = Sphere([0, 0, 0], 1.)
+        s2.translation = [1, 0, 0]
+
+        c, r = sphere_arrays([s1, s2])
+
+        self.assertEqual(np.all(c == np.array([[1., 2., 3.],
+                                               [1., 0., 0.]])), True)
+        self.assertEqual(np.all(r == np.array([2., 1.])), True)
+
+    # arrays with a scalar radius
+    def test_test2(self):
+        c, r = sphere_arrays((np.zeros((4, 3)), 2.))
+
+        self.assertEqual(r.shape, (4,))
+        self.assertEqual(np.all(r == 2.), True)
+
+    # wrong number of radii
+    def test_test3(self):
+        with self.assertRaises(ValueError) as context:
+            c, r = sphere_arrays((np.zeros((4, 3)), np.ones(3)))
+
+
+class TestSpheres2Spheres(unittest.TestCase):
+    # collision matrix
+    def test_test1(self):
+        c1 = np.array([[0., 0., 0.], [10., 0., 0.]])
+        c2 = np.array([[1., 0., 0.], [2., 0., 0.], [20., 0., 0.]])
+
+        m = coll_spheres2spheres((c1, 1.), (c2, 1.))
+
+        m_cmp = np.array([[True, True, False], [False, False, False]])
+        self.assertEqual(np.all(m == m_cmp), True)
+
+    # sparse results
+    def test_test2(self):
+        c1 = np.array([[0., 0., 0.], [10., 0., 0.]])
+        c2 = np.array([[1., 0., 0.], [2., 0., 0.], [20., 0., 0.]])
+
+        i, j, dist, outer = coll_spheres2spheres((c1, 1.), (c2, 1.),
+                                                 sparse=True)
+
+        self.assertEqual(list(i), [0, 0])
+        self.assertEqual(list(j), [0, 1])
+        self.assertEqual(np.all(np.isclose(dist, [1., 2.])), True)
+        self.assertEqual(np.all(np.isclose(outer, [-1., 0.])), True)
+
+    # atol tests, same as for coll_sphere2sphere
+    def test_test3(self):
+        c1 = np.array([[0., 0., 0.]])
+        c2 = np.array([[2.+1e-4, 0., 0.]])
+
+        m = coll_spheres2spheres((c1, 1.), (c2, 1.), atol=1e-3)
+        self.assertEqual(m[0, 0], True)
+
+        m = coll_spheres2spheres((c1, 1.), (c2, 1.), atol=1e-5)
+        self.assertEqual(m[0, 0], False)
+
+    # self test, every pair only once
+    def test_test4(self):
+        c = np.array([[0., 0., 0.], [1., 0., 0.], [2., 0., 0.]])
+
+        i, j, dist, outer = coll_spheres2spheres((c, 0.6), sparse=True)
+
+        self.assertEqual(list(zip(i, j)), [(0, 1), (1, 2)])
+
+    # comparison with the single collision routine, small chunks
+    def test_test5(self):
+        rng = np.random.RandomState(42)
+        spheres = [Sphere(rng.uniform(0., 10., 3), rng.uniform(0.1, 1.))
+                   for i in range(20)]
+
+        m = coll_spheres2spheres(spheres, spheres, chunksize=3)
+
+        for i, s1 in enumerate(spheres):
+            for j, s2 in enumerate(spheres):
+                self.assertEqual(m[i, j], s1.has_collisions(s2)())
+
+    # no collisions at all
+    def test_test6(self):
+        c = np.array([[0., 0., 0.], [10., 0., 0.]])
+
+        i, j, dist, outer = coll_spheres2spheres((c, 1.), sparse=True)
+
+        self.assertEqual(len(i), 0)
+        self.assertEqual(len(outer), 0)
+
+
+class TestSpheres2Planes(unittest.TestCase):
+    # signed distances, contacts and the closest plane
+    def test_test1(self):
+        walls = [create_xy_plane(0.), create_yz_plane(0.),
+                 create_yz_plane(10.)]
+        walls[2].translation = [-1., 0., 0.]
+        c = np.array([[7., 0., 5.], [0.5, 0., 8.], [5., 0., -0.2]])
+        r = np.array([1., 1., 0.5])
+
+        eq = plane_equations(walls)
+        contact, dist, closest = classify_spheres2planes(c, r, eq)
+
+        self.assertEqual(eq.shape, (3, 4))
+        self.assertEqual(np.all(np.isclose(dist[:, 2], [-2., -8.5, -4.])),
+                         True)
+        self.assertEqual(np.all(closest == [2, 1, 0]), True)
+        self.assertEqual(np.all(contact == [[False, False, False],
+                                            [False, True, False],
+                                            [True, False, False]]), True)
+
+        # agrees with the single collision routine
+        for i in range(len(c)):
+            s = Sphere(c[i], r[i])
+            for j, p in enumerate(walls):
+                self.assertEqual(contact[i, j], s.has_collisions(p)())
+
+    # no planes
+    def test_test2(self):
+        contact, dist, closest = classify_spheres2planes(np.zeros((2, 3)),
+                                                         1., np.zeros((0, 4)))
+
+        self.assertEqual(contact.shape, (2, 0))
+        self.assertEqual(np.all(closest == -1), True)
+
+
+class TestPairs(unittest.TestCase):
+    # the pair kernels agree with the collision matrices
+    def test_test1(self):
+        rng = np.random.RandomState(7)
+        c = rng.uniform(-3., 3., (30, 3))
+        r = rng.uniform(0.1, 1.5, 30)
+        boxes = []
+        for x in rng.uniform(-3., 3., (30, 3)):
+            b = Box(x, x + rng.uniform(0.2, 2., 3))
+            b.rotation = create_rotation_Z(rng.uniform(0., 90.))
+            boxes.append(b)
+        corners = np.array([b.corners for b in boxes])
+        planes = [create_xy_plane(z) for z in rng.uniform(-3., 3., 10)] + \
+            [create_yz_plane(x) for x in rng.uniform(-3., 3., 10)] + \
+            [create_xy_plane(1.), create_xy_plane(1.)]
+        planes[-1].rotation = create_rotation_Z(30.)
+        eq = plane_equations(planes)
+
+        i, j = np.meshgrid(np.arange(30), np.arange(30), indexing='ij')
+        self.assertEqual(np.all(sphere_overlap_batch(c[i], r[i], c[j], r[j])
+                                == coll_spheres2spheres((c, r), (c, r))),
+                         True)
+
+        i, j = np.meshgrid(np.arange(30), np.arange(len(eq)), indexing='ij')
+        m = coll_spheres2planes(c, r, eq)
+        self.assertEqual(np.all(sphere_plane_overlap_batch(c[i], r[i], eq[j])
+                                == m), True)
+        self.assertEqual(np.any(m) and not np.all(m), True)
+        m = coll_boxes2planes(corners, eq)
+        self.assertEqual(np.all(box_plane_overlap_batch(corners[i], eq[j])
+                                == m), True)
+        self.assertEqual(np.any(m) and not np.all(m), True)
+
+        i, j = np.meshgrid(np.arange(len(eq)), np.arange(len(eq)),
+                           indexing='ij')
+        m = coll_planes2planes(eq, eq)
+        self.assertEqual(np.all(plane_overlap_batch(eq[i], eq[j]) == m),
+                         True)
+        self.assertEqual(m[-1, -2], True)
+        self.assertEqual(m[0, 1], False)
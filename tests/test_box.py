@@ -7,7 +7,9 @@ changed by: Oliver Cordes 2019-07-22
 
 """
 
-from pycollision.objects import Box
+from pycollision.objects import Box, Plane, box_corners
+from pycollision.planes import create_xy_plane
+from pycollision.rotation import create_rotation_Y, create_rotation_Z
 
 import numpy as np
 
@@ -46,6 +48,96 @@ class TestInit(unittest.TestCase):
 
         self.assertEqual(b1.get_volume(), 8.)
 
+    # bulk creation and analytic volume
+    def test_test16(self):
+        boxes = Box.from_arrays([[0, 0, 0], [1, 1, 1]],
+                                [[1, 2, 3], [2, 2, 2]])
+
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual(boxes[0]._volume, 6.)
+        ref = Box([0, 0, 0], [1, 2, 3])
+        self.assertEqual(np.all(boxes[0].corners == ref.corners), True)
+        self.assertEqual(boxes[0].has_collisions(boxes[1])['collision'],
+                         True)
+
+        with self.assertRaises(ValueError) as context:
+            Box.from_arrays([[0, 0, 0]], [[1, 1, 1], [2, 2, 2]])
+
+    def test_test15(self):
+        b1 = Box.from_center_extents([1, 1, 1], [1, 2, 3])
+
+        self.assertEqual(np.all(b1.position == [[0., -1., -2.],
+                                                [2., 3., 4.]]), True)
+        self.assertEqual(b1._volume, 48.)
+        self.assertEqual(np.isclose(b1.get_volume(center=b1.center), 48.),
+                         True)
+
+    # center, axes and half lengths
+    def test_test13(self):
+        b1 = Box([1, 2, 3], [3, 6, 9])
+        b1.translation = [1, 0, 0]
+
+        self.assertEqual(np.all(b1.center == np.array([3., 4., 6.])), True)
+        self.assertEqual(np.all(b1.axes == np.eye(3)), True)
+        self.assertEqual(np.all(b1.half_extents == np.array([1., 2., 3.])),
+                         True)
+
+    # cached corners, bounds and normals
+    def test_test14(self):
+        b1 = Box([0, 0, 0], [1, 2, 3])
+
+        c1 = b1.corners
+        self.assertEqual(c1.shape, (8, 3))
+        self.assertEqual(b1.corners is c1, True)
+
+        lower, upper = b1.bounds
+        self.assertEqual(np.all(lower == np.array([0., 0., 0.])), True)
+        self.assertEqual(np.all(upper == np.array([1., 2., 3.])), True)
+
+        # cached arrays are read-only
+        with self.assertRaises(ValueError) as context:
+            c1[0, 0] = 1.
+
+        # the cache is invalid after a transformation
+        b1.rotation = create_rotation_Z(90.)
+        c2 = b1.corners
+        self.assertEqual(c2 is c1, False)
+        lower, upper = b1.bounds
+        self.assertEqual(np.all(np.isclose(lower, [-2., 0., 0.])), True)
+        self.assertEqual(np.all(np.isclose(upper, [0., 1., 3.])), True)
+
+        n = b1.normals
+        self.assertEqual(np.all(np.isclose(n[2], [0., 1., 0.])), True)
+        self.assertEqual(np.all(np.isclose(n[5], [-1., 0., 0.])), True)
+
+    # oriented bounding box, all other geometry is derived from it
+    def test_test17(self):
+        x1 = np.array([2., 0., 0.])
+        x2 = np.array([0., 1., 3.])
+        b1 = Box(x1, x2)
+        b1.rotation = create_rotation_Y(30.)
+        b1.translation = [1, 2, 3]
+
+        obb = b1.obb
+        self.assertEqual(b1.obb is obb, True)
+        self.assertEqual(np.all(obb.half_extents == [1., 0.5, 1.5]), True)
+        self.assertEqual(np.all(np.isclose(obb.axes, b1.rotation)), True)
+
+        ref = b1.calculate_positions(box_corners(x1, x2))
+        self.assertEqual(np.all(np.isclose(b1.corners, ref)), True)
+        lower, upper = b1.bounds
+        self.assertEqual(np.all(np.isclose(lower, ref.min(axis=0))), True)
+        self.assertEqual(np.all(np.isclose(upper, ref.max(axis=0))), True)
+        self.assertEqual(np.all(np.isclose(b1.edges[4][1], ref[4])), True)
+        self.assertEqual(b1.get_volume(), 6.)
+        self.assertEqual(np.isclose(b1.get_volume(center=obb.center), 6.),
+                         True)
+
+        # the rotation of the position is not frozen by the cache
+        b1.rotation = create_rotation_Y(-30.)
+        self.assertEqual(np.all(np.isclose(b1.axes, np.eye(3))), True)
+        self.assertEqual(b1.obb is obb, False)
+
 
 class TestCollision(unittest.TestCase):
     # test 2 boxes without collision
@@ -130,6 +222,121 @@ class TestCollision(unittest.TestCase):
 
         self.assertEqual(result['collision'], False)
 
+    # edge-edge collision, no corner is inside the other box
+    def test_test8(self):
+        b1 = Box([-1, -1, -1], [1, 1, 1])
+        b2 = Box([-1, -1, -1], [1, 1, 1])
+        b1.rotation = create_rotation_Y(45.)
+        b2.rotation = create_rotation_Z(45.)
+        b2.translation = [2.8, 0, 0]
+
+        result = b1.has_collisions(b2)
+
+        self.assertEqual(result['collision'], True)
+
+        b2.translation = [0.1, 0, 0]
+
+        result = b1.has_collisions(b2)
+
+        self.assertEqual(result['collision'], False)
+
+    # penetration depth and axis
+    def test_test9(self):
+        b1 = Box([0, 0, 0], [1, 1, 1])
+        b2 = Box([0, 0, 0], [1, 1, 1])
+        b2.translation = [0.75, 0.1, 0]
+
+        result = b1.has_collisions(b2, penetration=True)
+
+        self.assertEqual(result['collision'], True)
+        self.assertEqual(np.isclose(result['depth'], 0.25), True)
+        self.assertEqual(np.all(np.isclose(result['axis'], [1., 0., 0.])),
+                         True)
+
+        # calculated on demand without the penetration flag
+        result = b1.has_collisions(b2)
+
+        self.assertEqual('depth' in result, True)
+        self.assertEqual(np.isclose(result['depth'], 0.25), True)
+        self.assertEqual(np.all(np.isclose(result['axis'], [1., 0., 0.])),
+                         True)
+
+    # rotated box in a corner of another box
+    def test_test10(self):
+        b1 = Box([0, 0, 0], [1, 1, 1])
+        b2 = Box([-0.5, -0.5, -0.5], [0.5, 0.5, 0.5])
+        b2.rotation = create_rotation_Z(45.)
+        b2.translation = [1.7, 1.7, 0.5]
+
+        result = b1.has_collisions(b2)
+
+        self.assertEqual(result['collision'], False)
+
+        b2.translation = [-0.5, -0.5, 0.]
+
+        result = b1.has_collisions(b2)
+
+        self.assertEqual(result['collision'], True)
+
+    # box and plane, both sides and the square cut
+    def test_test11(self):
+        b1 = Box([0, 0, 0], [1, 1, 1])
+
+        for d in [-0.5, 1.5, -1.5]:
+            result = b1.has_collisions(create_xy_plane(d))
+            self.assertEqual(result['collision'], False)
+
+        result = b1.has_collisions(create_xy_plane(0.5))
+        self.assertEqual(result['collision'], True)
+        self.assertEqual(result['intersection'], 'polygon')
+        polygon = result['intersection_params']
+        self.assertEqual(polygon.shape, (4, 3))
+        self.assertEqual(np.all(np.isclose(polygon[:, 2], 0.5)), True)
+        self.assertEqual(np.all(np.isclose(np.sort(polygon[:, 0]),
+                                           [0, 0, 1, 1])), True)
+        # neighbours in the polygon share one coordinate
+        for i in range(4):
+            diff = np.abs(polygon[i] - polygon[i-1])
+            self.assertEqual(np.isclose(diff.sum(), 1.), True)
+
+    # the cut through a corner is a triangle, a face on the plane
+    def test_test12(self):
+        b1 = Box([0, 0, 0], [1, 1, 1])
+        p1 = Plane([1, 1, 1], 0.5/np.sqrt(3.))
+
+        result = b1.has_collisions(p1)
+        self.assertEqual(result['collision'], True)
+        polygon = result['intersection_params']
+        self.assertEqual(polygon.shape, (3, 3))
+        self.assertEqual(np.all(np.isclose(polygon.sum(axis=1), 0.5)), True)
+
+        # the face of the box lies in the plane
+        result = b1.has_collisions(create_xy_plane(1.))
+        self.assertEqual(result['collision'], True)
+        self.assertEqual(result['intersection_params'].shape, (4, 3))
+
+        result = b1.has_collisions(create_xy_plane(1.+1e-6), atol=1e-5)
+        self.assertEqual(result['collision'], True)
+
+        result = b1.has_collisions(create_xy_plane(1.+1e-6), atol=1e-8)
+        self.assertEqual(result['collision'], False)
+
+    # point containment in local coordinates
+    def test_test13(self):
+        b1 = Box([0, 0, 0], [2, 1, 1])
+        b1.rotation = create_rotation_Z(90.)
+        b1.translation = [1, 0, 0]
+        points = np.array([[0.5, 1.5, 0.5], [1.5, 1.5, 0.5],
+                           [0., 2., 1.], [0.5, -0.5, 0.5]])
+
+        mask = b1.contains(points)
+
+        self.assertEqual(np.all(mask == [True, False, True, False]), True)
+        # agrees with the volume test
+        for p, inside in zip(points, mask):
+            self.assertEqual(np.isclose(b1.get_volume(center=p), 2.),
+                             inside)
+
     # test of collision with not collision objects
     def test_test100(self):
         b1 = Box([0, 0, 0], [1, 1, 1])
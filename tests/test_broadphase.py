@@ -0,0 +1,243 @@
+"""
+
+tests/test_broadphase.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.broadphase import BroadPhase, SpatialHashGrid, \
+                                   SweepAndPrune
+
+from helpers import brute_force_pairs, random_bounds
+
+
+import time
+import unittest
+
+import numpy as np
+
+
+class TestBroadPhase(unittest.TestCase):
+    # abstract base class, subclasses need to implement pairs
+    def test_test1(self):
+        class NoPairs(BroadPhase):
+            pass
+
+        class AllPairs(BroadPhase):
+            def pairs(self):
+                return sorted((i, j) for i in self._bounds
+                              for j in self._bounds
+                              if i < j and self.overlap(i, j))
+
+        with self.assertRaises(TypeError) as context:
+            BroadPhase()
+        with self.assertRaises(TypeError) as context:
+            NoPairs()
+
+        bp = AllPairs()
+        for i, (lower, upper) in enumerate(random_bounds(20)):
+            bp.insert(i, lower, upper)
+        self.assertEqual(bp.pairs(), brute_force_pairs(random_bounds(20)))
+
+
+class TestSpatialHashGrid(unittest.TestCase):
+    # two overlapping boxes
+    def test_test1(self):
+        grid = SpatialHashGrid(cell_size=2.)
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+        grid.insert(1, [0.5, 0.5, 0.5], [3., 3., 3.])
+        grid.insert(2, [10., 10., 10.], [11., 11., 11.])
+
+        self.assertEqual(grid.pairs(), [(0, 1)])
+
+    # touching boxes in different cells
+    def test_test2(self):
+        grid = SpatialHashGrid(cell_size=1.)
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+        grid.insert(1, [1., 0., 0.], [2., 1., 1.])
+
+        self.assertEqual(grid.pairs(), [(0, 1)])
+
+    # same cell, but no overlap
+    def test_test3(self):
+        grid = SpatialHashGrid(cell_size=10.)
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+        grid.insert(1, [2., 0., 0.], [3., 1., 1.])
+
+        self.assertEqual(grid.pairs(), [])
+
+    # infinite bounding boxes
+    def test_test4(self):
+        grid = SpatialHashGrid(cell_size=1.)
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+        grid.insert(1, [5., 5., 5.], [6., 6., 6.])
+        grid.insert(2, np.full(3, -np.inf), np.full(3, np.inf))
+
+        self.assertEqual(grid.pairs(), [(0, 2), (1, 2)])
+
+    # comparison with brute force, automatic cell size
+    def test_test5(self):
+        bounds = random_bounds(200)
+        grid = SpatialHashGrid()
+        for i, (lower, upper) in enumerate(bounds):
+            grid.insert(i, lower, upper)
+
+        self.assertEqual(grid.pairs(), brute_force_pairs(bounds))
+
+    # comparison with brute force, small cells and large objects
+    def test_test6(self):
+        bounds = random_bounds(100)
+        grid = SpatialHashGrid(cell_size=0.2, max_cells=8)
+        for i, (lower, upper) in enumerate(bounds):
+            grid.insert(i, lower, upper)
+
+        self.assertEqual(grid.pairs(), brute_force_pairs(bounds))
+
+    # update and remove
+    def test_test7(self):
+        grid = SpatialHashGrid(cell_size=2.)
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+        grid.insert(1, [10., 0., 0.], [11., 1., 1.])
+        self.assertEqual(grid.pairs(), [])
+
+        grid.update(1, [0.5, 0., 0.], [1.5, 1., 1.])
+        self.assertEqual(grid.pairs(), [(0, 1)])
+
+        grid.remove(0)
+        self.assertEqual(grid.pairs(), [])
+        self.assertEqual(len(grid), 1)
+
+    # errors
+    def test_test100(self):
+        grid = SpatialHashGrid()
+        grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+
+        with self.assertRaises(KeyError) as context:
+            grid.insert(0, [0., 0., 0.], [1., 1., 1.])
+
+        with self.assertRaises(KeyError) as context:
+            grid.update(1, [0., 0., 0.], [1., 1., 1.])
+
+        with self.assertRaises(ValueError) as context:
+            grid = SpatialHashGrid(cell_size=-1.)
+
+
+class TestSweepAndPrune(unittest.TestCase):
+    # two boxes moving into each other
+    def test_test1(self):
+        sap = SweepAndPrune()
+        sap.insert(0, [0., 0., 0.], [1., 1., 1.])
+        sap.insert(1, [2., 0., 0.], [3., 1., 1.])
+        self.assertEqual(sap.pairs(), [])
+
+        sap.update(1, [0.5, 0., 0.], [1.5, 1., 1.])
+        self.assertEqual(sap.pairs(), [(0, 1)])
+
+        sap.update(1, [0.5, 2., 0.], [1.5, 3., 1.])
+        self.assertEqual(sap.pairs(), [])
+
+    # touching boxes
+    def test_test2(self):
+        sap = SweepAndPrune()
+        sap.insert(0, [0., 0., 0.], [1., 1., 1.])
+        sap.insert(1, [1., 0., 0.], [2., 1., 1.])
+
+        self.assertEqual(sap.pairs(), [(0, 1)])
+
+    # infinite bounding boxes
+    def test_test3(self):
+        sap = SweepAndPrune()
+        sap.insert(0, [0., 0., 0.], [1., 1., 1.])
+        sap.insert(1, np.full(3, -np.inf), np.full(3, np.inf))
+        sap.insert(2, np.full(3, -np.inf), np.full(3, np.inf))
+
+        self.assertEqual(sap.pairs(), [(0, 1), (0, 2), (1, 2)])
+
+    # moving objects over many steps compared with brute force
+    def test_test4(self):
+        rng = np.random.RandomState(7)
+        bounds = random_bounds(60)
+        sap = SweepAndPrune()
+        for i, (lower, upper) in enumerate(bounds):
+            sap.insert(i, lower, upper)
+
+        for step in range(20):
+            self.assertEqual(sap.pairs(), brute_force_pairs(bounds))
+
+            for i in range(len(bounds)):
+                d = rng.uniform(-0.3, 0.3, 3)
+                bounds[i] = (bounds[i][0] + d, bounds[i][1] + d)
+                sap.update(i, bounds[i][0], bounds[i][1])
+
+    # no movement, no swaps
+    def test_test5(self):
+        bounds = random_bounds(30)
+        sap = SweepAndPrune()
+        for i, (lower, upper) in enumerate(bounds):
+            sap.insert(i, lower, upper)
+        sap.pairs()
+
+        pairs = sap.pairs()
+
+        self.assertEqual(sap.swaps, 0)
+        self.assertEqual(pairs, brute_force_pairs(bounds))
+
+    # remove and insert during the simulation
+    def test_test6(self):
+        bounds = random_bounds(40)
+        sap = SweepAndPrune()
+        for i, (lower, upper) in enumerate(bounds):
+            sap.insert(i, lower, upper)
+        sap.pairs()
+
+        sap.remove(3)
+        sap.remove(17)
+        del bounds[17]
+        del bounds[3]
+        sap.insert(100, [5., 5., 5.], [10., 10., 10.])
+        bounds.append((np.array([5., 5., 5.]), np.array([10., 10., 10.])))
+
+        ids = [i for i in range(40) if i not in (3, 17)] + [100]
+        pairs_cmp = [(ids[i], ids[j]) for i, j in brute_force_pairs(bounds)]
+
+        self.assertEqual(sap.pairs(), sorted(pairs_cmp))
+
+    # bulk build of many objects within a time budget
+    def test_test7(self):
+        rng = np.random.RandomState(3)
+        lower = rng.uniform(0., 60., (3000, 3))
+        upper = lower + rng.uniform(0.1, 2., (3000, 3))
+
+        start = time.time()
+        sap = SweepAndPrune()
+        for i in range(len(lower)):
+            sap.insert(i, lower[i], upper[i])
+        pairs = sap.pairs()
+        self.assertLess(time.time() - start, 2.)
+
+        # brute force with arrays
+        mask = np.all(lower[:, None] <= upper[None] + 1e-8, axis=2) & \
+            np.all(lower[None] <= upper[:, None] + 1e-8, axis=2)
+        i, j = np.nonzero(np.triu(mask, 1))
+        self.assertEqual(pairs, list(zip(i.tolist(), j.tolist())))
+
+    # new objects updated or removed before they are merged
+    def test_test8(self):
+        bounds = random_bounds(30)
+        sap = SweepAndPrune()
+        for i, (lower, upper) in enumerate(bounds[:20]):
+            sap.insert(i, lower, upper)
+        sap.pairs()
+
+        for i, (lower, upper) in enumerate(bounds[20:], 20):
+            sap.insert(i, [50., 50., 50.], [51., 51., 51.])
+            sap.update(i, lower, upper)
+        sap.insert(99, [0., 0., 0.], [20., 20., 20.])
+        sap.remove(99)
+        d = np.array([0.2, -0.1, 0.3])
+        bounds[5] = (bounds[5][0] + d, bounds[5][1] + d)
+        sap.update(5, bounds[5][0], bounds[5][1])
+
+        self.assertEqual(sap.pairs(), brute_force_pairs(bounds))
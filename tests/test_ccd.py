@@ -0,0 +1,193 @@
+"""
+
+tests/test_ccd.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_xy_plane
+from pycollision.rotation import create_rotation_Z
+from pycollision.ccd import Motion, time_of_impact
+from pycollision.distance import distance
+
+
+import unittest
+
+import numpy as np
+
+
+def domino():
+    # the box of the box demo which rotates around its edge at x=1
+    b = Box([0, 0, 0], [1, 1, 1])
+    b.translation = [-1, 0, 0]
+    b.post_translation = [1, 0, 0]
+    return b
+
+
+class TestMotion(unittest.TestCase):
+    # motion between two transformations
+    def test_test1(self):
+        b1 = Box([0, 0, 0], [2, 2, 2])
+        b2 = Box([0, 0, 0], [2, 2, 2])
+        b2.rotation = create_rotation_Z(90.)
+        b2.translation = [5, 0, 0]
+
+        m = Motion.from_transforms(b1, b2)
+        self.assertEqual(np.all(np.isclose(m.pivot, [1., 1., 1.])), True)
+        self.assertEqual(np.all(np.isclose(m.angular, [0., 0., np.pi/2.])),
+                         True)
+
+        m.apply(b1, 1.)
+        self.assertEqual(np.all(np.isclose(b1.corners, b2.corners)), True)
+
+    # rotation around a pivot
+    def test_test2(self):
+        b = domino()
+        m = Motion(angular=[0, 0, -np.pi/2.], pivot=[1, 0, 0])
+        m.apply(b, 1.)
+
+        lower, upper = b.bounds
+        self.assertEqual(np.all(np.isclose(lower, [1., 0., 0.])), True)
+        self.assertEqual(np.all(np.isclose(upper, [2., 1., 1.])), True)
+
+
+class TestTimeOfImpact(unittest.TestCase):
+    # moving spheres
+    def test_test1(self):
+        s1 = Sphere([0, 0, 0], 1.)
+        s2 = Sphere([10, 0, 0], 1.)
+
+        t = time_of_impact(s1, s2, Motion(linear=[10, 0, 0]))
+        self.assertEqual(np.isclose(t, 0.8), True)
+        t = time_of_impact(s1, s2, Motion(linear=[5, 0, 0]),
+                           Motion(linear=[-5, 0, 0]), dt=2.)
+        self.assertEqual(np.isclose(t, 0.8), True)
+
+        # too slow, missed and wrong direction
+        self.assertEqual(time_of_impact(s1, s2, Motion(linear=[5, 0, 0])),
+                         None)
+        self.assertEqual(time_of_impact(s1, s2, Motion(linear=[10, 5, 0])),
+                         None)
+        self.assertEqual(time_of_impact(s1, s2, Motion(linear=[-10, 0, 0])),
+                         None)
+
+        # colliding at the start
+        self.assertEqual(time_of_impact(s1, Sphere([1, 0, 0], 1.)), 0.)
+
+    # spheres and planes, no tunneling through the plane
+    def test_test2(self):
+        s = Sphere([0, 0, 0], 1.)
+        p = create_xy_plane(5.)
+
+        t = time_of_impact(s, p, Motion(linear=[0, 0, 100]))
+        self.assertEqual(np.isclose(t, 0.04), True)
+        t = time_of_impact(p, s, Motion(linear=[0, 0, -8]))
+        self.assertEqual(np.isclose(t, 0.5), True)
+        self.assertEqual(time_of_impact(s, p, Motion(linear=[0, 0, -100])),
+                         None)
+
+        with self.assertRaises(ValueError) as context:
+            time_of_impact(s, p, None, Motion(angular=[1, 0, 0]))
+
+    # the contact angle of the box demo
+    def test_test3(self):
+        b2 = Box([0, 0, 0], [1, 1, 1])
+        b2.translation = [1.5, 0, 0]
+        m = Motion(angular=[0, 0, -np.pi/2.], pivot=[1, 0, 0])
+
+        t = time_of_impact(domino(), b2, m, atol=1e-10)
+        self.assertEqual(np.isclose(t * 90., 30., atol=1e-6), True)
+
+        b1 = domino()
+        m.apply(b1, t - 1e-3)
+        self.assertEqual(b1.intersects(b2), False)
+        m.apply(b1, 2e-3)
+        self.assertEqual(b1.intersects(b2), True)
+
+    # moving boxes and planes
+    def test_test4(self):
+        b1 = Box([-1, -1, -1], [1, 1, 1])
+        b2 = Box([4, -1, -1], [6, 1, 1])
+
+        t = time_of_impact(b1, b2, Motion(linear=[6, 0, 0]))
+        self.assertEqual(np.isclose(t, 0.5), True)
+        self.assertEqual(time_of_impact(b1, b2, Motion(linear=[6, 5, 0])),
+                         None)
+
+        p = create_xy_plane(5.)
+        t = time_of_impact(b1, p, Motion(linear=[0, 0, 8]))
+        self.assertEqual(np.isclose(t, 0.5), True)
+        t = time_of_impact(b1, p, Motion(angular=[0, np.pi/2., 0],
+                                         pivot=[1, 0, 4]))
+        self.assertEqual(t is not None and 0. < t < 1., True)
+
+    # unknown pairs
+    def test_test5(self):
+        with self.assertRaises(ValueError) as context:
+            time_of_impact(create_xy_plane(0.), create_xy_plane(1.))
+
+    # spheres orbiting around a pivot outside the center
+    def test_test6(self):
+        s1 = Sphere([5, 0, 0], .5)
+        s2 = Sphere([0, 5, 0], .5)
+        m = Motion(angular=[0, 0, np.pi], pivot=[0, 0, 0])
+
+        # the centers have the distance 1 at the angle pi/2 - 2 asin(0.1)
+        t = time_of_impact(s1, s2, m, atol=1e-10)
+        t_cmp = (np.pi/2. - 2. * np.arcsin(0.1)) / np.pi
+        self.assertEqual(np.isclose(t, t_cmp, atol=1e-6), True)
+        self.assertEqual(np.isclose(time_of_impact(s2, s1, None, m,
+                                                   atol=1e-10), t), True)
+
+        # the rotation around the center doesn't move a sphere
+        m = Motion(angular=[0, 0, np.pi], pivot=[5, 0, 0])
+        self.assertEqual(time_of_impact(s1, s2, m), None)
+
+        # the sphere rotates around y from z=3 down through the plane
+        s = Sphere([5, 0, 3], .5)
+        m = Motion(angular=[0, np.pi/2., 0], pivot=[0, 0, 0])
+        t = time_of_impact(s, create_xy_plane(0.), m, atol=1e-10)
+        angle = np.arccos(.5 / np.sqrt(34.)) - np.arctan2(5., 3.)
+        self.assertEqual(np.isclose(t, angle / (np.pi/2.), atol=1e-6), True)
+
+    # spheres and boxes
+    def test_test7(self):
+        s = Sphere([0, 0, 0], 1.)
+        b = Box([3, -1, -1], [5, 1, 1])
+
+        t = time_of_impact(s, b, Motion(linear=[4, 0, 0]), atol=1e-10)
+        self.assertEqual(np.isclose(t, 0.5, atol=1e-6), True)
+        t = time_of_impact(b, s, Motion(linear=[-4, 0, 0]), atol=1e-10)
+        self.assertEqual(np.isclose(t, 0.5, atol=1e-6), True)
+        self.assertEqual(time_of_impact(s, b, Motion(linear=[4, 4, 0])),
+                         None)
+        self.assertEqual(time_of_impact(Sphere([4, 0, 0], .5), b), 0.)
+
+        # a sphere orbiting into the box
+        s = Sphere([0, 4, 0], .5)
+        m = Motion(angular=[0, 0, -np.pi/2.], pivot=[0, 0, 0])
+        t = time_of_impact(s, b, m, atol=1e-10)
+        self.assertEqual(t is not None and 0. < t < 1., True)
+        s2 = Sphere([0, 4, 0], .5)
+        m.apply(s2, t + 1e-3)
+        self.assertLess(distance(s2, b)[0], 0.)
+        m.apply(s, t - 1e-3)
+        self.assertGreater(distance(s, b)[0], 0.)
+
+    # the conservative advancement runs out of iterations
+    def test_test8(self):
+        b1 = Box([-1, -1, -1], [1, 1, 1])
+        b2 = Box([9, -1, -1], [11, 1, 1])
+        m = Motion(angular=[0, 0, 4. * np.pi])
+
+        self.assertEqual(time_of_impact(b1, b2, m), None)
+        self.assertEqual(time_of_impact(b1, b2, m, max_iterations=3), None)
+
+        # an approaching box is found with enough iterations only
+        m = Motion(linear=[8, 0, 0], angular=[0, 0, 4. * np.pi])
+        self.assertEqual(time_of_impact(b1, b2, m, max_iterations=2), None)
+        t = time_of_impact(b1, b2, m)
+        self.assertEqual(t is not None and 0. < t < 1., True)
@@ -0,0 +1,265 @@
+"""
+
+tests/test_collision.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.collision import CollisionResult, register_collision, \
+                                  unregister_collision, \
+                                  find_collision_procedure, \
+                                  coll_sphere2sphere, coll_sphere2plane, \
+                                  intersects, register_intersection, \
+                                  unregister_intersection
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_xy_plane
+from pycollision.batch import intersects_matrix
+
+
+import unittest
+
+import numpy as np
+
+
+def coll_sphere2box(sphere, box, **kwargs):
+    result = CollisionResult()
+    result['collision'] = True
+    result['order'] = (sphere.__class__.__name__, box.__class__.__name__)
+    return result
+
+
+class MySphere(Sphere):
+    pass
+
+
+class GhostSphere(Sphere):
+    pass
+
+
+class TestRegistry(unittest.TestCase):
+    def tearDown(self):
+        try:
+            unregister_collision(Sphere, Box)
+        except KeyError:
+            pass
+
+    # builtin functions
+    def test_test1(self):
+        s = Sphere([0, 0, 0], 1.)
+        p = create_xy_plane(0.)
+
+        self.assertEqual(find_collision_procedure(s, s),
+                         (coll_sphere2sphere, False))
+        self.assertEqual(find_collision_procedure(s, p),
+                         (coll_sphere2plane, False))
+        self.assertEqual(find_collision_procedure(p, s),
+                         (coll_sphere2plane, True))
+        self.assertEqual(find_collision_procedure(s, 1), None)
+
+    # subclasses use the functions of the base classes
+    def test_test2(self):
+        s1 = MySphere([0, 0, 0], 1.)
+        s2 = Sphere([1, 0, 0], 1.)
+
+        self.assertEqual(find_collision_procedure(s1, s2),
+                         (coll_sphere2sphere, False))
+        self.assertEqual(s2.has_collisions(s1)['collision'], True)
+
+    # register a new symmetric function
+    def test_test3(self):
+        s = Sphere([0, 0, 0], 1.)
+        b = Box([0, 0, 0], [1, 1, 1])
+
+        with self.assertRaises(ValueError) as context:
+            result = b.has_collisions(s)
+
+        register_collision(Sphere, Box)(coll_sphere2box)
+
+        self.assertEqual(s.has_collisions(b)['order'], ('Sphere', 'Box'))
+        self.assertEqual(b.has_collisions(s)['order'], ('Sphere', 'Box'))
+
+        unregister_collision(Sphere, Box)
+
+        with self.assertRaises(ValueError) as context:
+            result = s.has_collisions(b)
+
+    # register a function only for one order
+    def test_test4(self):
+        s = Sphere([0, 0, 0], 1.)
+        b = Box([0, 0, 0], [1, 1, 1])
+
+        register_collision(Sphere, Box, symmetric=False)(coll_sphere2box)
+
+        self.assertEqual(s.has_collisions(b)['collision'], True)
+        with self.assertRaises(ValueError) as context:
+            result = b.has_collisions(s)
+
+    # the decorator returns the function
+    def test_test5(self):
+        @register_collision(Sphere, Box)
+        def func(sphere, box, **kwargs):
+            return coll_sphere2box(sphere, box, **kwargs)
+
+        self.assertEqual(callable(func), True)
+        self.assertEqual(find_collision_procedure(Box([0, 0, 0],
+                                                      [1, 1, 1]),
+                                                  Sphere([0, 0, 0], 1.)),
+                         (func, True))
+
+
+class TestCollisionResult(unittest.TestCase):
+    # deferred values are calculated only once on access
+    def test_test1(self):
+        calls = []
+
+        def func():
+            calls.append(1)
+            return 5.
+
+        result = CollisionResult(True)
+        result.defer('distance', func)
+        self.assertEqual('distance' in result, True)
+        self.assertEqual(len(calls), 0)
+        self.assertEqual(result['distance'], 5.)
+        self.assertEqual(result['distance'], 5.)
+        self.assertEqual(len(calls), 1)
+
+    # items and str evaluate all deferred values
+    def test_test2(self):
+        result = CollisionResult(False)
+        result.defer('distance', lambda: 2.)
+        self.assertEqual(dict(result.items()), {'distance': 2.})
+        self.assertEqual(str(result),
+                         '{collision: False, data: {\'distance\': 2.0}}')
+
+    # slots, no instance dictionary
+    def test_test3(self):
+        result = CollisionResult()
+        with self.assertRaises(AttributeError) as context:
+            result.foo = 1
+        with self.assertRaises(KeyError) as context:
+            result['foo']
+
+    # grouped deferred values share one call, set values win
+    def test_test4(self):
+        calls = []
+
+        def func():
+            calls.append(1)
+            return 1., 2.
+
+        result = CollisionResult(True)
+        result.defer(('depth', 'axis'), func)
+        result['depth'] = 3.
+        self.assertEqual(result['axis'], 2.)
+        self.assertEqual(result['depth'], 3.)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(dict(result.items()), {'depth': 3., 'axis': 2.})
+
+
+class TestIntersects(unittest.TestCase):
+    # boolean results agree with the collision functions
+    def test_test1(self):
+        objs = [Sphere([0, 0, 0], 1.), Sphere([2, 0, 0], 1.),
+                Sphere([2.5, 0, 0], 0.4), Box([-1, -1, 1], [1, 1, 3]),
+                Box([3, 3, 3], [4, 4, 4]), create_xy_plane(0.5),
+                create_xy_plane(3.5)]
+
+        for a in objs:
+            for b in objs:
+                if find_collision_procedure(a, b) is None:
+                    continue
+                result = a.has_collisions(b)
+                self.assertEqual(intersects(a, b), result['collision'])
+                self.assertEqual(a.intersects(b), result['collision'])
+                self.assertEqual(type(intersects(a, b)), bool)
+
+    # boxes and planes
+    def test_test6(self):
+        b = Box([-1, -1, 1], [1, 1, 3])
+        self.assertEqual(intersects(b, create_xy_plane(2.)), True)
+        self.assertEqual(intersects(create_xy_plane(3.), b), True)
+        self.assertEqual(intersects(b, create_xy_plane(0.5)), False)
+        self.assertEqual(intersects(b, create_xy_plane(3.5)), False)
+
+    # touching spheres
+    def test_test2(self):
+        s1 = Sphere([0, 0, 0], 1.)
+        s2 = Sphere([2.+1e-9, 0, 0], 1.)
+        self.assertEqual(intersects(s1, s2), True)
+        self.assertEqual(intersects(s1, s2, atol=1e-10), False)
+
+    # unknown pairs
+    def test_test3(self):
+        with self.assertRaises(ValueError) as context:
+            intersects(Sphere([0, 0, 0], 1.), Box([0, 0, 0], [1, 1, 1]))
+
+    # fallback to registered collision functions
+    def test_test4(self):
+        s = Sphere([0, 0, 0], 1.)
+        b = Box([0, 0, 0], [1, 1, 1])
+        register_collision(Sphere, Box)(coll_sphere2box)
+        try:
+            self.assertEqual(intersects(b, s), True)
+            self.assertEqual(intersects_matrix([s], [b])[0, 0], True)
+        finally:
+            unregister_collision(Sphere, Box)
+
+    # batch version
+    def test_test5(self):
+        spheres = [Sphere([0, 0, 0], 1.), create_xy_plane(0.5),
+                   Sphere([2, 0, 0], 1.), create_xy_plane(3.5),
+                   Sphere([2.5, 0, 0], 0.4)]
+        boxes = [Box([-1, -1, 1], [1, 1, 3]), create_xy_plane(0.5),
+                 Box([3, 3, 3], [4, 4, 4]), Box([0, 0, 2.5], [2, 2, 4]),
+                 create_xy_plane(3.5)]
+
+        for objs in (spheres, boxes):
+            n = len(objs)
+            expected = np.zeros((n, n), dtype=bool)
+            for i in range(n):
+                for j in range(n):
+                    expected[i, j] = intersects(objs[i], objs[j])
+
+            self.assertEqual(np.all(intersects_matrix(objs, objs) ==
+                                    expected), True)
+            self.assertEqual(np.all(intersects_matrix(objs) ==
+                                    np.triu(expected, k=1)), True)
+
+        # mixed lists, pairs without a procedure are False
+        m = intersects_matrix(spheres, boxes)
+        for i, a in enumerate(spheres):
+            for j, b in enumerate(boxes):
+                if isinstance(a, Sphere) and isinstance(b, Box):
+                    self.assertEqual(m[i, j], False)
+                else:
+                    self.assertEqual(m[i, j], intersects(a, b))
+        objs = [Sphere([0., 0., 0.], 1.), Box([-1., -1., 1.], [1., 1., 3.]),
+                create_xy_plane(1.)]
+        self.assertEqual(np.all(intersects_matrix(objs) ==
+                                [[False, False, True], [False, False, True],
+                                 [False, False, False]]), True)
+
+    # subclasses with own intersection functions
+    def test_test7(self):
+        def ghost(obj1, obj2, atol):
+            return False
+
+        objs = [GhostSphere([0, 0, 0], 1.), GhostSphere([1, 0, 0], 1.),
+                Sphere([0, 1, 0], 1.), MySphere([1, 1, 0], 1.),
+                create_xy_plane(0.)]
+        register_intersection(GhostSphere, Sphere)(ghost)
+        try:
+            expected = np.zeros((5, 5), dtype=bool)
+            for i in range(5):
+                for j in range(5):
+                    expected[i, j] = intersects(objs[i], objs[j])
+            self.assertEqual(expected[0, 1], False)
+            self.assertEqual(np.all(intersects_matrix(objs, objs) ==
+                                    expected), True)
+            self.assertEqual(np.all(intersects_matrix(objs) ==
+                                    np.triu(expected, k=1)), True)
+        finally:
+            unregister_intersection(GhostSphere, Sphere)
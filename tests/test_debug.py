@@ -3,17 +3,21 @@
 tests/test_debug.py
 
 written by: Oliver Cordes 2019-07-22
-changed by: Oliver Cordes 2019-07-22
+changed by: Oliver Cordes 2026-10-18
 
 """
 
-from pycollision.debug import debug
+from pycollision.debug import debug, debug_enabled, set_debug
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_xy_plane
+from pycollision.scene import Scene
 
 
 import unittest
 from unittest import mock
 from unittest.mock import patch
 import io
+import logging
 
 
 class TestDebug(unittest.TestCase):
@@ -34,3 +38,76 @@ class TestDebug(unittest.TestCase):
             debug(42, 'the answer')
 
         self.assertEqual(fake_stdout.getvalue(), 'DEBUG: 42 the answer\n')
+
+
+class TestDebugSwitch(unittest.TestCase):
+    def tearDown(self):
+        set_debug(False, use_logging=False, level=logging.DEBUG)
+
+    # global switch
+    def test_test1(self):
+        self.assertEqual(debug_enabled(), False)
+        self.assertEqual(debug_enabled(True), True)
+        set_debug()
+        self.assertEqual(debug_enabled(), True)
+        set_debug(False)
+        self.assertEqual(debug_enabled(), False)
+
+    # no output without verbose objects
+    def test_test2(self):
+        b = Box([-1, -1, -1], [1, 1, 1])
+        p = create_xy_plane(0.)
+        with mock.patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            b.has_collisions(p)
+
+        self.assertEqual(fake_stdout.getvalue(), '')
+
+        with mock.patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            set_debug()
+            b.has_collisions(p)
+
+        self.assertEqual(fake_stdout.getvalue().startswith('DEBUG: '), True)
+
+    # verbose objects
+    def test_test3(self):
+        s1 = Sphere([0, 0, 0], 1., verbose=True)
+        s2 = Sphere([1, 0, 0], 1.)
+        with mock.patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            s2.has_collisions(s1)
+
+        self.assertEqual('DEBUG: calculating collision between two spheres'
+                         in fake_stdout.getvalue(), True)
+
+    # messages via logging
+    def test_test4(self):
+        set_debug(use_logging=True)
+        with mock.patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            with self.assertLogs('pycollision', level='DEBUG') as logs:
+                debug(42, 'the answer')
+
+        self.assertEqual(fake_stdout.getvalue(), '')
+        self.assertEqual(logs.output, ['DEBUG:pycollision:42 the answer'])
+
+    # levels of the global switch and of the messages
+    def test_test5(self):
+        set_debug(level=logging.INFO)
+        self.assertEqual(debug_enabled(), False)
+        self.assertEqual(debug_enabled(True), True)
+        self.assertEqual(debug_enabled(level=logging.INFO), True)
+
+        scene = Scene()
+        scene.add(Sphere([0, 0, 0], 1.))
+        scene.add(Sphere([1, 0, 0], 1.))
+        with mock.patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            scene.collisions()
+
+        lines = fake_stdout.getvalue().splitlines()
+        self.assertEqual(lines, ['INFO: scene: 2 objects, 1 candidate pairs',
+                                 'INFO: scene: 1 collisions'])
+
+        set_debug(use_logging=True, level=logging.DEBUG)
+        with self.assertLogs('pycollision', level='INFO') as logs:
+            debug('the answer', level=logging.WARNING)
+            debug('hidden')
+
+        self.assertEqual(logs.output, ['WARNING:pycollision:the answer'])
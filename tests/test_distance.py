@@ -0,0 +1,169 @@
+"""
+
+tests/test_distance.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_xy_plane, create_yz_plane
+from pycollision.rotation import create_rotation_matrix, create_rotation_Z
+from pycollision.distance import distance, distance_matrix, \
+                                 register_distance, _distance_registry
+
+
+import unittest
+
+import numpy as np
+
+
+class FarSphere(Sphere):
+    pass
+
+
+def objects():
+    b1 = Box([0, 0, 0], [1, 1, 1])
+    b2 = Box([2, 0.5, 0], [3, 1.5, 1])
+    b3 = Box([-0.5, -0.5, -0.5], [0.5, 0.5, 0.5])
+    b3.rotation = create_rotation_Z(45.)
+    b3.translation = [2.5, 2.5, 0.5]
+    return [b1, b2, b3, Sphere([0.5, 0.5, 3.], 1.), create_xy_plane(-1.),
+            create_yz_plane(0.), Sphere([0.5, 0.5, 0.5], 0.2)]
+
+
+class TestDistance(unittest.TestCase):
+    # separations and closest points of all pairs of types
+    def test_test1(self):
+        b1, b2, b3, s1, p1, p2, s2 = objects()
+
+        sep, q1, q2 = distance(b1, b2)
+        self.assertEqual(np.isclose(sep, 1.), True)
+        self.assertEqual(np.isclose(np.linalg.norm(q2 - q1), 1.), True)
+
+        # the tip of the rotated box
+        sep, q1, q2 = distance(b2, b3)
+        self.assertEqual(np.isclose(sep, 2.5 - np.sqrt(0.5) - 1.5), True)
+        self.assertEqual(np.all(np.isclose(q2, [2.5, 2.5 - np.sqrt(0.5),
+                                                0.])), True)
+
+        sep, q1, q2 = distance(s1, b1)
+        self.assertEqual(np.isclose(sep, 1.), True)
+        self.assertEqual(np.all(np.isclose(q1, [0.5, 0.5, 2.])), True)
+        self.assertEqual(np.all(np.isclose(q2, [0.5, 0.5, 1.])), True)
+
+        # overlapping objects have a negative separation
+        self.assertEqual(np.isclose(distance(s1, p2)[0], -0.5), True)
+        self.assertEqual(np.isclose(distance(s2, b1)[0], -0.7), True)
+        self.assertEqual(np.isclose(distance(b1, p2)[0], 0.), True)
+
+        sep, q1, q2 = distance(p1, b3)
+        self.assertEqual(np.isclose(sep, 1.), True)
+        self.assertEqual(np.isclose(q1[2], -1.), True)
+        self.assertEqual(np.isclose(q2[2], 0.), True)
+
+        self.assertEqual(distance(p1, p2)[0], 0.)
+        self.assertEqual(np.isclose(distance(p1, create_xy_plane(2.))[0],
+                                    3.), True)
+
+    # the threshold stops the query
+    def test_test2(self):
+        b1, b2, b3, s1, p1, p2, s2 = objects()
+
+        self.assertEqual(distance(b1, b2, max_distance=0.5), None)
+        self.assertEqual(distance(s1, p1, max_distance=0.5), None)
+        self.assertEqual(distance(b2, b3, max_distance=0.5) is None, False)
+
+        with self.assertRaises(ValueError) as context:
+            distance(b1, 1)
+
+    # random boxes, the closest points are on the boxes and the
+    # separating axis gap is a lower limit
+    def test_test3(self):
+        rng = np.random.RandomState(11)
+        for n in range(30):
+            boxes = []
+            for i in range(2):
+                b = Box([0, 0, 0], rng.uniform(0.5, 2., 3))
+                axis = rng.normal(size=3)
+                axis /= np.linalg.norm(axis)
+                b.rotation = create_rotation_matrix(axis,
+                                                    rng.uniform(0., 180.))
+                b.translation = rng.uniform(-2., 2., 3)
+                boxes.append(b)
+            sep, q1, q2 = distance(boxes[0], boxes[1])
+
+            self.assertEqual(boxes[0].contains(q1, atol=1e-6), True)
+            self.assertEqual(boxes[1].contains(q2, atol=1e-6), True)
+            if sep > 0.:
+                self.assertEqual(np.isclose(np.linalg.norm(q2 - q1), sep),
+                                 True)
+            self.assertEqual(sep <= 0., boxes[0].intersects(boxes[1]))
+
+
+class TestDistanceMatrix(unittest.TestCase):
+    # the matrix agrees with the single queries
+    def test_test1(self):
+        objs = objects()
+
+        m, q1, q2 = distance_matrix(objs)
+
+        self.assertEqual(q1.shape, (7, 7, 3))
+        for i, a in enumerate(objs):
+            for j, b in enumerate(objs):
+                sep, p1, p2 = distance(a, b)
+                self.assertEqual(np.isclose(m[i, j], sep), True)
+                self.assertEqual(np.all(np.isclose(q1[i, j], p1)), True)
+                self.assertEqual(np.all(np.isclose(q2[i, j], p2)), True)
+
+    # threshold and objects without a distance routine
+    def test_test2(self):
+        objs = objects()
+
+        m, q1, q2 = distance_matrix(objs[:3], objs + [1], max_distance=0.5)
+
+        self.assertEqual(m.shape, (3, 8))
+        self.assertEqual(np.isinf(m[0, 1]), True)
+        self.assertEqual(np.all(np.isnan(q1[0, 1])), True)
+        self.assertEqual(np.isclose(m[1, 2], 2.5 - np.sqrt(0.5) - 1.5), True)
+        self.assertEqual(np.all(np.isclose(q2[1, 2], [2.5, 2.5 - np.sqrt(0.5),
+                                                      0.])), True)
+        self.assertEqual(np.all(np.isnan(m[:, 7])), True)
+        self.assertEqual(np.all(np.isnan(q2[:, 7])), True)
+
+    # the threshold is the same for all types of pairs
+    def test_test3(self):
+        objs = objects()
+        m, q1, q2 = distance_matrix(objs)
+
+        for max_distance in [-0.6, 0., 0.5, 1., 2.]:
+            mt, qt1, qt2 = distance_matrix(objs, max_distance=max_distance)
+            near = m <= max_distance
+            self.assertEqual(np.all(np.isinf(mt[~near])), True)
+            self.assertEqual(np.all(np.isnan(qt1[~near])), True)
+            self.assertEqual(np.all(np.isclose(mt[near], m[near])), True)
+            self.assertEqual(np.all(np.isclose(qt1[near], q1[near])), True)
+            self.assertEqual(np.all(np.isclose(qt2[near], q2[near])), True)
+            for i, a in enumerate(objs):
+                for j, b in enumerate(objs):
+                    self.assertEqual(distance(a, b, max_distance) is None,
+                                     bool(np.isinf(mt[i, j])))
+
+    # subclasses with own distance functions
+    def test_test4(self):
+        def far(sphere, obj, max_distance):
+            return 100., sphere.position, sphere.position
+
+        objs = objects() + [FarSphere([0.5, 0.5, 0.5], 1.)]
+        register_distance(FarSphere, Sphere)(far)
+        try:
+            m, q1, q2 = distance_matrix(objs)
+            for i, a in enumerate(objs):
+                for j, b in enumerate(objs):
+                    self.assertEqual(np.isclose(m[i, j], distance(a, b)[0]),
+                                     True)
+            self.assertEqual(m[7, 6], 100.)
+            self.assertEqual(m[7, 0] < 0., True)
+        finally:
+            del _distance_registry[(FarSphere, Sphere)]
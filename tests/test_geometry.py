@@ -98,3 +98,43 @@ class Test_pyramid_volume(unittest.TestCase):
         center = np.array([-100, 3, 100])
 
         self.assertEqual(np.isclose(pyramid_volume(plane, center), 1.0), True)
+
+
+class Test_obb_overlap(unittest.TestCase):
+    # two axis aligned boxes
+    def test_test1(self):
+        axes = np.eye(3)
+        half = np.array([1., 1., 1.])
+
+        res = obb_overlap(np.zeros(3), axes, half,
+                          np.array([1.5, 0., 0.]), axes, half,
+                          penetration=True)
+
+        self.assertEqual(res[0], True)
+        self.assertEqual(np.isclose(res[1], 0.5), True)
+        self.assertEqual(np.all(np.isclose(res[2], [1., 0., 0.])), True)
+
+    # separated boxes
+    def test_test2(self):
+        axes = np.eye(3)
+        half = np.array([1., 1., 1.])
+
+        res = obb_overlap(np.zeros(3), axes, half,
+                          np.array([0., -2.5, 0.]), axes, half)
+
+        self.assertEqual(res, (False, None, None))
+
+    # touching boxes with atol
+    def test_test3(self):
+        axes = np.eye(3)
+        half = np.array([1., 1., 1.])
+
+        res = obb_overlap(np.zeros(3), axes, half,
+                          np.array([0., 0., 2.+1e-5]), axes, half,
+                          atol=1e-4)
+        self.assertEqual(res[0], True)
+
+        res = obb_overlap(np.zeros(3), axes, half,
+                          np.array([0., 0., 2.+1e-5]), axes, half,
+                          atol=1e-6)
+        self.assertEqual(res[0], False)
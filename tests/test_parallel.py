@@ -0,0 +1,169 @@
+"""
+
+tests/test_parallel.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_xy_plane, create_yz_plane
+from pycollision.rotation import create_rotation_Z
+from pycollision.collision import intersects, register_intersection, \
+                                  unregister_intersection
+from pycollision.scene import Scene
+from pycollision.parallel import ParallelNarrowPhase, pack_objects, \
+                                 pair_intersections
+
+
+import unittest
+
+import itertools
+
+import numpy as np
+
+
+class GhostSphere(Sphere):
+    pass
+
+
+class PlainSphere(Sphere):
+    pass
+
+
+class BrokenSphere(Sphere):
+    pass
+
+
+def random_objects(n, seed):
+    rng = np.random.RandomState(seed)
+    objs = []
+    for i in range(n):
+        x = rng.uniform(0., 10., 3)
+        if i % 2 == 0:
+            objs.append(Sphere(x, rng.uniform(0.2, 1.)))
+        else:
+            b = Box(x, x + rng.uniform(0.2, 2., 3))
+            b.rotation = create_rotation_Z(rng.uniform(0., 90.))
+            objs.append(b)
+    objs.append(create_xy_plane(5.))
+    objs.append(create_yz_plane(2.))
+    return objs
+
+
+def reference(objs, pairs):
+    result = []
+    for i, j in pairs:
+        try:
+            if intersects(objs[i], objs[j]):
+                result.append((i, j))
+        except ValueError:
+            pass
+    return sorted(result)
+
+
+class TestParallel(unittest.TestCase):
+    # array kernel compared with the single objects
+    def test_test1(self):
+        objs = random_objects(40, 1)
+        pairs = list(itertools.combinations(range(len(objs)), 2))
+        kinds, data = pack_objects(objs)
+
+        hits = pair_intersections(kinds, data, np.array(pairs))
+        result = [p for p, h in zip(pairs, hits) if h]
+
+        self.assertEqual(result, reference(objs, pairs))
+
+    # worker processes, the result is sorted
+    def test_test2(self):
+        objs = random_objects(60, 2)
+        pairs = list(itertools.combinations(range(len(objs)), 2))[::-1]
+
+        with ParallelNarrowPhase(processes=2, chunksize=100) as executor:
+            result = executor.intersecting_pairs(objs, pairs)
+
+        self.assertEqual(result, reference(objs, pairs))
+        self.assertEqual(len(result) > 0, True)
+
+    # objects which can't be converted into arrays
+    def test_test3(self):
+        objs = [Sphere([0, 0, 0], 1.), 1, Sphere([1, 0, 0], 1.)]
+        executor = ParallelNarrowPhase(processes=1)
+
+        self.assertEqual(executor.intersecting_pairs(objs,
+                                                     [(0, 1), (0, 2)]),
+                         [(0, 2)])
+
+    # scenes
+    def test_test4(self):
+        scene = Scene()
+        for obj in random_objects(60, 3):
+            scene.add(obj)
+        scene.remove(4)
+
+        with ParallelNarrowPhase(processes=2, chunksize=20) as executor:
+            result = scene.intersecting_pairs(executor=executor)
+
+        self.assertEqual(result, scene.intersecting_pairs())
+
+    # subclasses with own intersection functions
+    def test_test5(self):
+        objs = [GhostSphere([1, 0, 0], 1.), Sphere([0, 0, 0], 1.),
+                PlainSphere([0, 1, 0], 1.), GhostSphere([1, 1, 0], 1.),
+                create_xy_plane(0.5)]
+        pairs = list(itertools.combinations(range(len(objs)), 2))
+        executor = ParallelNarrowPhase(processes=1)
+
+        # without own functions the subclasses are packed
+        kinds, data = pack_objects(objs)
+        self.assertEqual(list(kinds), [0, 0, 0, 0, 2])
+        self.assertEqual(executor.intersecting_pairs(objs, pairs),
+                         reference(objs, pairs))
+
+        def ghost(obj1, obj2, atol):
+            return False
+
+        try:
+            register_intersection(GhostSphere, Sphere)(ghost)
+            kinds, data = pack_objects(objs)
+            self.assertEqual(list(kinds), [-1, 0, 0, -1, 2])
+            result = executor.intersecting_pairs(objs, pairs)
+            self.assertEqual(result, reference(objs, pairs))
+            self.assertEqual((0, 1) in result, False)
+            unregister_intersection(GhostSphere, Sphere)
+
+            # an own function only for a pair of subclasses
+            register_intersection(PlainSphere, GhostSphere)(ghost)
+            kinds, data = pack_objects(objs)
+            self.assertEqual(list(kinds), [0, 0, 0, 0, 2])
+            result = executor.intersecting_pairs(objs, pairs)
+            self.assertEqual(result, reference(objs, pairs))
+            self.assertEqual((2, 3) in result, False)
+            self.assertEqual((0, 1) in result, True)
+            unregister_intersection(PlainSphere, GhostSphere)
+        finally:
+            for key in [(GhostSphere, Sphere), (PlainSphere, GhostSphere)]:
+                try:
+                    unregister_intersection(*key)
+                except KeyError:
+                    pass
+
+    # pairs without a procedure are skipped, errors of the registered
+    # functions are raised
+    def test_test6(self):
+        def broken(obj1, obj2, atol):
+            raise ValueError('broken intersection function')
+
+        objs = [BrokenSphere([0, 0, 0], 1.), Box([0, 0, 0], [1, 1, 1]),
+                Sphere([1, 0, 0], 1.)]
+        pairs = [(0, 1), (0, 2), (1, 2)]
+        executor = ParallelNarrowPhase(processes=1)
+        self.assertEqual(executor.intersecting_pairs(objs, pairs), [(0, 2)])
+
+        register_intersection(BrokenSphere, Sphere)(broken)
+        try:
+            with self.assertRaises(ValueError) as context:
+                executor.intersecting_pairs(objs, pairs)
+        finally:
+            unregister_intersection(BrokenSphere, Sphere)
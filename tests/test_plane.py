@@ -73,6 +73,30 @@ class TestInit(unittest.TestCase):
         self.assertEqual(np.isclose(p1.distance, 2.), True)
         self.assertEqual(np.all(p1.norm_vector == v), True)
 
+    # normalized and signed plane equation
+    def test_test6(self):
+        p1 = Plane(np.array([0., 0., 2.]), 1.)
+        p1.translation = [5., 3., -3.]
+
+        n, d = p1.equation
+        self.assertEqual(np.all(n == [0., 0., 1.]), True)
+        self.assertEqual(np.isclose(d, -2.), True)
+        self.assertEqual(np.isclose(p1.distance, -2.), True)
+
+        # cached until the next transformation
+        self.assertEqual(p1.equation is p1.equation, True)
+        p1.translation = [0., 0., 4.]
+        self.assertEqual(np.isclose(p1.distance, 2.), True)
+
+    # half-space containment
+    def test_test7(self):
+        p1 = create_xy_plane(1)
+        p1.rotation = create_rotation_X(90.)
+        points = np.array([[0., -2., 5.], [0., -0.5, 5.], [3., -1., 0.]])
+
+        self.assertEqual(np.all(p1.contains(points) == [False, True, True]),
+                         True)
+
 
 class TestCollision(unittest.TestCase):
     # 2 xy planes with difference = 1
@@ -108,6 +132,21 @@ class TestCollision(unittest.TestCase):
 
         self.assertEqual(result['collision'], False)
 
+    # planes on opposite sides of the origin and flipped planes
+    def test_test12(self):
+        p1 = create_xy_plane(1)
+        p2 = create_xy_plane(1)
+        p2.translation = [0., 0., -2.]
+
+        self.assertEqual(p1.has_collisions(p2)['collision'], False)
+        self.assertEqual(p1.intersects(p2), False)
+
+        p3 = Plane(np.array([0., 0., -1.]), -1.)
+        result = p1.has_collisions(p3)
+        self.assertEqual(result['collision'], True)
+        self.assertEqual(result['type'], 'identical')
+        self.assertEqual(p1.intersects(p3), True)
+
     # test all parameters for has_collisions
     def test_test20(self):
         p1 = create_xy_plane(0)
@@ -115,6 +154,17 @@ class TestCollision(unittest.TestCase):
 
         result = p1.has_collisions(p2, verbose=True, item='value')
 
+    # bulk creation
+    def test_test30(self):
+        planes = Plane.from_arrays([[0, 0, 1], [1, 0, 0]], [1., 2.])
+
+        self.assertEqual(len(planes), 2)
+        self.assertEqual(np.all(planes[1].norm_vector == [1., 0., 0.]), True)
+        self.assertEqual(planes[1].distance, 2.)
+
+        with self.assertRaises(ValueError) as context:
+            Plane.from_arrays([[0, 0, 1]], [1., 2.])
+
     # test of collision with not collision objects
     def test_test100(self):
         p1 = create_xy_plane(0)
@@ -3,15 +3,17 @@
 tests/test_position.py
 
 written by: Oliver Cordes 2019-07-22
-changed by: Oliver Cordes 2019-07-22
+changed by: Oliver Cordes 2026-10-18
 
 """
 
-from pycollision.position import Position
+from pycollision.position import Position, set_default_backend
+from pycollision.objects import Box
 from pycollision.rotation import create_rotation_matrix, \
                                     create_rotation_X, \
                                     create_rotation_Y, \
-                                    create_rotation_Z
+                                    create_rotation_Z, \
+                                    create_rotation_quaternion
 
 
 import unittest
@@ -79,3 +81,138 @@ class TestPosition(unittest.TestCase):
 
         v2 = np.array([-1., 5., -7.])
         self.assertEqual(np.all(np.isclose(p.post_translation, v2)), True)
+
+    # version counter
+    def test_test30(self):
+        p = Position()
+        self.assertEqual(p.version, 0)
+
+        p.translation = [1, 2, 3]
+        p.rotation = create_rotation_X(90.)
+        p.post_translation = [1, 2, 3]
+
+        self.assertEqual(p.version, 3)
+
+    # combined unchecked transformation
+    def test_test31(self):
+        p1 = Position()
+        p1.rotation = create_rotation_X(90.)
+        p1.translation = [1, 2, 3]
+        p1.post_translation = [3, 2, 1]
+
+        p2 = Position()
+        p2.transform(create_rotation_X(90.), np.array([1., 2., 3.]),
+                     np.array([3., 2., 1.]))
+
+        self.assertEqual(p2.version, 1)
+        self.assertEqual(np.all(np.isclose(p1._matrix, p2._matrix)), True)
+        self.assertEqual(np.all(p1.post_translation == p2.post_translation),
+                         True)
+
+    # many points at once
+    def test_test32(self):
+        p = Position()
+        p.translation = [1, 2, 3]
+        p.rotation = create_rotation_Y(30.)
+        p.post_translation = [0, 0, 1]
+
+        points = np.array([[0., 0., 0.], [1., 2., 3.], [-1., 0., 5.]])
+        world = p.calculate_positions(points)
+        for i in range(3):
+            self.assertEqual(np.all(np.isclose(world[i],
+                                    p.calculate_position(points[i]))), True)
+
+        out = np.zeros((3, 3))
+        self.assertEqual(p.calculate_positions(points, out=out) is out, True)
+        self.assertEqual(np.all(out == world), True)
+
+        local = p.calculate_local_positions(world)
+        self.assertEqual(np.all(np.isclose(local, points)), True)
+
+        d = p.calculate_directions(points)
+        self.assertEqual(np.all(np.isclose(d, np.dot(points, p.rotation.T))),
+                         True)
+
+        p.set_backend('quaternion')
+        self.assertEqual(np.all(np.isclose(p.calculate_positions(points),
+                                           world)), True)
+
+
+class TestQuaternionBackend(unittest.TestCase):
+    def tearDown(self):
+        set_default_backend('matrix')
+
+    # same transformation as the matrix backend
+    def test_test1(self):
+        p1 = Position()
+        p2 = Position(backend='quaternion')
+        self.assertEqual(p2.backend, 'quaternion')
+
+        for p in (p1, p2):
+            p.translation = [1, 2, 3]
+            p.rotation = create_rotation_X(90.)
+            p.post_translation = [3, 2, 1]
+            p.rotation = create_rotation_Z(30.)
+            p.translation = [-1, 0, 2]
+
+        self.assertEqual(p2.version, 5)
+        self.assertEqual(np.all(np.isclose(p1._matrix, p2._matrix)), True)
+        self.assertEqual(np.all(np.isclose(p1.translation, p2.translation)),
+                         True)
+        self.assertEqual(np.all(np.isclose(p1.calculate_position([1, 1, 1]),
+                                           p2.calculate_position([1, 1, 1]))),
+                         True)
+
+    # the matrix is materialized lazily and cached
+    def test_test2(self):
+        p = Position(backend='quaternion')
+        p.rotate_quaternion(create_rotation_quaternion([0, 0, 1], 90.))
+        m = p._matrix
+        self.assertEqual(p._matrix is m, True)
+        self.assertEqual(m.flags.writeable, False)
+
+        p.translation = [1, 0, 0]
+        self.assertEqual(p._matrix is m, False)
+        self.assertEqual(np.all(np.isclose(p.rotation,
+                                           create_rotation_Z(90.))), True)
+
+    # many small rotations stay orthonormal
+    def test_test3(self):
+        p = Position(backend='quaternion')
+        for i in range(1000):
+            p.rotation = create_rotation_Z(-1.)
+        r = p.rotation
+        self.assertEqual(np.all(np.isclose(np.dot(r, r.T), np.eye(3),
+                                           rtol=0., atol=1e-14)), True)
+        self.assertEqual(np.all(np.isclose(r, create_rotation_Z(80.))), True)
+
+    # switching the backends
+    def test_test4(self):
+        p = Position()
+        p.rotation = create_rotation_Y(40.)
+        p.translation = [1, 2, 3]
+        m = p._matrix.copy()
+
+        p.set_backend('quaternion')
+        self.assertEqual(np.all(np.isclose(p._matrix, m)), True)
+        p.set_backend('matrix')
+        self.assertEqual(p.backend, 'matrix')
+        p.translation = [1, 0, 0]
+        self.assertEqual(np.isclose(p.translation[0], 2.), True)
+
+        with self.assertRaises(ValueError) as context:
+            p.set_backend('euler')
+
+    # default backend for new objects
+    def test_test5(self):
+        set_default_backend('quaternion')
+        b = Box([0, 0, 0], [1, 1, 1])
+        self.assertEqual(b.backend, 'quaternion')
+
+        b.rotation = create_rotation_Z(90.)
+        b.translation = [1, 0, 0]
+        self.assertEqual(np.all(np.isclose(b.bounds[0], [0., 0., 0.])), True)
+        self.assertEqual(np.all(np.isclose(b.bounds[1], [1., 1., 1.])), True)
+
+        with self.assertRaises(ValueError) as context:
+            set_default_backend('euler')
@@ -0,0 +1,124 @@
+"""
+
+tests/test_proximity.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere
+from pycollision.proximity import ProximityIndex
+
+
+import unittest
+
+import numpy as np
+
+
+def spheres():
+    rng = np.random.RandomState(7)
+    s = [Sphere(rng.uniform(0., 10., 3), rng.uniform(0.1, 0.5))
+         for i in range(50)]
+    # a large sphere which is closer than its center suggests
+    s.append(Sphere([20., 5., 5.], 8.))
+    return s
+
+
+class TestNearest(unittest.TestCase):
+    # comparison with the outer distances of the collision results
+    def test_test1(self):
+        objs = spheres()
+        index = ProximityIndex(objs)
+        rng = np.random.RandomState(3)
+        points = rng.uniform(-2., 14., (20, 3))
+
+        idx, dist, outer = index.nearest(points, k=3)
+
+        self.assertEqual(idx.shape, (20, 3))
+        for q, p in enumerate(points):
+            probe = Sphere(p, 1e-12)
+            ref = np.array([probe.has_collisions(s)['outerdistance']
+                            for s in objs]) + 1e-12
+            order = np.argsort(ref)[:3]
+            self.assertEqual(np.all(idx[q] == order), True)
+            self.assertEqual(np.all(np.isclose(outer[q], ref[order])), True)
+            self.assertEqual(np.all(np.isclose(dist[q],
+                                               ref[order] +
+                                               index.radii[order])), True)
+
+    # k=1 returns flat arrays, the large sphere wins
+    def test_test2(self):
+        index = ProximityIndex(spheres())
+
+        idx, dist, outer = index.nearest([[13., 5., 5.]])
+
+        self.assertEqual(idx.shape, (1,))
+        self.assertEqual(idx[0], 50)
+        self.assertEqual(np.isclose(outer[0], -1.), True)
+
+    # more neighbours than spheres and empty index
+    def test_test3(self):
+        index = ProximityIndex((np.zeros((2, 3)), 1.))
+
+        idx, dist, outer = index.nearest(np.zeros((4, 3)), k=5)
+        self.assertEqual(idx.shape, (4, 2))
+
+        with self.assertRaises(ValueError) as context:
+            ProximityIndex((np.zeros((0, 3)), 1.)).nearest([0., 0., 0.])
+
+
+class TestWithin(unittest.TestCase):
+    # distance queries and colliding query spheres
+    def test_test1(self):
+        objs = spheres()
+        index = ProximityIndex(objs)
+        query = Sphere([5., 5., 5.], 1.)
+
+        found = index.within(query.position, max_distance=0.5)
+        ref = [i for i, s in enumerate(objs)
+               if np.linalg.norm(s.position - query.position) -
+               s.radius <= 0.5]
+        self.assertEqual(list(found[0]), ref)
+
+        found = index.within([query.position], radii=[query.radius])
+        ref = [i for i, s in enumerate(objs) if query.has_collisions(s)()]
+        self.assertEqual(list(found[0]), ref)
+
+    # many query spheres with different radii and spheres of very
+    # different sizes
+    def test_test3(self):
+        rng = np.random.RandomState(11)
+        centers = rng.uniform(0., 50., (300, 3))
+        radii = rng.uniform(0., 2., 300)
+        radii[:10] = 0.
+        radii[-1] = 30.
+        index = ProximityIndex((centers, radii))
+        points = rng.uniform(-5., 55., (100, 3))
+        qradii = rng.uniform(0., 3., 100)
+
+        for max_distance in [0., 1.5]:
+            found = index.within(points, max_distance=max_distance,
+                                 radii=qradii)
+            self.assertEqual(len(found), 100)
+            outer = np.linalg.norm(points[:, None] - centers[None], axis=2) \
+                - radii[None] - qradii[:, None]
+            for q in range(100):
+                ref = np.nonzero(outer[q] <= max_distance)[0]
+                self.assertEqual(list(found[q]), list(ref))
+
+        self.assertEqual(index.within(np.zeros((0, 3))), [])
+
+    # minimum separation between two groups
+    def test_test2(self):
+        objs = spheres()
+        index = ProximityIndex(objs)
+        group = [Sphere([-5., 0., 0.], 1.), Sphere([30., 5., 5.], 1.)]
+
+        i, j, outer = index.separation(group)
+
+        ref = min((a.has_collisions(b)['outerdistance'], n, m)
+                  for n, a in enumerate(objs)
+                  for m, b in enumerate(group))
+        self.assertEqual((i, j), (ref[1], ref[2]))
+        self.assertEqual(np.isclose(outer, ref[0]), True)
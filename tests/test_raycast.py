@@ -0,0 +1,127 @@
+"""
+
+tests/test_raycast.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_yz_plane
+from pycollision.rotation import create_rotation_Z
+from pycollision.aabbtree import AABBTree
+from pycollision.scene import Scene
+from pycollision.raycast import raycast
+
+
+import unittest
+
+import numpy as np
+
+
+def objects():
+    b = Box([-1, -1, -1], [1, 1, 1])
+    b.rotation = create_rotation_Z(45.)
+    b.translation = [0, 4, 0]
+    return [Sphere([5., 0., 0.], 1.), create_yz_plane(10.), b]
+
+
+origins = np.array([[0., 0., 0.], [0., 0., 0.], [-3., 1., 0.],
+                    [0., 4., 0.], [0., 0., 0.], [7., 0., 0.]])
+directions = np.array([[2., 0., 0.], [-1., 0., 0.], [1., 1., 0.],
+                       [0., 1., 0.], [0., 0., 1.], [1., 0., 0.]])
+
+
+class TestRaycast(unittest.TestCase):
+    # spheres, planes, rotated boxes, misses and rays inside objects
+    def test_test1(self):
+        dist, idx, normals = raycast(origins, directions, objects())
+
+        self.assertEqual(np.all(idx == [0, -1, 2, 2, -1, 1]), True)
+        self.assertEqual(np.all(np.isclose(dist[[0, 3, 5]], [4., 0., 3.])),
+                         True)
+        self.assertEqual(np.all(np.isinf(dist[[1, 4]])), True)
+        # the ray along the diagonal hits a face of the rotated box
+        self.assertEqual(np.isclose(dist[2], np.sqrt(18.) - 1.), True)
+        n = np.array([-1., -1., 0.]) / np.sqrt(2.)
+        self.assertEqual(np.all(np.isclose(normals[2], n)), True)
+
+        self.assertEqual(np.all(np.isclose(normals[0], [-1., 0., 0.])),
+                         True)
+        self.assertEqual(np.all(np.isclose(normals[3], [0., -1., 0.])),
+                         True)
+        self.assertEqual(np.all(np.isclose(normals[5], [-1., 0., 0.])),
+                         True)
+        self.assertEqual(np.all(normals[1] == 0.), True)
+
+    # maximum distance
+    def test_test2(self):
+        dist, idx, normals = raycast(origins, directions, objects(),
+                                     max_distance=3.5)
+
+        self.assertEqual(np.all(idx == [-1, -1, 2, 2, -1, 1]), True)
+
+    # the tree gives the same results
+    def test_test3(self):
+        objs = objects()
+        tree = AABBTree()
+        for i, obj in enumerate(objs):
+            lower, upper = obj.bounds
+            tree.insert(i, lower, upper)
+
+        ref = raycast(origins, directions, objs)
+        result = raycast(origins, directions, objs, tree=tree)
+
+        for a, b in zip(ref, result):
+            self.assertEqual(np.all(np.isclose(a, b)), True)
+
+    # scene with and without a tree, scene indices
+    def test_test4(self):
+        for broadphase in [AABBTree(), None]:
+            scene = Scene(broadphase)
+            scene.add(Sphere([0., 0., 0.], 1.))
+            for obj in objects():
+                scene.add(obj)
+            scene.remove(0)
+
+            dist, idx, normals = scene.raycast(origins[:1], directions[:1])
+            self.assertEqual(np.all(idx == [1]), True)
+
+        dist, idx, normals = Scene().raycast(origins, directions)
+        self.assertEqual(np.all(idx == -1), True)
+
+    # wrong arrays
+    def test_test5(self):
+        with self.assertRaises(ValueError) as context:
+            raycast(origins, directions[:2], objects())
+        with self.assertRaises(ValueError) as context:
+            raycast(origins[:1], [[0., 0., 0.]], objects())
+
+    # many rays and objects, the tree agrees with the complete test
+    def test_test6(self):
+        rng = np.random.RandomState(6)
+        objs = []
+        for i in range(60):
+            x = rng.uniform(-10., 10., 3)
+            if i % 2 == 0:
+                objs.append(Sphere(x, rng.uniform(0.2, 1.)))
+            else:
+                b = Box(x, x + rng.uniform(0.2, 2., 3))
+                b.rotation = create_rotation_Z(rng.uniform(0., 90.))
+                objs.append(b)
+        objs.append(create_yz_plane(12.))
+        tree = AABBTree()
+        for i, obj in enumerate(objs):
+            lower, upper = obj.bounds
+            tree.insert(i, lower, upper)
+
+        rays = rng.uniform(-12., 12., (200, 3))
+        dirs = rng.normal(size=(200, 3))
+        ref = raycast(rays, dirs, objs)
+        result = raycast(rays, dirs, objs, tree=tree)
+
+        self.assertEqual(np.all(ref[1] == result[1]), True)
+        for a, b in zip(ref, result):
+            self.assertEqual(np.all(np.isclose(a, b)), True)
+        self.assertEqual(np.sum(ref[1] >= 0) > 50, True)
@@ -1,7 +1,18 @@
 from pycollision.rotation import create_rotation_matrix, \
                                     create_rotation_X, \
                                     create_rotation_Y, \
-                                    create_rotation_Z
+                                    create_rotation_Z, \
+                                    create_rotation_quaternion, \
+                                    quaternion_multiply, \
+                                    quaternion_rotate, \
+                                    quaternion_to_matrix, \
+                                    quaternion_from_matrix, \
+                                    create_rotation_matrices, \
+                                    matrices_to_axis_angle, \
+                                    quaternions_to_matrices, \
+                                    matrices_to_quaternions, \
+                                    euler_to_matrices, \
+                                    matrices_to_euler
 
 import numpy as np
 
@@ -46,3 +57,132 @@ class TestInit(unittest.TestCase):
         print(m1)
         m2 = np.array([[0., -1., 0.], [1., 0., 0.], [0., 0., 1.]])
         self.assertEqual(np.all(np.isclose(m1, m2)), True)
+
+
+class TestQuaternion(unittest.TestCase):
+    # quaternions and matrices describe the same rotation
+    def test_test1(self):
+        for axis in ([1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 2, 3]):
+            for angle in (-170., -45., 0., 30., 90., 180.):
+                q = create_rotation_quaternion(axis, angle)
+                u = np.array(axis) / np.linalg.norm(axis)
+                m = create_rotation_matrix(u, angle)
+                self.assertEqual(np.all(np.isclose(quaternion_to_matrix(q),
+                                                   m)), True)
+                q2 = quaternion_from_matrix(m)
+                self.assertEqual(np.isclose(abs(np.dot(q, q2)), 1.), True)
+
+    # composition like matrix products
+    def test_test2(self):
+        q1 = create_rotation_quaternion([1, 0, 0], 30.)
+        q2 = create_rotation_quaternion([0, 1, 1], 70.)
+        m = np.dot(quaternion_to_matrix(q1), quaternion_to_matrix(q2))
+
+        q = quaternion_multiply(q1, q2)
+        self.assertEqual(np.all(np.isclose(quaternion_to_matrix(q), m)),
+                         True)
+
+    # rotation of vectors
+    def test_test3(self):
+        q = create_rotation_quaternion([0, 0, 1], 90.)
+        v = np.array([[1., 0., 0.], [1., 2., 3.]])
+        self.assertEqual(np.all(np.isclose(quaternion_rotate(q, v),
+                                           [[0., 1., 0.], [-2., 1., 3.]])),
+                         True)
+
+
+class TestBatch(unittest.TestCase):
+    # stack of matrices compared with the single matrices
+    def test_test1(self):
+        rng = np.random.RandomState(3)
+        axes = rng.normal(size=(20, 3))
+        angles = rng.uniform(-180., 180., 20)
+        m = create_rotation_matrices(axes, angles)
+
+        self.assertEqual(m.shape, (20, 3, 3))
+        for i in range(20):
+            u = axes[i] / np.linalg.norm(axes[i])
+            self.assertEqual(np.all(np.isclose(m[i],
+                                    create_rotation_matrix(u, angles[i]))),
+                             True)
+
+        m2 = create_rotation_matrices(axes, np.radians(angles),
+                                      degrees=False)
+        self.assertEqual(np.all(np.isclose(m, m2)), True)
+
+    # single axis and preallocated output
+    def test_test2(self):
+        out = np.zeros((3, 3, 3))
+        m = create_rotation_matrices([0, 0, 1], [0., 90., 180.], out=out)
+        self.assertEqual(m is out, True)
+        self.assertEqual(np.all(np.isclose(out[1], create_rotation_Z(90.))),
+                         True)
+
+        with self.assertRaises(ValueError) as context:
+            create_rotation_matrices([0, 0, 1], [0., 90.], out=out)
+
+    # quaternions and axis angle
+    def test_test3(self):
+        rng = np.random.RandomState(4)
+        m = create_rotation_matrices(rng.normal(size=(20, 3)),
+                                     rng.uniform(-180., 180., 20))
+        m[0] = np.eye(3)
+        m[1] = create_rotation_X(180.)
+
+        q = matrices_to_quaternions(m)
+        self.assertEqual(np.all(np.isclose(quaternions_to_matrices(q), m)),
+                         True)
+        for i in range(20):
+            self.assertEqual(np.all(np.isclose(q[i],
+                                    quaternion_from_matrix(m[i]))), True)
+
+        axes, angles = matrices_to_axis_angle(m)
+        self.assertEqual(np.isclose(angles[0], 0.), True)
+        self.assertEqual(np.isclose(angles[1], 180.), True)
+        self.assertEqual(np.all(np.isclose(create_rotation_matrices(axes,
+                                                                    angles),
+                                           m)), True)
+
+    # Euler angles
+    def test_test4(self):
+        m = euler_to_matrices([[10., 20., 30.]])
+        ref = np.dot(create_rotation_Z(30.),
+                     np.dot(create_rotation_Y(20.), create_rotation_X(10.)))
+        self.assertEqual(np.all(np.isclose(m[0], ref)), True)
+
+        rng = np.random.RandomState(5)
+        angles = rng.uniform(-80., 80., (20, 3))
+        angles[0] = [10., 90., 0.]
+        for order in ('xyz', 'xzy', 'yxz', 'yzx', 'zxy', 'zyx'):
+            m = euler_to_matrices(angles, order=order)
+            angles2 = matrices_to_euler(m, order=order)
+            self.assertEqual(np.all(np.isclose(angles2[1:], angles[1:])),
+                             True)
+            self.assertEqual(np.all(np.isclose(euler_to_matrices(angles2,
+                                                                 order=order),
+                                               m)), True)
+
+        with self.assertRaises(ValueError) as context:
+            euler_to_matrices(angles, order='xxz')
+
+    # preallocated output of the conversions
+    def test_test5(self):
+        m = euler_to_matrices([[10., 20., 30.], [0., 0., 90.]])
+
+        out = np.zeros((2, 3))
+        angles = matrices_to_euler(m, out=out)
+        self.assertEqual(angles is out, True)
+        self.assertEqual(np.all(np.isclose(out, [[10., 20., 30.],
+                                                 [0., 0., 90.]])), True)
+
+        out = (np.zeros((2, 3)), np.zeros(2))
+        axes, angles = matrices_to_axis_angle(m, degrees=False, out=out)
+        self.assertEqual(axes is out[0] and angles is out[1], True)
+        self.assertEqual(np.all(np.isclose(create_rotation_matrices(
+                                axes, angles, degrees=False), m)), True)
+        self.assertEqual(np.isclose(angles[1], np.pi/2.), True)
+
+        with self.assertRaises(ValueError) as context:
+            matrices_to_euler(m, out=np.zeros((3, 3)))
+        with self.assertRaises(ValueError) as context:
+            matrices_to_axis_angle(m, out=(np.zeros((2, 3)), np.zeros(3)))
@@ -0,0 +1,154 @@
+"""
+
+tests/test_scene.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box
+from pycollision.planes import create_yz_plane
+from pycollision.scene import Scene
+from pycollision.broadphase import SpatialHashGrid, SweepAndPrune
+from pycollision.rotation import create_rotation_Z
+from pycollision.collision import register_intersection, \
+                                  unregister_intersection
+
+
+import unittest
+
+import numpy as np
+
+
+class BrokenSphere(Sphere):
+    pass
+
+
+class TestScene(unittest.TestCase):
+    # add and remove objects
+    def test_test1(self):
+        scene = Scene()
+        i = scene.add(Sphere([0, 0, 0], 1.))
+        j = scene.add(Box([0, 0, 0], [1, 1, 1]))
+
+        self.assertEqual(len(scene), 2)
+        self.assertEqual((i, j), (0, 1))
+
+        obj = scene.remove(i)
+        self.assertEqual(isinstance(obj, Sphere), True)
+        self.assertEqual(len(scene), 1)
+        self.assertEqual(0 in scene, False)
+
+    # collisions of spheres with a plane
+    def test_test2(self):
+        scene = Scene(SpatialHashGrid(cell_size=2.))
+        scene.add(Sphere([0, 0, 0], 1.))
+        scene.add(Sphere([2, 0, 0], 1.))
+        scene.add(Sphere([10, 0, 0], 1.))
+        scene.add(create_yz_plane(11.))
+
+        pairs = [(i, j) for i, j, r in scene.collisions()]
+
+        self.assertEqual(pairs, [(0, 1), (2, 3)])
+
+    # pairs without collision routines were ignored
+    def test_test3(self):
+        scene = Scene()
+        scene.add(Sphere([0, 0, 0], 1.))
+        scene.add(Box([0, 0, 0], [1, 1, 1]))
+
+        self.assertEqual(scene.candidate_pairs(), [(0, 1)])
+        self.assertEqual(scene.collisions(), [])
+        self.assertEqual(scene.intersecting_pairs(), [])
+
+    # boolean only collisions
+    def test_test7(self):
+        scene = Scene(SpatialHashGrid(cell_size=2.))
+        scene.add(Sphere([0, 0, 0], 1.))
+        scene.add(Sphere([2, 0, 0], 1.))
+        scene.add(Sphere([10, 0, 0], 1.))
+        scene.add(Sphere([5, 0, 0], 1.))
+        scene.add(create_yz_plane(10.5))
+
+        self.assertEqual(scene.intersecting_pairs(), [(0, 1), (2, 4)])
+        self.assertEqual(scene.intersecting_pairs(),
+                         [(i, j) for i, j, r in scene.collisions()])
+
+    # moving objects
+    def test_test4(self):
+        scene = Scene()
+        b1 = Box([0, 0, 0], [1, 1, 1])
+        b2 = Box([0, 0, 0], [1, 1, 1])
+        b2.translation = [5, 0, 0]
+        scene.add(b1)
+        scene.add(b2)
+
+        self.assertEqual(scene.collisions(), [])
+
+        b2.translation = [-4.5, 0, 0]
+        self.assertEqual(scene.update(), 1)
+
+        self.assertEqual([(i, j) for i, j, r in scene.collisions()],
+                         [(0, 1)])
+
+    # comparison with all pairs
+    def test_test5(self):
+        rng = np.random.RandomState(1)
+        spheres = [Sphere(rng.uniform(0., 10., 3), rng.uniform(0.1, 1.))
+                   for i in range(50)]
+        scene = Scene()
+        for s in spheres:
+            scene.add(s)
+
+        pairs = [(i, j) for i, j, r in scene.collisions()]
+
+        pairs_cmp = [(i, j) for i in range(50) for j in range(i+1, 50)
+                     if spheres[i].has_collisions(spheres[j])()]
+
+        self.assertEqual(pairs, pairs_cmp)
+
+    # rotating domino with sweep and prune
+    def test_test6(self):
+        scene = Scene(SweepAndPrune())
+        b1 = Box([0, 0, 0], [1, 1, 1])
+        b1.translation = [-1, 0, 0]
+        b1.post_translation = [1, 0, 0]
+        b2 = Box([0, 0, 0], [1, 1, 1])
+        b2.translation = [1.5, 0, 0]
+        scene.add(b1)
+        scene.add(b2)
+
+        self.assertEqual(scene.candidate_pairs(), [])
+
+        for i in range(45):
+            b1.rotation = create_rotation_Z(-1)
+            scene.update(0)
+
+        self.assertEqual(scene.candidate_pairs(), [(0, 1)])
+
+    # pairs without a procedure are skipped, errors of the registered
+    # functions are raised
+    def test_test8(self):
+        def broken(obj1, obj2, atol):
+            raise ValueError('broken intersection function')
+
+        scene = Scene()
+        scene.add(BrokenSphere([0, 0, 0], 1.))
+        scene.add(Box([0, 0, 0], [1, 1, 1]))
+        scene.add(Sphere([1, 0, 0], 1.))
+        self.assertEqual(scene.intersecting_pairs(), [(0, 2)])
+
+        register_intersection(BrokenSphere, Sphere)(broken)
+        try:
+            with self.assertRaises(ValueError) as context:
+                scene.intersecting_pairs()
+        finally:
+            unregister_intersection(BrokenSphere, Sphere)
+
+    # wrong objects
+    def test_test100(self):
+        scene = Scene()
+
+        with self.assertRaises(TypeError) as context:
+            scene.add(1)
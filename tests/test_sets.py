@@ -0,0 +1,205 @@
+"""
+
+tests/test_sets.py
+
+written by: Oliver Cordes 2026-10-18
+changed by: Oliver Cordes 2026-10-18
+
+"""
+
+from pycollision.objects import Sphere, Box, Plane
+from pycollision.planes import create_xy_plane, create_yz_plane
+from pycollision.rotation import create_rotation_X, create_rotation_Z, \
+                                 create_rotation_quaternion
+from pycollision.sets import SphereSet, BoxSet, PlaneSet
+
+
+import unittest
+
+import numpy as np
+
+
+def random_boxes(n, seed=42):
+    rng = np.random.RandomState(seed)
+    boxes = []
+    for i in range(n):
+        x1 = rng.uniform(0., 8., 3)
+        b = Box(x1, x1 + rng.uniform(0.5, 2., 3))
+        b.rotation = create_rotation_Z(rng.uniform(0., 90.))
+        b.rotation = create_rotation_X(rng.uniform(0., 90.))
+        b.translation = rng.uniform(-1., 1., 3)
+        boxes.append(b)
+    return boxes
+
+
+class TestSphereSet(unittest.TestCase):
+    # init and transformations
+    def test_test1(self):
+        spheres = SphereSet([[0, 0, 0], [1, 0, 0]], 2.)
+        spheres.translate([1, 2, 3])
+        spheres.rotate(create_rotation_Z(90.), idx=[1])
+
+        p = spheres.positions
+        self.assertEqual(np.all(np.isclose(p[0], [1., 2., 3.])), True)
+        self.assertEqual(np.all(np.isclose(p[1], [-2., 2., 3.])), True)
+        self.assertEqual(np.all(spheres.radii == 2.), True)
+        self.assertEqual(list(spheres._versions), [1, 2])
+
+    # views behave like spheres
+    def test_test2(self):
+        spheres = SphereSet([[0, 0, 0], [10, 0, 0]], [1., 2.])
+        s = spheres[1]
+
+        self.assertEqual(isinstance(s, Sphere), True)
+        self.assertEqual(s.radius, 2.)
+        self.assertEqual(np.all(s.position == [10., 0., 0.]), True)
+
+        s.translation = [-8, 0, 0]
+        self.assertEqual(np.all(spheres.positions[1] == [2., 0., 0.]),
+                         True)
+        self.assertEqual(np.all(s.position == [2., 0., 0.]), True)
+        self.assertEqual(s.has_collisions(spheres[0])(), True)
+        self.assertEqual(s.has_collisions(Sphere([5, 0, 0], 1.))(), True)
+
+        with self.assertRaises(IndexError) as context:
+            s = spheres[2]
+
+    # collisions compared with the single objects
+    def test_test3(self):
+        rng = np.random.RandomState(1)
+        objs = [Sphere(rng.uniform(0., 10., 3), rng.uniform(0.1, 2.))
+                for i in range(30)]
+        spheres = SphereSet.from_objects(objs)
+
+        m = spheres.collisions()
+        for i in range(30):
+            for j in range(30):
+                self.assertEqual(m[i, j],
+                                 j > i and objs[i].has_collisions(objs[j])())
+
+    # spheres and planes
+    def test_test4(self):
+        spheres = SphereSet([[0, 0, 0], [0, 0, 5]], 1.)
+        planes = PlaneSet([[0, 0, 1], [1, 0, 0]], [1., 10.])
+
+        m = spheres.collisions(planes)
+        self.assertEqual(np.all(m == [[True, False], [False, False]]), True)
+
+        i, j = planes.collisions(spheres, sparse=True)
+        self.assertEqual((list(i), list(j)), ([0], [0]))
+
+    # combined and quaternion transformations of views
+    def test_test5(self):
+        spheres = SphereSet([[1, 0, 0], [1, 0, 0]], 1.)
+        spheres[0].transform(create_rotation_Z(90.), np.array([1., 0., 0.]),
+                             np.array([0., 0., 1.]))
+        spheres[1].rotate_quaternion(create_rotation_quaternion([0, 0, 1],
+                                                                90.))
+
+        self.assertEqual(np.all(np.isclose(spheres[0].position,
+                                           [1., 1., 1.])), True)
+        self.assertEqual(np.all(np.isclose(spheres[1].position,
+                                           [0., 1., 0.])), True)
+        with self.assertRaises(ValueError) as context:
+            spheres[0].set_backend('quaternion')
+
+    # radii must be positive like in Sphere.from_arrays
+    def test_test6(self):
+        for radii in (0., [1., 0.], [1., -1.], [1., np.nan]):
+            with self.assertRaises(ValueError) as context:
+                SphereSet([[0, 0, 0], [1, 0, 0]], radii)
+            with self.assertRaises(ValueError) as context:
+                Sphere.from_arrays([[0, 0, 0], [1, 0, 0]], radii)
+        self.assertEqual(len(SphereSet([[0, 0, 0], [1, 0, 0]], 1e-3)), 2)
+
+
+class TestBoxSet(unittest.TestCase):
+    # corners and bounds compared with the single objects
+    def test_test1(self):
+        objs = random_boxes(10)
+        boxes = BoxSet.from_objects(objs)
+
+        for i, b in enumerate(objs):
+            self.assertEqual(np.all(np.isclose(boxes.corners[i],
+                                               b.corners)), True)
+            self.assertEqual(np.all(np.isclose(boxes.centers[i],
+                                               b.center)), True)
+            self.assertEqual(np.all(np.isclose(boxes.bounds[0][i],
+                                               b.bounds[0])), True)
+            self.assertEqual(np.all(np.isclose(boxes.bounds[1][i],
+                                               b.bounds[1])), True)
+
+    # collisions compared with the single objects
+    def test_test2(self):
+        objs = random_boxes(40)
+        boxes = BoxSet.from_objects(objs)
+
+        m = boxes.collisions()
+        self.assertEqual(np.any(m), True)
+        for i in range(40):
+            for j in range(40):
+                self.assertEqual(m[i, j],
+                                 j > i and objs[i].has_collisions(objs[j])())
+
+    # bulk transformation and views
+    def test_test3(self):
+        boxes = BoxSet([[0, 0, 0], [3, 0, 0]], [[1, 1, 1], [4, 1, 1]])
+        self.assertEqual(boxes.collisions(sparse=True)[0].size, 0)
+
+        b = boxes[1]
+        self.assertEqual(isinstance(b, Box), True)
+        b.translation = [-2.5, 0, 0]
+
+        i, j = boxes.collisions(sparse=True)
+        self.assertEqual((list(i), list(j)), ([0], [1]))
+        self.assertEqual(b.has_collisions(boxes[0])(), True)
+        self.assertEqual(np.all(np.isclose(b.center, [1., 0.5, 0.5])), True)
+
+    # boxes and planes
+    def test_test4(self):
+        boxes = BoxSet([[0, 0, 0], [3, 0, 0]], [[1, 1, 1], [4, 1, 1]])
+        planes = PlaneSet.from_objects([create_yz_plane(0.5),
+                                        create_xy_plane(1.),
+                                        create_xy_plane(2.)])
+
+        m = boxes.collisions(planes)
+        self.assertEqual(np.all(m == [[True, True, False],
+                                      [False, True, False]]), True)
+
+
+class TestPlaneSet(unittest.TestCase):
+    # plane equations
+    def test_test1(self):
+        planes = PlaneSet([[0, 0, 2], [1, 0, 0]], [1., 2.])
+        planes.translate([1, 0, 0], idx=[1])
+        planes.rotate(create_rotation_X(90.), idx=[0])
+
+        eq = planes.equations
+        self.assertEqual(np.all(np.isclose(eq, [[0., -1., 0., 1.],
+                                                [1., 0., 0., 3.]])), True)
+
+        p = planes[0]
+        self.assertEqual(isinstance(p, Plane), True)
+        self.assertEqual(np.isclose(p.distance, 1.), True)
+
+    # plane collisions
+    def test_test2(self):
+        planes = PlaneSet([[0, 0, 1], [0, 0, -1], [0, 0, 1], [1, 0, 0]],
+                          [1., -1., 2., 0.])
+
+        m = planes.collisions()
+        m_cmp = np.array([[False, True, False, True],
+                          [False, False, False, True],
+                          [False, False, False, True],
+                          [False, False, False, False]])
+        self.assertEqual(np.all(m == m_cmp), True)
+
+    # errors
+    def test_test100(self):
+        planes = PlaneSet([[0, 0, 1]], 0.)
+
+        with self.assertRaises(ValueError) as context:
+            planes.collisions(1)
+
+        with self.assertRaises(ValueError) as context:
+            planes = PlaneSet([[0, 0, 0]], 0.)
@@ -67,6 +67,26 @@ class TestInit(unittest.TestCase):
         with self.assertRaises(TypeError) as context:
             s1 = Sphere([0, 0, 0], 'string')
 
+    # bulk creation
+    def test_test80(self):
+        centers = np.array([[0, 0, 0], [1, 2, 2]])
+        spheres = Sphere.from_arrays(centers, [1., 2.])
+
+        self.assertEqual(len(spheres), 2)
+        self.assertEqual(np.all(spheres[1].position == [1., 2., 2.]), True)
+        self.assertEqual(spheres[1].radius, 2.)
+        self.assertEqual(spheres[0].has_collisions(spheres[1])['collision'],
+                         True)
+
+        spheres = Sphere.from_arrays(centers, 0.5)
+        self.assertEqual(spheres[0].radius, 0.5)
+
+    def test_test81(self):
+        with self.assertRaises(ValueError) as context:
+            Sphere.from_arrays([[0, 0, 0]], [1., 2.])
+        with self.assertRaises(ValueError) as context:
+            Sphere.from_arrays([[0, 0, 0]], [-1.])
+
 
 class TestCollision(unittest.TestCase):
     # test 2 spheres no collision
@@ -176,6 +196,34 @@ class TestCollision(unittest.TestCase):
 
         self.assertEqual(result['collision'], False)
 
+    # contact points of colliding spheres
+    def test_test14(self):
+        s1 = Sphere([0, 0, 0], 1.)
+        s2 = Sphere([1.5, 0, 0], 1.)
+        p1 = create_yz_plane(0.5)
+
+        result = s1.has_collisions(s2)
+        self.assertEqual(np.all(np.isclose(result['contact'],
+                                           [0.75, 0., 0.])), True)
+
+        result = s1.has_collisions(p1)
+        self.assertEqual(np.all(np.isclose(result['contact'],
+                                           [0.5, 0., 0.])), True)
+
+        result = s1.has_collisions(Sphere([3, 0, 0], 1.))
+        self.assertEqual('contact' in result, False)
+
+    # point containment
+    def test_test15(self):
+        s1 = Sphere([0, 0, 0], 1.)
+        s1.translation = [1, 0, 0]
+        points = np.array([[1., 0., 0.], [2., 0., 0.], [2.1, 0., 0.],
+                           [1., 0., 0.5]])
+
+        self.assertEqual(np.all(s1.contains(points) ==
+                                [True, True, False, True]), True)
+        self.assertEqual(s1.contains([0., 0., 0.]), True)
+
     # test of collision with not collision objects
     def test_test100(self):
         s1 = Sphere([0, 0, 0], 1.)